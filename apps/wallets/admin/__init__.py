@@ -1,2 +1,6 @@
 from .transaction import * # noqa
 from .wallet import * # noqa
+from .commission import * # noqa
+from .reconciliation import * # noqa
+from .dead_letter import * # noqa
+from .rollup import * # noqa
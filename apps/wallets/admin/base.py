@@ -0,0 +1,45 @@
+"""
+Admin bases
+"""
+
+from src.settings.db.router import use_replica
+from src.settings.db.router import replica_reads
+from src.settings.db.router import pin_to_primary
+from src.settings.utils.pagination import EstimatedCountPaginator
+
+
+class LargeTableAdminMixin:
+    """
+    Changelist settings for tables too large to count or to read from the primary.
+
+    Features:
+        - Counts come from `EstimatedCountPaginator`, and the unfiltered total
+          next to the search box is not computed.
+        - Changelist pages are read from a replica, like the API reads, unless the
+          operator changed something within `DB_REPLICA_STICKY_SECONDS`.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def changelist_view(self, request, extra_context=None):
+        token = replica_reads.set(use_replica(request))
+        try:
+            response = super().changelist_view(request, extra_context)
+            # The rows are read while rendering, so render before leaving the replica.
+            if hasattr(response, 'render'):
+                response.render()
+            return response
+        finally:
+            replica_reads.reset(token)
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        pin_to_primary(request.user.pk)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        pin_to_primary(request.user.pk)
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        pin_to_primary(request.user.pk)
@@ -0,0 +1,19 @@
+"""
+UI for CommissionAccrual model
+"""
+
+from django.contrib import admin
+
+from unfold.admin import ModelAdmin
+
+from apps.wallets.models.commission import CommissionAccrual
+
+
+@admin.register(CommissionAccrual)
+class CommissionAccrualAdmin(ModelAdmin):
+    """
+    Admin configuration for CommissionAccrual model.
+    """
+    list_display = ('shard', 'amount', 'updated_at')
+    readonly_fields = ('shard', 'amount', 'created_at', 'updated_at')
+    ordering = ('shard',)
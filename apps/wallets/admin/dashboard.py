@@ -0,0 +1,45 @@
+"""
+Admin dashboard statistics
+"""
+
+from datetime import timedelta
+
+from django.utils import timezone
+
+from apps.wallets.services.rollup import RollupService
+
+
+DASHBOARD_DAYS = 30
+
+
+def dashboard_callback(request, context):
+    """
+    Add transfer statistics of the last `DASHBOARD_DAYS` days to the admin index,
+    read from the daily rollups.
+
+    :param request: Django request object
+    :param context: Template context of the admin index
+    :return: Updated context
+    :rtype: dict
+    """
+    date_to = timezone.localdate()
+    date_from = date_to - timedelta(days=DASHBOARD_DAYS - 1)
+    days = RollupService.daily_totals(date_from, date_to)
+    totals = RollupService.summarize(days)
+
+    context.update({
+        'rollup_days': DASHBOARD_DAYS,
+        'rollup_cards': [
+            {'title': "Transfers", 'value': totals['transfers_out']},
+            {'title': "Volume", 'value': f"{totals['outflow']:,.2f}"},
+            {'title': "Commission", 'value': f"{totals['commission_paid']:,.2f}"},
+        ],
+        'rollup_table': {
+            'headers': ["Day", "Transfers", "Volume", "Commission"],
+            'rows': [
+                [day['day'], day['transfers_out'], f"{day['outflow']:,.2f}", f"{day['commission_paid']:,.2f}"] # noqa
+                for day in reversed(days)
+            ],
+        },
+    })
+    return context
@@ -0,0 +1,47 @@
+"""
+UI for NotificationDeadLetter model
+"""
+
+from django.contrib import admin
+from django.contrib import messages
+
+from unfold.admin import ModelAdmin
+from unfold.decorators import action
+
+from apps.wallets.models.dead_letter import NotificationDeadLetter
+from apps.wallets.services.dead_letter import DeadLetterService
+
+
+@admin.register(NotificationDeadLetter)
+class NotificationDeadLetterAdmin(ModelAdmin):
+    """
+    Admin configuration for NotificationDeadLetter model.
+    """
+    list_display = (
+        'id',
+        'kind',
+        'recipient_id',
+        'attempts',
+        'error',
+        'created_at',
+        'redriven_at'
+    )
+    list_filter = ('kind', 'created_at', 'redriven_at')
+    search_fields = ('=recipient_id',)
+    readonly_fields = (
+        'kind',
+        'recipient_id',
+        'payload',
+        'error',
+        'attempts',
+        'redriven_at',
+        'created_at',
+        'updated_at'
+    )
+    ordering = ('-id',)
+    actions = ['redrive']
+
+    @action(description="Redrive selected dead letters")
+    def redrive(self, request, queryset):
+        count = DeadLetterService.redrive_batch(queryset, queryset.count())
+        messages.success(request, f"Enqueued {count} dead letters again")
@@ -0,0 +1,106 @@
+"""
+Bulk import action for the admin changelists
+"""
+
+from django import forms
+from django.urls import reverse
+from django.contrib import messages
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+
+from unfold.widgets import UnfoldAdminFileFieldWidget
+from unfold.widgets import UnfoldBooleanSwitchWidget
+from unfold.decorators import action
+
+from apps.wallets.services.importer import ImportService
+
+
+MESSAGE_ERRORS = 10
+
+
+class ImportForm(forms.Form):
+    """
+    Upload form of the bulk import action.
+    """
+    file = forms.FileField(
+        widget=UnfoldAdminFileFieldWidget,
+        help_text=(
+            "CSV or NDJSON file, optionally gzip-compressed (.csv, .ndjson, .jsonl, .gz). "
+            "Use `python manage.py bulk_import` for files too large to upload."
+        )
+    )
+    skip_invalid = forms.BooleanField(
+        required=False,
+        widget=UnfoldBooleanSwitchWidget,
+        help_text="Load the valid rows and report the invalid ones instead of stopping"
+    )
+    dry_run = forms.BooleanField(
+        required=False,
+        widget=UnfoldBooleanSwitchWidget,
+        help_text="Validate the file without loading it"
+    )
+
+    def clean_file(self):
+        upload = self.cleaned_data['file']
+        fmt, _ = ImportService.detect_format(upload.name)
+        if fmt is None:
+            raise forms.ValidationError("Unsupported file extension")
+        return upload
+
+
+class ImportActionMixin:
+    """
+    Adds an "Import" button to a changelist, loading the uploaded file through
+    `ImportService` as rows of `import_kind`.
+    """
+    import_kind = None
+    actions_list = ['import_file']
+
+    @action(description="Import", url_path="import", permissions=['add'], icon='upload')
+    def import_file(self, request):
+        opts = self.model._meta
+        changelist_url = reverse(f'admin:{opts.app_label}_{opts.model_name}_changelist')
+        form = ImportForm(request.POST or None, request.FILES or None)
+
+        if request.method == 'POST' and form.is_valid():
+            upload = form.cleaned_data['file']
+            fmt, compressed = ImportService.detect_format(upload.name)
+            report = ImportService.run(
+                upload.file,
+                self.import_kind,
+                fmt,
+                compressed=compressed,
+                skip_invalid=form.cleaned_data['skip_invalid'],
+                dry_run=form.cleaned_data['dry_run']
+            )
+            self.report_import(request, report)
+            return redirect(changelist_url)
+
+        return TemplateResponse(request, 'admin/wallets/import.html', {
+            **self.admin_site.each_context(request),
+            'title': f"Import {self.import_kind}",
+            'opts': opts,
+            'form': form,
+            'changelist_url': changelist_url,
+        })
+
+    def report_import(self, request, report: dict):
+        for error in report['errors'][:MESSAGE_ERRORS]:
+            messages.warning(request, f"Line {error['line']}: {error['error']}")
+
+        summary = (
+            f"Read {report['rows_read']} rows, loaded {report['rows_loaded']} "
+            f"in {report['elapsed_s']}s; invalid: {report['rows_invalid']}"
+        )
+        if report['aborted']:
+            messages.error(request, f"{summary}. Stopped at the first chunk with invalid rows.")
+        else:
+            messages.success(request, summary)
+
+        check = report['check']
+        if check and check['drifted_count']:
+            messages.warning(
+                request,
+                f"{check['drifted_count']} of {check['wallets_checked']} wallets have a "
+                f"balance different from their history"
+            )
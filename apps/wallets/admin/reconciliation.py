@@ -0,0 +1,36 @@
+"""
+UI for ReconciliationCheckpoint model
+"""
+
+from django.contrib import admin
+
+from unfold.admin import ModelAdmin
+
+from apps.wallets.models.reconciliation import ReconciliationCheckpoint
+
+
+@admin.register(ReconciliationCheckpoint)
+class ReconciliationCheckpointAdmin(ModelAdmin):
+    """
+    Admin configuration for ReconciliationCheckpoint model.
+    """
+    list_display = (
+        'id',
+        'last_transaction_id',
+        'transactions_scanned',
+        'wallets_checked',
+        'drifted_count',
+        'created_at'
+    )
+    list_filter = ('created_at',)
+    exclude = ('ledger', 'recent_ids')
+    readonly_fields = (
+        'last_transaction_id',
+        'transactions_scanned',
+        'wallets_checked',
+        'drifted_count',
+        'drifted',
+        'created_at',
+        'updated_at'
+    )
+    ordering = ('-id',)
@@ -0,0 +1,41 @@
+"""
+UI for WalletDailyRollup model
+"""
+
+from django.contrib import admin
+
+from unfold.admin import ModelAdmin
+
+from apps.wallets.admin.base import LargeTableAdminMixin
+from apps.wallets.models.rollup import WalletDailyRollup
+
+
+@admin.register(WalletDailyRollup)
+class WalletDailyRollupAdmin(LargeTableAdminMixin, ModelAdmin):
+    """
+    Admin configuration for WalletDailyRollup model.
+    """
+    list_display = (
+        'wallet_id',
+        'day',
+        'inflow',
+        'outflow',
+        'commission_paid',
+        'transfers_in',
+        'transfers_out'
+    )
+    list_filter = ('day',)
+    search_fields = ('=wallet__id',)
+    readonly_fields = (
+        'wallet',
+        'day',
+        'inflow',
+        'outflow',
+        'commission_paid',
+        'transfers_in',
+        'transfers_out',
+        'created_at',
+        'updated_at'
+    )
+    date_hierarchy = 'day'
+    ordering = ('-day', 'wallet_id')
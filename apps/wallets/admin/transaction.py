@@ -2,15 +2,23 @@
 UI for Transaction model
 """
 
+import uuid
+
+from django.db.models import Q
+from django.db.models import Subquery
 from django.contrib import admin
 
 from unfold.admin import ModelAdmin
 
+from apps.wallets.admin.base import LargeTableAdminMixin
+from apps.wallets.admin.importer import ImportActionMixin
+from apps.wallets.models.wallet import Wallet
 from apps.wallets.models.transaction import Transaction
+from apps.wallets.services.importer import ImportService
 
 
 @admin.register(Transaction)
-class TransactionAdmin(ModelAdmin):
+class TransactionAdmin(LargeTableAdminMixin, ImportActionMixin, ModelAdmin):
     """
     Admin configuration for Transaction model.
     """
@@ -24,12 +32,38 @@ class TransactionAdmin(ModelAdmin):
         'transaction_group',
         'created_at'
     )
+    list_select_related = ('sender__user', 'recipient__user')
+    raw_id_fields = ('sender', 'recipient')
     search_fields = (
         'sender__user__username',
         'recipient__user__username',
-        'transaction_group',
-        'description'
+        '=transaction_group'
     )
+    search_help_text = "Username of the sender or recipient, or a transaction group UUID"
     list_filter = ('transaction_type', 'status', 'created_at')
     readonly_fields = ('transaction_group', 'created_at', 'updated_at')
+    import_kind = ImportService.TRANSACTIONS
     ordering = ('-created_at',)
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Search by transaction group when the term is a UUID, otherwise by the
+        username of the sender or the recipient.
+
+        Matching wallets are selected in a subquery, through the username trigram
+        index, so transactions are read through their sender and recipient indexes
+        instead of joining `auth_user` twice for every row of the table.
+        """
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+
+        try:
+            return queryset.filter(transaction_group=uuid.UUID(term)), False
+        except ValueError:
+            pass
+
+        wallet_ids = Wallet.objects.filter(user__username__icontains=term).values('id')
+        return queryset.filter(
+            Q(sender_id__in=Subquery(wallet_ids)) | Q(recipient_id__in=Subquery(wallet_ids))
+        ), False
@@ -2,20 +2,43 @@
 UI for Wallet model
 """
 
+from django.db import transaction
 from django.contrib import admin
 
 from unfold.admin import ModelAdmin
 
+from apps.wallets.admin.base import LargeTableAdminMixin
+from apps.wallets.admin.importer import ImportActionMixin
 from apps.wallets.models.wallet import Wallet
+from apps.wallets.services.cache import WalletCacheService
+from apps.wallets.services.importer import ImportService
 
 
 @admin.register(Wallet)
-class WalletAdmin(ModelAdmin):
+class WalletAdmin(LargeTableAdminMixin, ImportActionMixin, ModelAdmin):
     """
     Admin configuration for Wallet model.
     """
     list_display = ('id', 'user', 'balance', 'created_at', 'updated_at')
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
     search_fields = ('user__username',)
     readonly_fields = ('created_at', 'updated_at')
     list_filter = ('created_at',)
+    import_kind = ImportService.WALLETS
     ordering = ('id',)
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        transaction.on_commit(lambda: WalletCacheService.invalidate(obj.id))
+
+    def delete_model(self, request, obj):
+        wallet_id = obj.id
+        super().delete_model(request, obj)
+        transaction.on_commit(lambda: WalletCacheService.invalidate(wallet_id))
+
+    def delete_queryset(self, request, queryset):
+        wallet_ids = list(queryset.values_list('id', flat=True))
+        super().delete_queryset(request, queryset)
+        for wallet_id in wallet_ids:
+            transaction.on_commit(lambda wallet_id=wallet_id: WalletCacheService.invalidate(wallet_id)) # noqa
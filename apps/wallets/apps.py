@@ -1,5 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class WalletsConfig(AppConfig):
     name = "apps.wallets"
+
+    def ready(self):
+        from src.settings.utils.metrics import connect_query_metrics
+        from src.settings.db.postgres.search import create_trigram_indexes
+
+        connect_query_metrics()
+        post_migrate.connect(create_trigram_indexes, sender=self, dispatch_uid='wallets_trigram_indexes') # noqa
@@ -0,0 +1,134 @@
+"""
+Transfer engine benchmark
+"""
+
+import queue
+import random
+import threading
+import time
+
+from decimal import Decimal
+
+from django.db import DatabaseError
+from django.db import connection
+
+from apps.wallets.enums.engine import TransferEngine
+from apps.wallets.services.transfer import TransferService
+from apps.wallets.benchmarks.stats import summarize
+
+from src.settings.config.config import config
+
+
+def generate_transfers(wallet_ids: list[int], count: int, hot_fraction: float, seed: int) -> list:
+    """
+    Generate (sender_id, recipient_id) pairs where a share of transfers hit one hot sender.
+
+    The first wallet ID is the admin wallet and never takes part.
+
+    :param wallet_ids: Seeded wallet IDs
+    :param count: Number of transfers
+    :param hot_fraction: Share of transfers sent from the hot wallet, between 0 and 1
+    :param seed: Random seed, so every engine replays the same workload
+    :return: Sender and recipient pairs
+    :rtype: list
+    """
+    rng = random.Random(seed)
+    candidates = wallet_ids[1:]
+    hot_wallet = candidates[0]
+
+    pairs = []
+    for _ in range(count):
+        sender_id = hot_wallet if rng.random() < hot_fraction else rng.choice(candidates)
+        recipient_id = rng.choice(candidates)
+        while recipient_id == sender_id:
+            recipient_id = rng.choice(candidates)
+        pairs.append((sender_id, recipient_id))
+    return pairs
+
+
+def run_transfers(pairs: list, threads: int, amount: Decimal) -> dict:
+    """
+    Execute transfers from a shared work queue on several threads, one connection each.
+
+    :param pairs: Sender and recipient pairs
+    :param threads: Number of concurrent threads
+    :param amount: Amount of every transfer
+    :return: Throughput and latency summary
+    :rtype: dict
+    """
+    work = queue.SimpleQueue()
+    for pair in pairs:
+        work.put(pair)
+
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def worker():
+        local_latencies = []
+        local_errors = 0
+        try:
+            while True:
+                try:
+                    sender_id, recipient_id = work.get_nowait()
+                except queue.Empty:
+                    break
+
+                started = time.perf_counter()
+                try:
+                    TransferService.execute_transfer(sender_id, recipient_id, amount)
+                except (ValueError, DatabaseError):
+                    local_errors += 1
+                    continue
+                local_latencies.append(time.perf_counter() - started)
+        finally:
+            connection.close()
+            with lock:
+                latencies.extend(local_latencies)
+                errors[0] += local_errors
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    return summarize(latencies, time.perf_counter() - started, errors[0])
+
+
+def run_engine_benchmark(
+    wallet_ids: list[int],
+    transfers: int,
+    threads: int,
+    hot_fractions: list[float],
+    seed: int = 0
+) -> list[dict]:
+    """
+    Compare every transfer engine on the same workloads at several contention levels.
+
+    :param wallet_ids: Seeded wallet IDs
+    :param transfers: Transfers per engine and contention level
+    :param threads: Number of concurrent threads
+    :param hot_fractions: Contention levels as the share of transfers from one hot wallet
+    :param seed: Random seed of the workloads
+    :return: One result per engine and contention level
+    :rtype: list[dict]
+    """
+    original_engine = config.wallet.TRANSFER_ENGINE
+    results = []
+    try:
+        for hot_fraction in hot_fractions:
+            pairs = generate_transfers(wallet_ids, transfers, hot_fraction, seed)
+            for engine in TransferEngine:
+                config.wallet.TRANSFER_ENGINE = engine.value
+                summary = run_transfers(pairs, threads, Decimal('1.00'))
+                results.append({
+                    'engine': engine.value,
+                    'hot_fraction': hot_fraction,
+                    'threads': threads,
+                    **summary
+                })
+    finally:
+        config.wallet.TRANSFER_ENGINE = original_engine
+    return results
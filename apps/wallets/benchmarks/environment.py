@@ -0,0 +1,38 @@
+"""
+Throwaway database for benchmarks
+"""
+
+import os
+import tempfile
+
+from contextlib import contextmanager
+
+from django.db import connection
+
+
+@contextmanager
+def benchmark_database(keepdb: bool = False):
+    """
+    Create a test database for the duration of a benchmark and destroy it afterwards.
+
+    SQLite benchmarks use a temporary file instead of the shared in-memory database,
+    so concurrent threads wait on the database lock instead of failing immediately.
+
+    :param keepdb: Keep the test database between runs
+    :return: Context manager yielding the test database name
+    """
+    temp_path = None
+    if connection.vendor == 'sqlite':
+        fd, temp_path = tempfile.mkstemp(prefix='wallets-bench-', suffix='.sqlite3')
+        os.close(fd)
+        connection.settings_dict.setdefault('TEST', {})['NAME'] = temp_path
+
+    old_name = connection.settings_dict['NAME']
+    test_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=keepdb)
+    try:
+        yield test_name
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+
@@ -0,0 +1,276 @@
+"""
+ASGI and WSGI handler benchmark
+"""
+
+import io
+import json
+import queue
+import asyncio
+import threading
+import time
+
+from urllib.parse import urlencode
+
+from django.urls import reverse
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.contrib.auth import HASH_SESSION_KEY
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.contrib.auth.models import User
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.utils.crypto import get_random_string
+from django.contrib.sessions.backends.db import SessionStore
+
+from apps.wallets.benchmarks.stats import summarize
+from apps.wallets.benchmarks.load import HISTORY
+from apps.wallets.benchmarks.load import TRANSFER
+from apps.wallets.benchmarks.load import http_environment
+from apps.wallets.benchmarks.load import generate_requests
+
+MODES = ('wsgi', 'asgi-sync', 'asgi')
+
+ROUTES = {
+    'wsgi': ('transfer', 'transaction-history'),
+    'asgi-sync': ('transfer', 'transaction-history'),
+    'asgi': ('async-transfer', 'async-transaction-history'),
+}
+
+
+def session_headers(user: User) -> dict:
+    """
+    Log a user in and return the cookie and CSRF headers of an authenticated browser.
+
+    :param user: User to authenticate as
+    :return: Header values by lowercase name
+    :rtype: dict
+    """
+    session = SessionStore()
+    session[SESSION_KEY] = str(user.pk)
+    session[BACKEND_SESSION_KEY] = 'django.contrib.auth.backends.ModelBackend'
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.save()
+
+    csrf_token = get_random_string(32)
+    return {
+        'cookie': (
+            f"{settings.SESSION_COOKIE_NAME}={session.session_key}; "
+            f"{settings.CSRF_COOKIE_NAME}={csrf_token}"
+        ),
+        'x-csrftoken': csrf_token,
+    }
+
+
+def build_request(kind: str, sender_id: int, recipient_id: int, routes: tuple) -> tuple:
+    """
+    Return the method, path, query string and body of a workload request.
+    """
+    if kind == TRANSFER:
+        body = json.dumps({
+            'sender_id': sender_id,
+            'recipient_id': recipient_id,
+            'amount': '1.00'
+        }).encode()
+        return 'POST', reverse(routes[0]), '', body
+    return 'GET', reverse(routes[1]), urlencode({'wallet_id': sender_id}), b''
+
+
+def run_wsgi(workload: list[tuple], concurrency: int, headers: dict) -> dict:
+    """
+    Serve the workload with `WSGIHandler` from a pool of threads, like a threaded WSGI server.
+
+    :param workload: Requests from `generate_requests`
+    :param concurrency: Number of server threads
+    :param headers: Authentication headers
+    :return: Latency summary per endpoint
+    :rtype: dict
+    """
+    handler = WSGIHandler()
+    routes = ROUTES['wsgi']
+    work = queue.SimpleQueue()
+    for item in workload:
+        work.put(item)
+
+    samples = {TRANSFER: [], HISTORY: []}
+    errors = {TRANSFER: 0, HISTORY: 0}
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            try:
+                kind, sender_id, recipient_id = work.get_nowait()
+            except queue.Empty:
+                return
+
+            method, path, query, body = build_request(kind, sender_id, recipient_id, routes)
+            environ = {
+                'REQUEST_METHOD': method,
+                'SCRIPT_NAME': '',
+                'PATH_INFO': path,
+                'QUERY_STRING': query,
+                'CONTENT_TYPE': 'application/json',
+                'CONTENT_LENGTH': str(len(body)),
+                'SERVER_NAME': 'testserver',
+                'SERVER_PORT': '80',
+                'SERVER_PROTOCOL': 'HTTP/1.1',
+                'HTTP_HOST': 'testserver',
+                'HTTP_COOKIE': headers['cookie'],
+                'HTTP_X_CSRFTOKEN': headers['x-csrftoken'],
+                'REMOTE_ADDR': '127.0.0.1',
+                'wsgi.input': io.BytesIO(body),
+                'wsgi.errors': io.StringIO(),
+                'wsgi.url_scheme': 'http',
+                'wsgi.version': (1, 0),
+                'wsgi.multithread': True,
+                'wsgi.multiprocess': False,
+                'wsgi.run_once': False,
+            }
+            response_status = []
+
+            started = time.perf_counter()
+            response = handler(environ, lambda status, _: response_status.append(status))
+            try:
+                b''.join(response)
+            finally:
+                response.close()
+            elapsed = time.perf_counter() - started
+
+            with lock:
+                if int(response_status[0].split()[0]) >= 400:
+                    errors[kind] += 1
+                else:
+                    samples[kind].append(elapsed)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        kind: summarize(samples[kind], elapsed, errors[kind])
+        for kind in samples if samples[kind] or errors[kind]
+    }
+
+
+def run_asgi(workload: list[tuple], concurrency: int, headers: dict, routes: tuple) -> dict:
+    """
+    Serve the workload with `ASGIHandler` on one event loop, `concurrency` requests at a time.
+
+    :param workload: Requests from `generate_requests`
+    :param concurrency: Maximum number of requests in flight
+    :param headers: Authentication headers
+    :param routes: URL names of the transfer and history views to call
+    :return: Latency summary per endpoint
+    :rtype: dict
+    """
+    handler = ASGIHandler()
+    raw_headers = [
+        (b'host', b'testserver'),
+        (b'content-type', b'application/json'),
+        (b'cookie', headers['cookie'].encode()),
+        (b'x-csrftoken', headers['x-csrftoken'].encode()),
+    ]
+
+    samples = {TRANSFER: [], HISTORY: []}
+    errors = {TRANSFER: 0, HISTORY: 0}
+
+    async def request(kind, sender_id, recipient_id, limiter):
+        method, path, query, body = build_request(kind, sender_id, recipient_id, routes)
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': method,
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': query.encode(),
+            'root_path': '',
+            'headers': raw_headers + [(b'content-length', str(len(body)).encode())],
+            'client': ('127.0.0.1', 0),
+            'server': ('testserver', 80),
+        }
+        messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+        finished = asyncio.Event()
+        response_status = []
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            await finished.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                response_status.append(message['status'])
+            elif not message.get('more_body'):
+                finished.set()
+
+        async with limiter:
+            started = time.perf_counter()
+            await handler(scope, receive, send)
+            elapsed = time.perf_counter() - started
+
+        if response_status[0] >= 400:
+            errors[kind] += 1
+        else:
+            samples[kind].append(elapsed)
+
+    async def main():
+        limiter = asyncio.Semaphore(concurrency)
+        await asyncio.gather(*(request(*item, limiter) for item in workload))
+
+    started = time.perf_counter()
+    asyncio.run(main())
+    elapsed = time.perf_counter() - started
+
+    return {
+        kind: summarize(samples[kind], elapsed, errors[kind])
+        for kind in samples if samples[kind] or errors[kind]
+    }
+
+
+def run_handler_benchmark(
+    wallet_ids: list[int],
+    modes: list[str],
+    concurrency_levels: list[int],
+    requests: int,
+    history_ratio: float,
+    seed: int = 0
+) -> list[dict]:
+    """
+    Compare the WSGI handler, the ASGI handler with sync views and the ASGI handler
+    with async views on the same workloads.
+
+    :param wallet_ids: Seeded wallet IDs
+    :param modes: Modes to run, from `MODES`
+    :param concurrency_levels: Concurrent requests to run each mode with
+    :param requests: Requests per mode and concurrency level
+    :param history_ratio: Share of history requests
+    :param seed: Random seed of the workloads
+    :return: One result per mode, concurrency level and endpoint
+    :rtype: list[dict]
+    """
+    user = User.objects.create(username='bench-staff', is_staff=True)
+    headers = session_headers(user)
+    workload = generate_requests(wallet_ids, requests, 'uniform', history_ratio, 1.1, seed)
+
+    results = []
+    with http_environment():
+        for concurrency in concurrency_levels:
+            for mode in modes:
+                if mode == 'wsgi':
+                    summary = run_wsgi(workload, concurrency, headers)
+                else:
+                    summary = run_asgi(workload, concurrency, headers, ROUTES[mode])
+                for endpoint, endpoint_summary in summary.items():
+                    results.append({
+                        'mode': mode,
+                        'concurrency': concurrency,
+                        'endpoint': endpoint,
+                        **endpoint_summary
+                    })
+    return results
@@ -0,0 +1,310 @@
+"""
+HTTP load benchmark for the transfer and history endpoints
+"""
+
+import queue
+import random
+import threading
+import time
+
+from bisect import bisect_left
+from itertools import accumulate
+from contextlib import contextmanager
+
+from django.urls import reverse
+from django.db import connection
+from django.contrib.auth.models import User
+from django.test.utils import setup_test_environment
+from django.test.utils import teardown_test_environment
+
+from rest_framework.test import APIClient
+
+from apps.wallets.models.wallet import Wallet
+from apps.wallets.services.commission import CommissionService
+from apps.wallets.benchmarks.stats import summarize
+from apps.wallets.benchmarks.stats import percentile
+
+PROFILES = ('uniform', 'zipf', 'admin')
+
+TRANSFER = 'transfer'
+HISTORY = 'history'
+
+
+class WalletPicker:
+    """
+    Draws wallet IDs according to a contention profile.
+
+    Profiles:
+        - `uniform`: every wallet is equally likely.
+        - `zipf`: the wallet of rank k is picked with probability proportional to 1 / k^s,
+          so a few hot wallets receive most of the traffic.
+        - `admin`: senders are uniform and every transfer goes to the admin wallet.
+    """
+
+    def __init__(self, wallet_ids: list[int], profile: str, zipf_s: float, rng: random.Random):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown profile '{profile}', expected one of: {', '.join(PROFILES)}")
+
+        self.admin_id = CommissionService.ADMIN_WALLET_ID
+        self.wallet_ids = [wallet_id for wallet_id in wallet_ids if wallet_id != self.admin_id]
+        self.profile = profile
+        self.rng = rng
+        self.cum_weights = None
+
+        if profile == 'zipf':
+            ranked = self.wallet_ids[:]
+            rng.shuffle(ranked)
+            self.wallet_ids = ranked
+            self.cum_weights = list(accumulate(1 / rank ** zipf_s for rank in range(1, len(ranked) + 1))) # noqa
+
+    def pick(self) -> int:
+        if self.cum_weights is None:
+            return self.rng.choice(self.wallet_ids)
+        index = bisect_left(self.cum_weights, self.rng.random() * self.cum_weights[-1])
+        return self.wallet_ids[min(index, len(self.wallet_ids) - 1)]
+
+    def pair(self) -> tuple[int, int]:
+        """
+        Draw a (sender_id, recipient_id) pair of distinct wallets.
+
+        :return: Sender and recipient wallet IDs
+        :rtype: tuple[int, int]
+        """
+        sender_id = self.pick()
+        if self.profile == 'admin':
+            return sender_id, self.admin_id
+
+        recipient_id = self.pick()
+        while recipient_id == sender_id:
+            recipient_id = self.pick()
+        return sender_id, recipient_id
+
+
+def generate_requests(
+    wallet_ids: list[int],
+    count: int,
+    profile: str,
+    history_ratio: float,
+    zipf_s: float,
+    seed: int
+) -> list[tuple]:
+    """
+    Generate a reproducible mix of transfer and history requests.
+
+    :param wallet_ids: Seeded wallet IDs
+    :param count: Number of requests
+    :param profile: Contention profile, one of `PROFILES`
+    :param history_ratio: Share of history requests, between 0 and 1
+    :param zipf_s: Exponent of the Zipfian profile
+    :param seed: Random seed
+    :return: Tuples of (kind, sender_id, recipient_id); history requests read the sender wallet
+    :rtype: list[tuple]
+    """
+    rng = random.Random(seed)
+    picker = WalletPicker(wallet_ids, profile, zipf_s, rng)
+
+    requests = []
+    for _ in range(count):
+        sender_id, recipient_id = picker.pair()
+        kind = HISTORY if rng.random() < history_ratio else TRANSFER
+        requests.append((kind, sender_id, recipient_id))
+    return requests
+
+
+@contextmanager
+def http_environment():
+    """
+    Let the test client reach the application as the Django test runner does.
+
+    Adds `testserver` to `ALLOWED_HOSTS` for the duration of the benchmark.
+    """
+    setup_test_environment()
+    try:
+        yield
+    finally:
+        teardown_test_environment()
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper counting queries and timing row-locking statements.
+
+    Lock wait is approximated by the time spent in `SELECT ... FOR UPDATE` and
+    `UPDATE` statements, which is where transfers block on each other.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.lock_seconds = 0.0
+
+    def reset(self):
+        self.queries = 0
+        self.lock_seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        statement = sql.lstrip()[:6].upper()
+        if statement != 'UPDATE' and 'FOR UPDATE' not in sql:
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.lock_seconds += time.perf_counter() - started
+
+
+def run_requests(requests: list[tuple], threads: int, amount: str, users: dict) -> dict:
+    """
+    Send requests through the full Django stack from several threads, one connection each.
+
+    :param requests: Requests from `generate_requests`
+    :param threads: Number of concurrent threads
+    :param amount: Amount of every transfer
+    :param users: Wallet owners by wallet ID, used to authenticate each request
+    :return: Summary per endpoint with latency, queries per request and lock wait
+    :rtype: dict
+    """
+    work = queue.SimpleQueue()
+    for request in requests:
+        work.put(request)
+
+    transfer_url = reverse('transfer')
+    history_url = reverse('transaction-history')
+
+    samples = {TRANSFER: [], HISTORY: []}
+    errors = {TRANSFER: 0, HISTORY: 0}
+    lock = threading.Lock()
+
+    def worker():
+        client = APIClient()
+        recorder = QueryRecorder()
+        local_samples = {TRANSFER: [], HISTORY: []}
+        local_errors = {TRANSFER: 0, HISTORY: 0}
+        try:
+            with connection.execute_wrapper(recorder):
+                while True:
+                    try:
+                        kind, sender_id, recipient_id = work.get_nowait()
+                    except queue.Empty:
+                        break
+
+                    client.force_authenticate(user=users[sender_id])
+                    recorder.reset()
+                    started = time.perf_counter()
+                    if kind == TRANSFER:
+                        response = client.post(transfer_url, {
+                            'sender_id': sender_id,
+                            'recipient_id': recipient_id,
+                            'amount': amount
+                        }, format='json')
+                    else:
+                        response = client.get(history_url, {'wallet_id': sender_id})
+                    elapsed = time.perf_counter() - started
+
+                    if response.status_code >= 400:
+                        local_errors[kind] += 1
+                        continue
+                    local_samples[kind].append((elapsed, recorder.queries, recorder.lock_seconds))
+        finally:
+            connection.close()
+            with lock:
+                for kind in samples:
+                    samples[kind].extend(local_samples[kind])
+                    errors[kind] += local_errors[kind]
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    results = {}
+    for kind, kind_samples in samples.items():
+        if not kind_samples and not errors[kind]:
+            continue
+
+        queries = [sample[1] for sample in kind_samples]
+        lock_waits = sorted(sample[2] for sample in kind_samples)
+        results[kind] = {
+            **summarize([sample[0] for sample in kind_samples], elapsed, errors[kind]),
+            'queries_per_request': round(sum(queries) / len(queries), 2) if queries else 0.0,
+            'lock_wait_total_s': round(sum(lock_waits), 3),
+            'lock_wait_p95_ms': round(percentile(lock_waits, 0.95) * 1000, 3),
+            'lock_wait_p99_ms': round(percentile(lock_waits, 0.99) * 1000, 3),
+        }
+    return results
+
+
+def run_load_benchmark(
+    wallet_ids: list[int],
+    profiles: list[str],
+    requests: int,
+    threads: int,
+    history_ratio: float,
+    zipf_s: float = 1.1,
+    seed: int = 0
+) -> list[dict]:
+    """
+    Drive the transfer and history endpoints with every contention profile.
+
+    :param wallet_ids: Seeded wallet IDs
+    :param profiles: Contention profiles to run, from `PROFILES`
+    :param requests: Requests per profile
+    :param threads: Number of concurrent threads
+    :param history_ratio: Share of history requests
+    :param zipf_s: Exponent of the Zipfian profile
+    :param seed: Random seed of the workloads
+    :return: One result per profile and endpoint
+    :rtype: list[dict]
+    """
+    owners = dict(Wallet.objects.filter(id__in=wallet_ids).values_list('id', 'user_id'))
+    users_by_id = User.objects.in_bulk(owners.values())
+    users = {wallet_id: users_by_id[user_id] for wallet_id, user_id in owners.items()}
+
+    results = []
+    with http_environment():
+        for profile in profiles:
+            workload = generate_requests(wallet_ids, requests, profile, history_ratio, zipf_s, seed) # noqa
+            summary = run_requests(workload, threads, '1.00', users)
+            for endpoint, endpoint_summary in summary.items():
+                results.append({
+                    'profile': profile,
+                    'endpoint': endpoint,
+                    'threads': threads,
+                    **endpoint_summary
+                })
+    return results
+
+
+def compare_results(baseline: list[dict], results: list[dict]) -> list[dict]:
+    """
+    Compare results with a previous run of the same benchmark.
+
+    :param baseline: Results of the previous run
+    :param results: Results of the current run
+    :return: Relative change of throughput and p95 latency per profile and endpoint
+    :rtype: list[dict]
+    """
+    previous = {(result['profile'], result['endpoint']): result for result in baseline}
+
+    def change(old, new):
+        return round((new - old) / old * 100, 1) if old else None
+
+    changes = []
+    for result in results:
+        old = previous.get((result['profile'], result['endpoint']))
+        if old is None:
+            continue
+        changes.append({
+            'profile': result['profile'],
+            'endpoint': result['endpoint'],
+            'throughput_change_pct': change(old['throughput_per_s'], result['throughput_per_s']),
+            'p95_change_pct': change(old['p95_ms'], result['p95_ms']),
+            'queries_per_request_change': round(
+                result['queries_per_request'] - old['queries_per_request'], 2
+            ),
+        })
+    return changes
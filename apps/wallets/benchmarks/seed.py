@@ -0,0 +1,32 @@
+"""
+Benchmark data seeding
+"""
+
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+
+from apps.wallets.models.wallet import Wallet
+
+
+def seed_wallets(count: int, balance: Decimal, batch_size: int = 5000) -> list[int]:
+    """
+    Create users with one wallet each and return the wallet IDs in creation order.
+
+    The first wallet is created first so it gets the admin wallet ID on an empty database.
+
+    :param count: Number of wallets to create
+    :param balance: Starting balance of every wallet
+    :param batch_size: Rows per bulk insert
+    :return: Wallet IDs
+    :rtype: list[int]
+    """
+    users = User.objects.bulk_create(
+        [User(username=f'bench-{index}') for index in range(count)],
+        batch_size=batch_size
+    )
+    wallets = Wallet.objects.bulk_create(
+        [Wallet(user=user, balance=balance) for user in users],
+        batch_size=batch_size
+    )
+    return [wallet.id for wallet in wallets]
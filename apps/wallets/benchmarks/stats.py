@@ -0,0 +1,42 @@
+"""
+Benchmark statistics
+"""
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """
+    Return a nearest-rank percentile of already sorted values.
+
+    :param sorted_values: Values in ascending order
+    :param fraction: Percentile between 0 and 1
+    :return: Percentile value, or 0.0 for no values
+    :rtype: float
+    """
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: list[float], elapsed: float, errors: int = 0) -> dict:
+    """
+    Summarize request latencies of a benchmark run.
+
+    :param latencies: Latencies of successful operations, in seconds
+    :param elapsed: Wall-clock duration of the run, in seconds
+    :param errors: Number of failed operations
+    :return: Throughput and latency percentiles in milliseconds
+    :rtype: dict
+    """
+    values = sorted(latencies)
+    return {
+        'operations': len(values),
+        'errors': errors,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_per_s': round(len(values) / elapsed, 1) if elapsed else 0.0,
+        'mean_ms': round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+        'p50_ms': round(percentile(values, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(values, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(values, 0.99) * 1000, 3),
+        'max_ms': round(values[-1] * 1000, 3) if values else 0.0,
+    }
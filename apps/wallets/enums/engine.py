@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class TransferEngine(Enum):
+    LOCKING = 'locking'
+    OPTIMISTIC = 'optimistic'
+
+    @property
+    def label(self):
+        return self.name.title()
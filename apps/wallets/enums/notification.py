@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class DeadLetterKind(Enum):
+    NOTIFICATION = 'notification'
+    DIGEST = 'digest'
+
+    @property
+    def label(self):
+        return self.name.replace('_', ' ').title()
@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class OutboxEventType(Enum):
+    TRANSFER_COMPLETED = 'transfer.completed'
+
+    @property
+    def label(self):
+        return self.name.replace('_', ' ').title()
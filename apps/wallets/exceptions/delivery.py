@@ -0,0 +1,9 @@
+"""
+Delivery exceptions
+"""
+
+
+class NotificationDeliveryError(Exception):
+    """
+    Notification rejected by, or not delivered to, the notification endpoint.
+    """
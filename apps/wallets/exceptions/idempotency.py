@@ -0,0 +1,9 @@
+"""
+Idempotency exceptions
+"""
+
+
+class IdempotencyKeyReusedError(ValueError):
+    """
+    Idempotency key was already used for a request with a different payload.
+    """
@@ -0,0 +1,9 @@
+"""
+Import exceptions
+"""
+
+
+class ImportRowError(ValueError):
+    """
+    Row of an import file rejected by validation.
+    """
@@ -0,0 +1,76 @@
+"""
+Transfer exceptions
+"""
+
+from rest_framework.settings import api_settings
+
+
+class TransferValidationError(ValueError):
+    """
+    Transfer rejected for a reason the request serializer used to report.
+
+    Raised by the service after checking the locked wallet rows, and rendered
+    with the same payload shape as a serializer-level validation error.
+    """
+
+    reason = 'invalid'
+
+    @property
+    def detail(self) -> dict:
+        """
+        Serializer-style error payload.
+
+        :return: Error messages keyed like non-field serializer errors
+        :rtype: dict
+        """
+        return {api_settings.NON_FIELD_ERRORS_KEY: [str(self)]}
+
+
+class WalletNotFoundError(TransferValidationError):
+    """
+    Sender or recipient wallet does not exist.
+    """
+
+    reason = 'wallet_not_found'
+
+
+class WalletOwnershipError(TransferValidationError):
+    """
+    Sender wallet does not belong to the requesting user.
+    """
+
+    reason = 'wallet_ownership'
+
+
+class InsufficientFundsError(ValueError):
+    """
+    Sender balance does not cover the transfer amount.
+    """
+
+    reason = 'insufficient_funds'
+
+
+class InsufficientFundsForCommissionError(InsufficientFundsError):
+    """
+    Sender balance covers the transfer amount but not its commission.
+    """
+
+    reason = 'insufficient_funds_commission'
+
+
+class HotWalletQueueError(Exception):
+    """
+    Transfer routed to a hot wallet queue did not get a result from its consumer.
+
+    The transfer may still have been applied, so its outcome is unknown.
+    """
+
+
+class HotWalletBusyError(Exception):
+    """
+    Transfer expired in a hot wallet queue before its consumer reached it.
+
+    The transfer was not applied and can be retried.
+    """
+
+    reason = 'hot_wallet_busy'
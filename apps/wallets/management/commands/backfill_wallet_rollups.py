@@ -0,0 +1,58 @@
+"""
+Rebuild per-wallet daily rollups from the transaction history
+"""
+
+from datetime import date
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from apps.wallets.models.transaction import Transaction
+from apps.wallets.services.rollup import RollupService
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the daily rollups of a range of days from completed transactions, "
+        "one chunk of days per transaction. Defaults to every day from the oldest "
+        "transaction up to yesterday; today is maintained by live transfers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--from',
+            dest='date_from',
+            type=date.fromisoformat,
+            help="First day to rebuild (YYYY-MM-DD), the oldest transaction by default"
+        )
+        parser.add_argument(
+            '--to',
+            dest='date_to',
+            type=date.fromisoformat,
+            help="Last day to rebuild (YYYY-MM-DD), before today, yesterday by default"
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        date_to = options['date_to'] or today - timedelta(days=1)
+        if date_to >= today:
+            raise CommandError("--to must be before today, which live transfers still update")
+
+        date_from = options['date_from']
+        if date_from is None:
+            oldest = Transaction.objects.order_by('created_at').values_list('created_at', flat=True).first() # noqa
+            if oldest is None:
+                self.stdout.write("No transactions to backfill")
+                return
+            date_from = timezone.localdate(oldest)
+
+        if date_from > date_to:
+            raise CommandError("--from must not be after --to")
+
+        report = RollupService.backfill(date_from, date_to + timedelta(days=1))
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {report['days']} days from {date_from} to {date_to}: "
+            f"{report['rows']} rollup rows"
+        ))
@@ -0,0 +1,80 @@
+"""
+Compare the ASGI and WSGI request paths
+"""
+
+import json
+
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from apps.wallets.benchmarks.seed import seed_wallets
+from apps.wallets.benchmarks.handlers import MODES
+from apps.wallets.benchmarks.handlers import run_handler_benchmark
+from apps.wallets.benchmarks.environment import benchmark_database
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve the same transfer and history workload through Django's WSGI handler, "
+        "its ASGI handler with the sync views, and its ASGI handler with the async views, "
+        "at several concurrency levels, on a throwaway test database. SQLite serializes "
+        "writers; use PostgreSQL for representative numbers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wallets', type=int, default=1000, help="Number of seeded wallets")
+        parser.add_argument('--requests', type=int, default=1000, help="Requests per mode and level")
+        parser.add_argument(
+            '--concurrency',
+            default='1,16,64',
+            help="Comma-separated numbers of concurrent requests"
+        )
+        parser.add_argument(
+            '--modes',
+            default=','.join(MODES),
+            help=f"Comma-separated modes: {', '.join(MODES)}"
+        )
+        parser.add_argument(
+            '--history-ratio',
+            type=float,
+            default=0.5,
+            help="Share of requests reading transaction history"
+        )
+        parser.add_argument('--seed', type=int, default=0, help="Random seed of the workload")
+        parser.add_argument('--output', help="Write results as JSON to this file")
+        parser.add_argument('--keepdb', action='store_true', help="Keep the test database")
+
+    def handle(self, *args, **options):
+        modes = [mode.strip() for mode in options['modes'].split(',')]
+        unknown = set(modes) - set(MODES)
+        if unknown:
+            raise CommandError(f"Unknown modes: {', '.join(sorted(unknown))}")
+        levels = [int(level) for level in options['concurrency'].split(',')]
+
+        with benchmark_database(keepdb=options['keepdb']):
+            wallet_ids = seed_wallets(
+                options['wallets'],
+                Decimal(options['requests'] * len(modes) * len(levels) * 10)
+            )
+            results = run_handler_benchmark(
+                wallet_ids,
+                modes,
+                levels,
+                options['requests'],
+                options['history_ratio'],
+                options['seed']
+            )
+
+        for result in results:
+            self.stdout.write(
+                f"{result['mode']:<10} c={result['concurrency']:<4} {result['endpoint']:<9} "
+                f"{result['throughput_per_s']:>9}/s  p50={result['p50_ms']}ms  "
+                f"p99={result['p99_ms']}ms  errors={result['errors']}"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
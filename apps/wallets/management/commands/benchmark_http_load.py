@@ -0,0 +1,122 @@
+"""
+Load test the transfer and history endpoints under several contention profiles
+"""
+
+import json
+import subprocess
+
+from decimal import Decimal
+
+from django.db import connection
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from apps.wallets.benchmarks.seed import seed_wallets
+from apps.wallets.benchmarks.load import PROFILES
+from apps.wallets.benchmarks.load import compare_results
+from apps.wallets.benchmarks.load import run_load_benchmark
+from apps.wallets.benchmarks.environment import benchmark_database
+
+from src.settings.config.config import config
+
+
+def current_commit():
+    """
+    Return the checked out git commit, if any, so results can be matched to code.
+    """
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed wallets on a throwaway test database and drive the transfer and history "
+        "endpoints concurrently through the full Django stack. Reports throughput, latency "
+        "percentiles, queries per request and lock wait for each contention profile. "
+        "Needs no external services; use PostgreSQL for representative numbers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wallets', type=int, default=1000, help="Number of seeded wallets")
+        parser.add_argument('--requests', type=int, default=2000, help="Requests per profile")
+        parser.add_argument('--threads', type=int, default=8, help="Concurrent threads")
+        parser.add_argument(
+            '--profiles',
+            default=','.join(PROFILES),
+            help=f"Comma-separated contention profiles: {', '.join(PROFILES)}"
+        )
+        parser.add_argument(
+            '--history-ratio',
+            type=float,
+            default=0.2,
+            help="Share of requests reading transaction history"
+        )
+        parser.add_argument('--zipf-s', type=float, default=1.1, help="Exponent of the zipf profile")
+        parser.add_argument('--seed', type=int, default=0, help="Random seed of the workload")
+        parser.add_argument('--output', help="Write results as JSON to this file")
+        parser.add_argument('--baseline', help="Compare with results JSON of a previous run")
+        parser.add_argument('--keepdb', action='store_true', help="Keep the test database")
+
+    def handle(self, *args, **options):
+        profiles = [profile.strip() for profile in options['profiles'].split(',')]
+        unknown = set(profiles) - set(PROFILES)
+        if unknown:
+            raise CommandError(f"Unknown profiles: {', '.join(sorted(unknown))}")
+
+        with benchmark_database(keepdb=options['keepdb']):
+            wallet_ids = seed_wallets(
+                options['wallets'],
+                Decimal(options['requests'] * len(profiles) * 10)
+            )
+            results = run_load_benchmark(
+                wallet_ids,
+                profiles,
+                options['requests'],
+                options['threads'],
+                options['history_ratio'],
+                options['zipf_s'],
+                options['seed']
+            )
+
+        for result in results:
+            self.stdout.write(
+                f"{result['profile']:<8} {result['endpoint']:<9} "
+                f"{result['throughput_per_s']:>9}/s  p50={result['p50_ms']}ms  "
+                f"p95={result['p95_ms']}ms  p99={result['p99_ms']}ms  "
+                f"queries={result['queries_per_request']}  "
+                f"lock_wait={result['lock_wait_total_s']}s  errors={result['errors']}"
+            )
+
+        if options['baseline']:
+            with open(options['baseline']) as baseline_file:
+                baseline = json.load(baseline_file)
+            for change in compare_results(baseline['results'], results):
+                self.stdout.write(
+                    f"{change['profile']:<8} {change['endpoint']:<9} "
+                    f"throughput {change['throughput_change_pct']}%  "
+                    f"p95 {change['p95_change_pct']}%  "
+                    f"queries {change['queries_per_request_change']:+}"
+                )
+
+        if options['output']:
+            report = {
+                'commit': current_commit(),
+                'database': connection.vendor,
+                'transfer_engine': config.wallet.TRANSFER_ENGINE,
+                'options': {
+                    key: options[key]
+                    for key in ('wallets', 'requests', 'threads', 'history_ratio', 'zipf_s', 'seed')
+                },
+                'profiles': profiles,
+                'results': results
+            }
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
@@ -0,0 +1,63 @@
+"""
+Benchmark the locking and optimistic transfer engines
+"""
+
+import json
+
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from apps.wallets.benchmarks.seed import seed_wallets
+from apps.wallets.benchmarks.engines import run_engine_benchmark
+from apps.wallets.benchmarks.environment import benchmark_database
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare throughput and latency of the transfer engines at several contention "
+        "levels, on a throwaway test database. SQLite serializes writers, so with several "
+        "threads the locking engine reports lock errors there; use PostgreSQL for "
+        "representative numbers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wallets', type=int, default=1000, help="Number of seeded wallets")
+        parser.add_argument('--transfers', type=int, default=2000, help="Transfers per engine and level")
+        parser.add_argument('--threads', type=int, default=8, help="Concurrent threads")
+        parser.add_argument(
+            '--hot-fractions',
+            default='0,0.5,0.9',
+            help="Comma-separated shares of transfers sent from one hot wallet"
+        )
+        parser.add_argument('--seed', type=int, default=0, help="Random seed of the workload")
+        parser.add_argument('--output', help="Write results as JSON to this file")
+        parser.add_argument('--keepdb', action='store_true', help="Keep the test database")
+
+    def handle(self, *args, **options):
+        hot_fractions = [float(value) for value in options['hot_fractions'].split(',')]
+
+        with benchmark_database(keepdb=options['keepdb']):
+            wallet_ids = seed_wallets(
+                options['wallets'],
+                Decimal(options['transfers'] * len(hot_fractions) * 10)
+            )
+            results = run_engine_benchmark(
+                wallet_ids,
+                options['transfers'],
+                options['threads'],
+                hot_fractions,
+                options['seed']
+            )
+
+        for result in results:
+            self.stdout.write(
+                f"{result['engine']:<11} hot={result['hot_fraction']:<4} "
+                f"{result['throughput_per_s']:>9}/s  p50={result['p50_ms']}ms  "
+                f"p99={result['p99_ms']}ms  errors={result['errors']}"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
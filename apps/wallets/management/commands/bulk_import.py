@@ -0,0 +1,105 @@
+"""
+Bulk import of wallets and historical transactions
+"""
+
+import sys
+import json
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from apps.wallets.services.importer import ImportService
+
+
+class Command(BaseCommand):
+    help = (
+        "Import users with their wallets, or historical transactions, from a CSV or "
+        "NDJSON file (optionally gzip-compressed), loaded in chunks through COPY on "
+        "PostgreSQL. Import wallets before the transactions that reference them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or - to read standard input")
+        parser.add_argument('--kind', choices=ImportService.KINDS, required=True, help="Rows in the file") # noqa
+        parser.add_argument(
+            '--format',
+            choices=ImportService.FORMATS,
+            help="File format, inferred from the file extension by default"
+        )
+        parser.add_argument('--gzip', action='store_true', help="The file is gzip-compressed")
+        parser.add_argument('--chunk-size', type=int, help="Rows validated and loaded per transaction") # noqa
+        parser.add_argument(
+            '--skip-invalid',
+            action='store_true',
+            help="Load the valid rows and report the invalid ones instead of stopping"
+        )
+        parser.add_argument('--dry-run', action='store_true', help="Validate the file without loading it") # noqa
+        parser.add_argument(
+            '--no-check',
+            action='store_true',
+            help="Skip the balance check of the wallets touched by a transaction import"
+        )
+        parser.add_argument('--json', action='store_true', help="Print the full report as JSON")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt, compressed = ImportService.detect_format(path)
+        fmt = options['format'] or fmt
+        compressed = compressed or options['gzip']
+        if fmt is None:
+            raise CommandError("Cannot infer the file format, pass --format")
+
+        try:
+            stream = sys.stdin.buffer if path == '-' else open(path, 'rb')
+        except OSError as e:
+            raise CommandError(f"Cannot open {path}: {e}")
+
+        try:
+            report = ImportService.run(
+                stream,
+                options['kind'],
+                fmt,
+                compressed=compressed,
+                chunk_size=options['chunk_size'],
+                skip_invalid=options['skip_invalid'],
+                dry_run=options['dry_run'],
+                check=not options['no_check']
+            )
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        for error in report['errors']:
+            self.stdout.write(self.style.WARNING(f"Line {error['line']}: {error['error']}"))
+
+        self.stdout.write(
+            f"Read {report['rows_read']} rows, loaded {report['rows_loaded']} in "
+            f"{report['chunks']} chunks in {report['elapsed_s']}s "
+            f"({report['rows_per_s']} rows/s, backend: {report['backend']}); "
+            f"invalid: {report['rows_invalid']}"
+        )
+
+        check = report['check']
+        if check:
+            for item in check['drifted']:
+                self.stdout.write(self.style.WARNING(
+                    f"Wallet {item['wallet_id']}: balance {item['balance']}, "
+                    f"expected {item['expected']}, drift {item['drift']}"
+                ))
+            style = self.style.ERROR if check['drifted_count'] else self.style.SUCCESS
+            self.stdout.write(style(
+                f"Checked {check['wallets_checked']} wallets against their history; "
+                f"drifted: {check['drifted_count']}"
+            ))
+
+        if report['aborted']:
+            raise CommandError(
+                "Stopped at the first chunk with invalid rows, earlier chunks were loaded; "
+                "fix the file or pass --skip-invalid"
+            )
+        if not report['dry_run'] and not check:
+            self.stdout.write(self.style.SUCCESS("Import finished"))
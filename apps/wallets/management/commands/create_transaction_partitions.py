@@ -0,0 +1,34 @@
+"""
+Create monthly partitions of the transactions table ahead of time
+"""
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from apps.wallets.services.retention import RetentionService
+
+from src.settings.config.config import config
+
+
+class Command(BaseCommand):
+    help = (
+        "Create missing monthly partitions of the transactions table from the current "
+        "month on. The table must already be partitioned by range on created_at."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ahead',
+            type=int,
+            default=config.task.CELERY_PARTITION_MONTHS_AHEAD,
+            help="Months after the current one to cover"
+        )
+
+    def handle(self, *args, **options):
+        if not RetentionService.is_partitioned():
+            raise CommandError("The transactions table is not partitioned")
+
+        created = RetentionService.create_partitions(options['ahead'])
+        for name in created:
+            self.stdout.write(f"Created partition {name}")
+        self.stdout.write(self.style.SUCCESS(f"Created {len(created)} partitions"))
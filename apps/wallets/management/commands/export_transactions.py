@@ -0,0 +1,107 @@
+"""
+Export transaction histories as CSV or NDJSON
+"""
+
+import sys
+import gzip
+import time
+
+from datetime import datetime
+
+from django.db import connections
+from django.utils import timezone
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from apps.wallets.models.wallet import Wallet
+from apps.wallets.services.export import TransactionExportService
+
+from src.settings.db.router import PRIMARY
+from src.settings.db.router import replica_lag
+
+
+def moment(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream every transaction of a wallet, or every transaction of a date range, "
+        "oldest first, to a CSV or NDJSON file (gzip-compressed for .gz paths) or to "
+        "standard output. Reads from a healthy replica when one is configured."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help="File to write, or - for standard output")
+        parser.add_argument('--wallet', type=int, help="Only transactions of this wallet")
+        parser.add_argument(
+            '--from',
+            dest='date_from',
+            type=moment,
+            help="Only transactions created at or after this date or time (ISO 8601)"
+        )
+        parser.add_argument(
+            '--to',
+            dest='date_to',
+            type=moment,
+            help="Only transactions created before this date or time (ISO 8601)"
+        )
+        parser.add_argument(
+            '--format',
+            choices=TransactionExportService.FORMATS,
+            help="File format, inferred from the file extension by default, CSV for -"
+        )
+        parser.add_argument('--gzip', action='store_true', help="Compress the output")
+        parser.add_argument(
+            '--database',
+            choices=list(connections),
+            help="Database alias to read from, a healthy replica or the primary by default"
+        )
+        parser.add_argument('--chunk-size', type=int, help="Rows fetched from the cursor at a time") # noqa
+
+    def handle(self, *args, **options):
+        output = options['output']
+        wallet_id = options['wallet']
+        if wallet_id is None and not (options['date_from'] and options['date_to']):
+            raise CommandError("Pass --wallet, or both --from and --to")
+
+        name = output.lower()
+        compressed = options['gzip'] or name.endswith('.gz')
+        fmt = options['format'] or ('ndjson' if '.ndjson' in name or '.jsonl' in name else 'csv')
+
+        database = options['database'] or next(iter(replica_lag.healthy()), PRIMARY)
+        if wallet_id is not None and not Wallet.objects.using(database).filter(id=wallet_id).exists(): # noqa
+            raise CommandError(f"Wallet {wallet_id} does not exist")
+
+        rows = TransactionExportService.queryset(
+            wallet_id=wallet_id,
+            date_from=options['date_from'],
+            date_to=options['date_to']
+        ).using(database)
+        chunks = TransactionExportService.stream(rows, fmt, options['chunk_size'])
+
+        started = time.perf_counter()
+        written = 0
+        if output == '-':
+            stream = sys.stdout.buffer
+            if compressed:
+                chunks = TransactionExportService.compress(chunks)
+        else:
+            stream = gzip.open(output, 'wb') if compressed else open(output, 'wb')
+
+        try:
+            for chunk in chunks:
+                stream.write(chunk)
+                written += len(chunk)
+        finally:
+            if output == '-':
+                stream.flush()
+            else:
+                stream.close()
+
+        if output != '-':
+            self.stderr.write(self.style.SUCCESS(
+                f"Exported {fmt} from {database} to {output} "
+                f"({written} bytes uncompressed) in {time.perf_counter() - started:.3f}s"
+            ))
@@ -0,0 +1,110 @@
+"""
+Stand-in notification endpoint for local runs and delivery benchmarks
+"""
+
+import time
+import random
+import asyncio
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve a stand-in for the notification API on HTTP/1.1 with keep-alive. "
+        "Every request is answered after --latency seconds, with 503 for a "
+        "--failure-rate share of them and 200 otherwise. Point CELERY_NOTIFY_URL "
+        "at it with CELERY_NOTIFY_BACKEND=http."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1', help="Interface to listen on")
+        parser.add_argument('--port', type=int, default=8080, help="Port to listen on")
+        parser.add_argument('--latency', type=float, default=0.1, help="Seconds before each response") # noqa
+        parser.add_argument(
+            '--failure-rate',
+            type=float,
+            default=0.0,
+            help="Share of requests answered with 503, between 0 and 1"
+        )
+        parser.add_argument(
+            '--report-interval',
+            type=float,
+            default=10.0,
+            help="Seconds between request rate reports, 0 to disable"
+        )
+
+    def handle(self, *args, **options):
+        self.latency = options['latency']
+        self.failure_rate = options['failure_rate']
+        self.served = 0
+        self.failed = 0
+        try:
+            asyncio.run(self.serve(options['host'], options['port'], options['report_interval']))
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(f"Served {self.served} requests, {self.failed} answered with 503")
+
+    async def serve(self, host: str, port: int, report_interval: float):
+        server = await asyncio.start_server(self.handle_connection, host, port, backlog=1024)
+        self.stdout.write(self.style.SUCCESS(
+            f"Notification stub listening on http://{host}:{port}/ "
+            f"(latency {self.latency}s, failure rate {self.failure_rate})"
+        ))
+        async with server:
+            if report_interval > 0:
+                asyncio.create_task(self.report(report_interval))
+            await server.serve_forever()
+
+    async def report(self, interval: float):
+        last_served = 0
+        last_time = time.perf_counter()
+        while True:
+            await asyncio.sleep(interval)
+            now = time.perf_counter()
+            if self.served != last_served:
+                rate = (self.served - last_served) / (now - last_time)
+                self.stdout.write(f"{self.served} requests served ({rate:.1f}/s)")
+            last_served = self.served
+            last_time = now
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0))
+                if length:
+                    await reader.readexactly(length)
+
+                await asyncio.sleep(self.latency)
+                if random.random() < self.failure_rate:
+                    self.failed += 1
+                    status, body = '503 Service Unavailable', b'{"ok": false}'
+                else:
+                    status, body = '200 OK', b'{"ok": true}'
+                self.served += 1
+
+                writer.write(
+                    f"HTTP/1.1 {status}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
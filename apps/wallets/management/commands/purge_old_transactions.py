@@ -0,0 +1,55 @@
+"""
+Remove old transactions in throttled chunks or by dropping partitions
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.wallets.services.retention import RetentionService
+
+from src.settings.config.config import config
+
+
+class Command(BaseCommand):
+    help = (
+        "Remove transactions older than the retention period. Partitions entirely below "
+        "the threshold are dropped when the table is partitioned; completed rows are "
+        "otherwise deleted in small committed chunks with a pause between them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=config.task.CELERY_RETENTION_DAYS,
+            help="Retention period in days"
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=config.task.CELERY_RETENTION_BATCH_SIZE,
+            help="Maximum rows deleted per statement"
+        )
+        parser.add_argument(
+            '--throttle',
+            type=float,
+            default=config.task.CELERY_RETENTION_THROTTLE,
+            help="Seconds to sleep between chunks"
+        )
+
+    def handle(self, *args, **options):
+        threshold = timezone.now() - timedelta(days=options['days'])
+        report = RetentionService.purge(
+            threshold,
+            batch_size=options['batch_size'],
+            throttle=options['throttle']
+        )
+
+        for name in report['dropped_partitions']:
+            self.stdout.write(f"Dropped partition {name}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {report['deleted_count']} transactions in {report['elapsed_s']}s "
+            f"({report['rows_per_s']} rows/s, mode: {report['mode']})"
+        ))
@@ -0,0 +1,46 @@
+"""
+Check wallet balances against the transaction ledger
+"""
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from apps.wallets.services.reconciliation import ReconciliationService
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare every wallet balance with its incoming minus outgoing completed "
+        "transactions. Resumes from the last checkpoint unless --full is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="Scan the whole transaction history")
+        parser.add_argument('--chunk-size', type=int, help="Transactions read per query")
+        parser.add_argument('--json', action='store_true', help="Print the full report as JSON")
+
+    def handle(self, *args, **options):
+        report = ReconciliationService.run(
+            full=options['full'],
+            chunk_size=options['chunk_size']
+        )
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        for item in report['drifted']:
+            self.stdout.write(self.style.WARNING(
+                f"Wallet {item['wallet_id']}: balance {item['balance']}, "
+                f"expected {item['expected']}, drift {item['drift']}"
+            ))
+
+        summary = (
+            f"Checked {report['wallets_checked']} wallets against "
+            f"{report['transactions_scanned']} transactions in {report['elapsed_s']}s "
+            f"({report['rows_per_s']} rows/s, mode: {report['mode']}, "
+            f"backend: {report['backend']}); drifted: {report['drifted_count']}"
+        )
+        style = self.style.ERROR if report['drifted_count'] else self.style.SUCCESS
+        self.stdout.write(style(summary))
@@ -0,0 +1,84 @@
+"""
+Replay notifications that exhausted their retries
+"""
+
+import time
+
+from datetime import datetime
+
+from django.utils import timezone
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from apps.wallets.enums.notification import DeadLetterKind
+from apps.wallets.services.delivery import DeliveryService
+from apps.wallets.services.dead_letter import DeadLetterService
+
+
+def moment(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+class Command(BaseCommand):
+    help = (
+        "Enqueue pending notification dead letters again, oldest first, in batches "
+        "limited to --rate letters per second. Waits while the notification circuit "
+        "breaker is open. Several redrives may run at once; each claims its own rows "
+        "with SKIP LOCKED."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--kind',
+            choices=[kind.value for kind in DeadLetterKind],
+            help="Only dead letters of this kind"
+        )
+        parser.add_argument('--recipient', type=int, help="Only dead letters to this wallet")
+        parser.add_argument(
+            '--since',
+            type=moment,
+            help="Only dead letters saved at or after this date or time (ISO 8601)"
+        )
+        parser.add_argument('--limit', type=int, help="Stop after this many dead letters")
+        parser.add_argument('--batch-size', type=int, default=100, help="Dead letters claimed per batch") # noqa
+        parser.add_argument('--rate', type=float, default=50.0, help="Dead letters enqueued per second") # noqa
+        parser.add_argument('--dry-run', action='store_true', help="Count the matching dead letters and exit") # noqa
+
+    def handle(self, *args, **options):
+        if options['rate'] <= 0 or options['batch_size'] <= 0:
+            raise CommandError("--rate and --batch-size must be positive")
+
+        queryset = DeadLetterService.pending()
+        if options['kind']:
+            queryset = queryset.filter(kind=options['kind'])
+        if options['recipient'] is not None:
+            queryset = queryset.filter(recipient_id=options['recipient'])
+        if options['since']:
+            queryset = queryset.filter(created_at__gte=options['since'])
+
+        if options['dry_run']:
+            self.stdout.write(f"{queryset.count()} pending dead letters match")
+            return
+
+        limit = options['limit']
+        started = time.perf_counter()
+        redriven = 0
+        while limit is None or redriven < limit:
+            pause = DeliveryService.breaker.remaining()
+            if pause:
+                self.stdout.write(f"Notification endpoint failing, waiting {pause:.1f}s")
+                time.sleep(pause)
+                continue
+
+            batch_started = time.perf_counter()
+            batch_size = options['batch_size'] if limit is None else min(options['batch_size'], limit - redriven) # noqa
+            count = DeadLetterService.redrive_batch(queryset, batch_size)
+            redriven += count
+            if count < batch_size:
+                break
+            time.sleep(max(0.0, count / options['rate'] - (time.perf_counter() - batch_started)))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Redrove {redriven} dead letters in {time.perf_counter() - started:.1f}s"
+        ))
@@ -0,0 +1,35 @@
+"""
+Run a dedicated transactional outbox relay
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.wallets.services.outbox import OutboxService
+
+
+class Command(BaseCommand):
+    help = (
+        "Continuously publish pending outbox events in batches. Several relays may run "
+        "at once; each claims its own rows with SKIP LOCKED."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help="Events claimed per batch")
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0.2,
+            help="Seconds to sleep when the outbox is drained"
+        )
+        parser.add_argument('--once', action='store_true', help="Drain the outbox once and exit")
+
+    def handle(self, *args, **options):
+        while True:
+            relayed = OutboxService.relay(batch_size=options['batch_size'])
+            if options['once']:
+                self.stdout.write(self.style.SUCCESS(f"Relayed {relayed} outbox events"))
+                return
+            if not relayed:
+                time.sleep(options['interval'])
@@ -0,0 +1,8 @@
+from .wallet import * # noqa
+from .transaction import * # noqa
+from .commission import * # noqa
+from .idempotency import * # noqa
+from .outbox import * # noqa
+from .dead_letter import * # noqa
+from .reconciliation import * # noqa
+from .rollup import * # noqa
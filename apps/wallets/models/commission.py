@@ -0,0 +1,18 @@
+from django.db import models
+
+from src.settings.db.postgres.mixins.timestamp import TimestampMixin
+
+
+class CommissionAccrual(TimestampMixin):
+    shard = models.PositiveSmallIntegerField(unique=True)
+    amount = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0
+    )
+
+    class Meta:
+        db_table = 'commission_accruals'
+
+    def __str__(self):
+        return f"Commission shard {self.shard} - Pending: {self.amount}"
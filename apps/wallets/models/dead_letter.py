@@ -0,0 +1,30 @@
+from django.db import models
+
+from apps.wallets.enums.notification import DeadLetterKind
+
+from src.settings.db.postgres.mixins.timestamp import TimestampMixin
+
+
+class NotificationDeadLetter(TimestampMixin):
+    kind = models.CharField(
+        max_length=20,
+        choices=[(tag.value, tag.label) for tag in DeadLetterKind]
+    )
+    recipient_id = models.BigIntegerField(db_index=True)
+    payload = models.JSONField()
+    error = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    redriven_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'notification_dead_letters'
+        indexes = [
+            models.Index(
+                fields=['id'],
+                name='dead_letters_pending_idx',
+                condition=models.Q(redriven_at__isnull=True)
+            ),
+        ]
+
+    def __str__(self):
+        return f"Dead letter {self.id} - {self.kind} to wallet {self.recipient_id}"
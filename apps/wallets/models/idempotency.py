@@ -0,0 +1,32 @@
+from django.db import models
+from django.contrib.auth.models import User
+
+from src.settings.db.postgres.mixins.timestamp import TimestampMixin
+
+
+class IdempotencyKey(TimestampMixin):
+    user = models.ForeignKey(
+        to=User,
+        on_delete=models.CASCADE,
+        related_name='idempotency_keys'
+    )
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField()
+    response = models.JSONField()
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'idempotency_keys'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'key'],
+                name='idempotency_keys_user_key_uniq'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['expires_at']),
+        ]
+
+    def __str__(self):
+        return f"Idempotency key {self.key} - User: {self.user_id}"
@@ -0,0 +1,29 @@
+from django.db import models
+
+from apps.wallets.enums.outbox import OutboxEventType
+
+from src.settings.db.postgres.mixins.timestamp import TimestampMixin
+
+
+class OutboxEvent(TimestampMixin):
+    event_type = models.CharField(
+        max_length=50,
+        choices=[(tag.value, tag.label) for tag in OutboxEventType]
+    )
+    payload = models.JSONField()
+    attempts = models.PositiveIntegerField(default=0)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'outbox_events'
+        indexes = [
+            models.Index(
+                fields=['id'],
+                name='outbox_events_pending_idx',
+                condition=models.Q(delivered_at__isnull=True)
+            ),
+            models.Index(fields=['delivered_at']),
+        ]
+
+    def __str__(self):
+        return f"Outbox event {self.id} - {self.event_type}"
@@ -0,0 +1,20 @@
+from django.db import models
+
+from src.settings.db.postgres.mixins.timestamp import TimestampMixin
+
+
+class ReconciliationCheckpoint(TimestampMixin):
+    last_transaction_id = models.BigIntegerField(default=0)
+    transactions_scanned = models.BigIntegerField(default=0)
+    wallets_checked = models.PositiveIntegerField(default=0)
+    drifted_count = models.PositiveIntegerField(default=0)
+    drifted = models.JSONField(default=list, blank=True)
+    ledger = models.BinaryField()
+    recent_ids = models.BinaryField()
+
+    class Meta:
+        db_table = 'reconciliation_checkpoints'
+        ordering = ['-id']
+
+    def __str__(self):
+        return f"Reconciliation up to transaction {self.last_transaction_id} - Drifted: {self.drifted_count}" # noqa
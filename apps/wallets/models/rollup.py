@@ -0,0 +1,35 @@
+from django.db import models
+
+from apps.wallets.models.wallet import Wallet
+
+from src.settings.db.postgres.mixins.timestamp import TimestampMixin
+
+
+class WalletDailyRollup(TimestampMixin):
+    wallet = models.ForeignKey(
+        Wallet,
+        on_delete=models.CASCADE,
+        related_name='daily_rollups'
+    )
+    day = models.DateField()
+    inflow = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    outflow = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    commission_paid = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    transfers_in = models.PositiveIntegerField(default=0)
+    transfers_out = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'wallet_daily_rollups'
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['wallet', 'day'],
+                name='wallet_daily_rollups_wallet_day_unique'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['day']),
+        ]
+
+    def __str__(self):
+        return f"Wallet {self.wallet_id} on {self.day} - In: {self.inflow} - Out: {self.outflow}" # noqa
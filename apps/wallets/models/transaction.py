@@ -40,10 +40,11 @@ class Transaction(TimestampMixin):
     class Meta:
         db_table = 'transactions'
         indexes = [
-            models.Index(fields=['sender', 'created_at']),
-            models.Index(fields=['recipient', 'created_at']),
+            models.Index(fields=['sender', 'created_at', 'id']),
+            models.Index(fields=['recipient', 'created_at', 'id']),
             models.Index(fields=['transaction_group']),
             models.Index(fields=['status']),
+            models.Index(fields=['created_at', 'id']),
         ]
 
     def __str__(self):
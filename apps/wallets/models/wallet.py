@@ -15,12 +15,19 @@ class Wallet(TimestampMixin):
         decimal_places=2,
         default=0
     )
+    version = models.PositiveBigIntegerField(default=0, editable=False)
 
     class Meta:
         db_table = 'wallets'
         indexes = [
             models.Index(fields=['user']),
         ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(balance__gte=0),
+                name='wallets_balance_non_negative'
+            ),
+        ]
 
     def __str__(self):
         return f"Wallet {self.id} - User: {self.user.username} - Balance: {self.balance}" # noqa
@@ -0,0 +1,29 @@
+from django.urls import path
+from apps.wallets.views.wallet import AsyncWalletDetailAPIView
+from apps.wallets.views.wallet import AsyncWalletListCreateAPIView
+from apps.wallets.views.transfer import AsyncTransferAPIView
+from apps.wallets.views.transcation import AsyncTransactionHistoryAPIView
+
+
+urlpatterns = [
+    path(
+        'wallets/',
+        AsyncWalletListCreateAPIView.as_view(),
+        name='async-wallet-list-create'
+    ),
+    path(
+        'wallets/<int:wallet_id>/',
+        AsyncWalletDetailAPIView.as_view(),
+        name='async-wallet-detail'
+    ),
+    path(
+        'transfer/',
+        AsyncTransferAPIView.as_view(),
+        name='async-transfer'
+    ),
+    path(
+        'transactions/',
+        AsyncTransactionHistoryAPIView.as_view(),
+        name='async-transaction-history'
+    ),
+]
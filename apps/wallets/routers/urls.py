@@ -1,7 +1,10 @@
 from django.urls import path
+from apps.wallets.views.wallet import WalletStatsAPIView
 from apps.wallets.views.wallet import WalletDetailAPIView
 from apps.wallets.views.wallet import WalletListCreateAPIView
 from apps.wallets.views.transfer import TransferAPIView
+from apps.wallets.views.transfer import BatchTransferAPIView
+from apps.wallets.views.transcation import TransactionExportAPIView
 from apps.wallets.views.transcation import TransactionHistoryAPIView
 
 
@@ -16,14 +19,29 @@ urlpatterns = [
         WalletDetailAPIView.as_view(),
         name='wallet-detail'
     ),
+    path(
+        'wallets/<int:wallet_id>/stats/',
+        WalletStatsAPIView.as_view(),
+        name='wallet-stats'
+    ),
     path(
         'transfer/',
         TransferAPIView.as_view(),
         name='transfer'
     ),
+    path(
+        'transfers/batch/',
+        BatchTransferAPIView.as_view(),
+        name='transfer-batch'
+    ),
     path(
         'transactions/',
         TransactionHistoryAPIView.as_view(),
         name='transaction-history'
     ),
+    path(
+        'transactions/export/',
+        TransactionExportAPIView.as_view(),
+        name='transaction-export'
+    ),
 ]
@@ -5,6 +5,10 @@ Transaction serializer
 from rest_framework import serializers
 from apps.wallets.models.transaction import Transaction
 
+from apps.wallets.enums.status import Status
+from apps.wallets.enums.transaction import TransactionType
+from apps.wallets.services.history import TransactionHistoryService
+
 
 class TransactionSerializer(serializers.ModelSerializer):
     """
@@ -88,3 +92,98 @@ class TransactionSerializer(serializers.ModelSerializer):
             setattr(instance, attr, value)
         instance.save()
         return instance
+
+
+class TransactionHistoryQuerySerializer(serializers.Serializer):
+    """
+    Serializer for transaction history query parameters.
+
+    :param limit: Maximum number of transactions per page
+    :type limit: int
+    :param before: Cursor returning older transactions
+    :type before: str
+    :param after: Cursor returning newer transactions
+    :type after: str
+    :param date_from: Inclusive lower bound of the creation date
+    :type date_from: datetime
+    :param date_to: Exclusive upper bound of the creation date
+    :type date_to: datetime
+    :param transaction_type: Transaction type filter
+    :type transaction_type: str
+    :param status: Transaction status filter
+    :type status: str
+    """
+
+    limit = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        max_value=TransactionHistoryService.MAX_LIMIT,
+        default=TransactionHistoryService.DEFAULT_LIMIT
+    )
+    before = serializers.CharField(required=False)
+    after = serializers.CharField(required=False)
+    date_from = serializers.DateTimeField(required=False)
+    date_to = serializers.DateTimeField(required=False)
+    transaction_type = serializers.ChoiceField(
+        required=False,
+        choices=[tag.value for tag in TransactionType]
+    )
+    status = serializers.ChoiceField(
+        required=False,
+        choices=[tag.value for tag in Status]
+    )
+
+    def validate(self, data):
+        """
+        Validate that at most one cursor is given.
+
+        :param data: Dictionary of query parameters
+        :type data: dict
+        :return: Validated data
+        :rtype: dict
+        :raises serializers.ValidationError: If both cursors are given
+        """
+        if data.get('before') and data.get('after'):
+            raise serializers.ValidationError("Only one of 'before' and 'after' may be given")
+        return data
+
+
+class TransactionExportQuerySerializer(serializers.Serializer):
+    """
+    Serializer for transaction export query parameters.
+
+    :param wallet_id: Only transactions sent or received by this wallet
+    :type wallet_id: int
+    :param date_from: Inclusive lower bound of the creation date
+    :type date_from: datetime
+    :param date_to: Exclusive upper bound of the creation date
+    :type date_to: datetime
+    :param file_format: Output format, CSV by default
+    :type file_format: str
+    :param compress: Gzip the response
+    :type compress: bool
+    """
+
+    wallet_id = serializers.IntegerField(required=False, min_value=1)
+    date_from = serializers.DateTimeField(required=False)
+    date_to = serializers.DateTimeField(required=False)
+    file_format = serializers.ChoiceField(required=False, choices=['csv', 'ndjson'], default='csv')
+    compress = serializers.BooleanField(required=False, default=False)
+
+    def validate(self, data):
+        """
+        Validate that the export is limited to a wallet or to a date range.
+
+        :param data: Dictionary of query parameters
+        :type data: dict
+        :return: Validated data
+        :rtype: dict
+        :raises serializers.ValidationError: If neither a wallet nor a full range is given
+        """
+        if data.get('wallet_id') is None and not (data.get('date_from') and data.get('date_to')):
+            raise serializers.ValidationError(
+                "Either 'wallet_id' or both 'date_from' and 'date_to' are required"
+            )
+        if data.get('date_from') and data.get('date_to') and data['date_from'] >= data['date_to']:
+            raise serializers.ValidationError("'date_from' must be before 'date_to'")
+        return data
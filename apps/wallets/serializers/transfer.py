@@ -7,6 +7,7 @@ from decimal import Decimal
 from rest_framework import serializers
 
 from apps.wallets.models.wallet import Wallet
+from apps.wallets.services.transfer import TransferService
 
 
 class TransferSerializer(serializers.Serializer):
@@ -16,6 +17,10 @@ class TransferSerializer(serializers.Serializer):
     Validates that the sender and recipient wallets exist, the amount is positive,
     and that the transfer is not to the same wallet.
 
+    With ``check_wallets=False`` wallet existence is left to `TransferService`,
+    which checks it against the rows it locks anyway and raises errors rendered
+    with the same payload, saving two queries per transfer.
+
     :param sender_id: ID of the sender's wallet
     :type sender_id: int
     :param recipient_id: ID of the recipient's wallet
@@ -24,8 +29,12 @@ class TransferSerializer(serializers.Serializer):
     :type amount: Decimal
     :param description: Optional description of the transfer
     :type description: str
+    :param check_wallets: Whether to query wallet existence during validation
+    :type check_wallets: bool
     """
 
+    check_wallets = True
+
     sender_id = serializers.IntegerField(required=True, help_text="ID of the sender's wallet")
     recipient_id = serializers.IntegerField(required=True, help_text="ID of the recipient's wallet")
     amount = serializers.DecimalField(
@@ -41,6 +50,11 @@ class TransferSerializer(serializers.Serializer):
         help_text="Optional transfer description"
     )
 
+    def __init__(self, *args, check_wallets: bool = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if check_wallets is not None:
+            self.check_wallets = check_wallets
+
     def validate_amount(self, value):
         """
         Validate that the transfer amount is greater than zero.
@@ -68,6 +82,9 @@ class TransferSerializer(serializers.Serializer):
         if data['sender_id'] == data['recipient_id']:
             raise serializers.ValidationError("Cannot transfer to the same wallet")
 
+        if not self.check_wallets:
+            return data
+
         try:
             Wallet.objects.get(id=data['sender_id'])
         except Wallet.DoesNotExist:
@@ -79,3 +96,36 @@ class TransferSerializer(serializers.Serializer):
             raise serializers.ValidationError("Destination wallet does not exist")
 
         return data
+
+
+class BatchTransferItemSerializer(TransferSerializer):
+    """
+    Serializer for a single transfer inside a batch.
+
+    Wallet existence is not checked here: the batch service locks every wallet
+    involved in one query and reports missing wallets per item.
+    """
+
+    check_wallets = False
+
+
+class BatchTransferSerializer(serializers.Serializer):
+    """
+    Serializer for executing many transfers in a single database transaction.
+
+    :param transfers: List of transfers to execute in order
+    :type transfers: list
+    :param atomic: Whether the batch is all-or-nothing (default) or applied per item
+    :type atomic: bool
+    """
+
+    transfers = BatchTransferItemSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=TransferService.MAX_BATCH_SIZE,
+        help_text="Transfers to execute, applied in order"
+    )
+    atomic = serializers.BooleanField(
+        default=True,
+        help_text="Roll back the whole batch if any transfer fails"
+    )
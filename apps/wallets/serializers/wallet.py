@@ -2,9 +2,14 @@
 Wallet serializer
 """
 
+from datetime import timedelta
+
+from django.utils import timezone
+
 from rest_framework import serializers
 
 from apps.wallets.models.wallet import Wallet
+from apps.wallets.services.rollup import RollupService
 
 
 class WalletSerializer(serializers.ModelSerializer):
@@ -45,3 +50,110 @@ class WalletSerializer(serializers.ModelSerializer):
             'created_at',
             'updated_at'
         ]
+
+    def update(self, instance, validated_data):
+        """
+        Update an existing Wallet instance.
+
+        Only the validated fields and `updated_at` are written, so a balance and
+        version changed by a concurrent transfer since the wallet was read are kept.
+
+        :param instance: Wallet object to update
+        :type instance: Wallet
+        :param validated_data: Dictionary of validated data for update
+        :type validated_data: dict
+        :return: Updated Wallet object
+        :rtype: Wallet
+        """
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=[*validated_data, 'updated_at'])
+        return instance
+
+
+class WalletListQuerySerializer(serializers.Serializer):
+    """
+    Serializer for wallet list query parameters.
+
+    :param limit: Maximum number of wallets per page
+    :type limit: int
+    :param after: Cursor returning wallets after the cursor row
+    :type after: str
+    :param stream: Whether to stream all wallets as NDJSON
+    :type stream: bool
+    """
+
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=1000, default=100)
+    after = serializers.CharField(required=False)
+    stream = serializers.BooleanField(required=False, default=False)
+
+
+class WalletStatsQuerySerializer(serializers.Serializer):
+    """
+    Serializer for wallet statistics query parameters.
+
+    :param date_from: First day, 30 days before `date_to` by default
+    :type date_from: date
+    :param date_to: Last day, today by default
+    :type date_to: date
+    """
+
+    DEFAULT_DAYS = 30
+
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def validate(self, data):
+        """
+        Fill in the default range and validate its length.
+
+        :param data: Dictionary of query parameters
+        :type data: dict
+        :return: Validated data with both bounds
+        :rtype: dict
+        :raises serializers.ValidationError: If the range is reversed or too long
+        """
+        data.setdefault('date_to', timezone.localdate())
+        data.setdefault('date_from', data['date_to'] - timedelta(days=self.DEFAULT_DAYS - 1))
+
+        if data['date_from'] > data['date_to']:
+            raise serializers.ValidationError("'date_from' must not be after 'date_to'")
+        if (data['date_to'] - data['date_from']).days >= RollupService.MAX_STATS_DAYS:
+            raise serializers.ValidationError(
+                f"The range may span at most {RollupService.MAX_STATS_DAYS} days"
+            )
+        return data
+
+
+class WalletStatsTotalsSerializer(serializers.Serializer):
+    """
+    Serializer for wallet totals over a range of days.
+
+    :param inflow: Amount received
+    :type inflow: Decimal
+    :param outflow: Amount sent, commission excluded
+    :type outflow: Decimal
+    :param commission_paid: Commission paid on outgoing transfers
+    :type commission_paid: Decimal
+    :param transfers_in: Number of incoming transfers
+    :type transfers_in: int
+    :param transfers_out: Number of outgoing transfers
+    :type transfers_out: int
+    """
+
+    inflow = serializers.DecimalField(max_digits=None, decimal_places=2, read_only=True)
+    outflow = serializers.DecimalField(max_digits=None, decimal_places=2, read_only=True)
+    commission_paid = serializers.DecimalField(max_digits=None, decimal_places=2, read_only=True)
+    transfers_in = serializers.IntegerField(read_only=True)
+    transfers_out = serializers.IntegerField(read_only=True)
+
+
+class WalletDailyRollupSerializer(WalletStatsTotalsSerializer):
+    """
+    Serializer for the totals of a wallet on one day.
+
+    :param day: Calendar day
+    :type day: date
+    """
+
+    day = serializers.DateField(read_only=True)
@@ -0,0 +1,82 @@
+"""
+Circuit breaker service
+"""
+
+import redis
+
+from src.settings.utils.redis import get_redis
+from src.settings.utils.logging import logger
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for a downstream service, shared by every worker through Redis.
+
+    Failed calls are counted in a key that expires `cooldown` seconds after the
+    last failure; reaching `threshold` opens the breaker for `cooldown` seconds,
+    during which callers should not contact the service at all. A round of calls
+    that mostly succeeded resets the count, so occasional errors never open it.
+
+    Without a Redis URL, or while Redis is unreachable, the breaker stays closed.
+    """
+
+    OPEN_KEY = 'breaker:{name}:open'
+    FAILURES_KEY = 'breaker:{name}:failures'
+
+    def __init__(self, name: str, url: str, threshold: int, cooldown: int):
+        self.name = name
+        self.url = url
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.open_key = self.OPEN_KEY.format(name=name)
+        self.failures_key = self.FAILURES_KEY.format(name=name)
+
+    def remaining(self) -> float:
+        """
+        Return how long the breaker stays open.
+
+        :return: Seconds until calls are allowed again, 0 when closed
+        :rtype: float
+        """
+        if not self.url:
+            return 0.0
+        try:
+            ttl = get_redis(self.url).pttl(self.open_key)
+        except redis.RedisError as e:
+            logger.warning("Circuit breaker %s unavailable: %s", self.name, e)
+            return 0.0
+        return ttl / 1000 if ttl > 0 else 0.0
+
+    def record(self, succeeded: int, failed: int):
+        """
+        Record the outcome of a round of calls, opening the breaker on too many failures.
+
+        :param succeeded: Number of successful calls
+        :param failed: Number of failed calls
+        """
+        if not self.url or not (succeeded or failed):
+            return
+        try:
+            client = get_redis(self.url)
+            if failed <= succeeded:
+                client.delete(self.failures_key)
+                return
+
+            pipeline = client.pipeline(transaction=False)
+            pipeline.incrby(self.failures_key, failed)
+            pipeline.expire(self.failures_key, self.cooldown)
+            failures, _ = pipeline.execute()
+            if failures < self.threshold:
+                return
+
+            if client.set(self.open_key, 1, ex=self.cooldown, nx=True):
+                client.delete(self.failures_key)
+                logger.warning(
+                    "Circuit breaker %s opened for %ss after %s failures",
+                    self.name,
+                    self.cooldown,
+                    failures,
+                    extra={'event': 'breaker.opened', 'breaker': self.name}
+                )
+        except redis.RedisError as e:
+            logger.warning("Circuit breaker %s unavailable: %s", self.name, e)
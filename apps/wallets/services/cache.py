@@ -0,0 +1,277 @@
+"""
+Wallet cache service
+"""
+
+import time
+import threading
+
+from decimal import Decimal
+from functools import partial
+from collections import OrderedDict
+
+import redis
+
+from django.db import transaction
+
+from apps.wallets.models.wallet import Wallet
+from apps.wallets.serializers.wallet import WalletSerializer
+from apps.wallets.services.metrics import WalletCacheMetrics
+
+from src.settings.config.config import config
+from src.settings.utils.redis import get_redis
+from src.settings.utils.logging import logger
+
+
+# KEYS[1]: snapshot key
+# ARGV: ttl, version, balance, then field/value pairs of the static fields
+# The static fields are always written, the balance only if its version is newer.
+STORE_SCRIPT = """
+local current = tonumber(redis.call('HGET', KEYS[1], 'version'))
+if #ARGV > 3 then
+    redis.call('HSET', KEYS[1], unpack(ARGV, 4))
+end
+local applied = 0
+if not current or current < tonumber(ARGV[2]) then
+    redis.call('HSET', KEYS[1], 'version', ARGV[2], 'balance', ARGV[3])
+    applied = 1
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return applied
+"""
+
+
+class RedisWalletStore:
+    """
+    Wallet snapshots kept as Redis hashes, written by a Lua script so the
+    version comparison and the write are atomic.
+    """
+
+    name = 'redis'
+
+    def __init__(self, url: str, ttl: int):
+        self.client = get_redis(url)
+        self.ttl = ttl
+        self.script = self.client.register_script(STORE_SCRIPT)
+
+    def get(self, key: str) -> dict:
+        return {
+            field.decode(): value.decode()
+            for field, value in self.client.hgetall(key).items()
+        }
+
+    def store(self, items: list[tuple]) -> list[bool]:
+        pipeline = self.client.pipeline(transaction=False)
+        for key, version, balance, fields in items:
+            args = [self.ttl, version, balance]
+            for field, value in fields.items():
+                args.extend((field, value))
+            self.script(keys=[key], args=args, client=pipeline)
+        return [bool(applied) for applied in pipeline.execute()]
+
+    def delete(self, key: str):
+        self.client.delete(key)
+
+
+class LocalWalletStore:
+    """
+    In-process variant of `RedisWalletStore`, with the same versioning rules.
+
+    Other processes never see its writes, so entries expire after a short TTL.
+    """
+
+    name = 'local'
+
+    def __init__(self, max_entries: int, ttl: int):
+        self.entries = OrderedDict()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> dict:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return {}
+            expires_at, snapshot = entry
+            if expires_at <= time.monotonic():
+                del self.entries[key]
+                return {}
+            self.entries.move_to_end(key)
+            return dict(snapshot)
+
+    def store(self, items: list[tuple]) -> list[bool]:
+        expires_at = time.monotonic() + self.ttl
+        results = []
+        with self.lock:
+            for key, version, balance, fields in items:
+                entry = self.entries.pop(key, None)
+                snapshot = entry[1] if entry and entry[0] > time.monotonic() else {}
+                snapshot.update(fields)
+
+                applied = int(snapshot.get('version', -1)) < version
+                if applied:
+                    snapshot['version'] = str(version)
+                    snapshot['balance'] = balance
+                results.append(applied)
+
+                self.entries[key] = (expires_at, snapshot)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return results
+
+    def delete(self, key: str):
+        with self.lock:
+            self.entries.pop(key, None)
+
+
+class WalletCacheService:
+    """
+    Write-through cache of the wallet snapshots served by `WalletDetailAPIView`.
+
+    Features:
+        - Snapshots live in Redis when `CACHE_URL` is set, otherwise in process memory.
+        - Transfers and commission settlement write new balances after commit.
+        - Every balance write increments `Wallet.version`, and a balance is only cached
+          if its version is newer than the cached one, so late or reordered writes and
+          fills read from a lagging replica never regress a balance.
+        - A balance written before the wallet was ever read is kept as a partial
+          snapshot that the next read completes.
+        - Wallet updates and deletes invalidate the snapshot after commit.
+        - Cache errors are logged and served from the database.
+    """
+
+    KEY = 'wallet:snapshot:{wallet_id}'
+    STATIC_FIELDS = ('username', 'created_at', 'updated_at')
+
+    store = None
+    balance_field = WalletSerializer().fields['balance']
+
+    @classmethod
+    def get_store(cls):
+        """
+        Return the snapshot store selected by the cache settings.
+
+        :return: Redis or in-process store, or None when the cache is disabled
+        :rtype: RedisWalletStore | LocalWalletStore | None
+        """
+        if not config.cache.CACHE_WALLET_ENABLED:
+            return None
+        if cls.store is None:
+            if config.cache.CACHE_URL:
+                cls.store = RedisWalletStore(config.cache.CACHE_URL, config.cache.CACHE_WALLET_TTL) # noqa
+            else:
+                cls.store = LocalWalletStore(
+                    config.cache.CACHE_LOCAL_MAX_ENTRIES,
+                    config.cache.CACHE_WALLET_LOCAL_TTL
+                )
+        return cls.store
+
+    @classmethod
+    def key(cls, wallet_id: int) -> str:
+        return cls.KEY.format(wallet_id=wallet_id)
+
+    @classmethod
+    def get(cls, wallet_id: int) -> dict:
+        """
+        Return the cached representation of a wallet.
+
+        :param wallet_id: Wallet ID
+        :return: `WalletSerializer` data, or None on a miss
+        :rtype: dict | None
+        """
+        store = cls.get_store()
+        if store is None:
+            return None
+
+        try:
+            snapshot = store.get(cls.key(wallet_id))
+        except redis.RedisError as e:
+            logger.warning("Wallet cache unavailable: %s", e)
+            WalletCacheMetrics.lookup(store.name, 'error')
+            return None
+
+        if 'username' not in snapshot:
+            WalletCacheMetrics.lookup(store.name, 'miss')
+            return None
+
+        WalletCacheMetrics.lookup(store.name, 'hit')
+        return {
+            'id': wallet_id,
+            'username': snapshot['username'],
+            'balance': snapshot['balance'],
+            'created_at': snapshot['created_at'],
+            'updated_at': snapshot['updated_at']
+        }
+
+    @classmethod
+    def fill(cls, wallet: Wallet, data: dict):
+        """
+        Cache a wallet read from the database.
+
+        :param wallet: Wallet, with its `version`
+        :param data: `WalletSerializer` data of the wallet
+        """
+        fields = {field: data[field] for field in cls.STATIC_FIELDS}
+        cls._store([(wallet.id, wallet.version, data['balance'], fields)])
+
+    @classmethod
+    def update_balances(cls, states: dict):
+        """
+        Write new wallet balances, skipping those older than the cached ones.
+
+        :param states: Tuples of (balance, version) by wallet ID
+        :type states: dict
+        """
+        cls._store([
+            (wallet_id, version, cls.balance_field.to_representation(Decimal(balance)), {})
+            for wallet_id, (balance, version) in states.items()
+        ])
+
+    @classmethod
+    def _store(cls, items: list[tuple]):
+        store = cls.get_store()
+        if store is None or not items:
+            return
+
+        try:
+            applied = store.store([
+                (cls.key(wallet_id), version, balance, fields)
+                for wallet_id, version, balance, fields in items
+            ])
+        except redis.RedisError as e:
+            logger.warning("Wallet cache unavailable: %s", e)
+            return
+
+        WalletCacheMetrics.written(store.name, sum(applied), len(applied) - sum(applied))
+
+    @classmethod
+    def invalidate(cls, wallet_id: int):
+        """
+        Drop the cached snapshot of a wallet.
+
+        :param wallet_id: Wallet ID
+        """
+        store = cls.get_store()
+        if store is None:
+            return
+
+        try:
+            store.delete(cls.key(wallet_id))
+        except redis.RedisError as e:
+            logger.warning("Wallet cache unavailable: %s", e)
+
+    @classmethod
+    def on_commit(cls, states: dict):
+        """
+        Update or invalidate wallet snapshots once the current transaction commits.
+
+        :param states: Tuples of (balance, version) by wallet ID, or None for wallets
+            whose new balance is unknown and must be invalidated
+        :type states: dict
+        """
+        known = {wallet_id: state for wallet_id, state in states.items() if state is not None}
+        if known:
+            transaction.on_commit(partial(cls.update_balances, known))
+        for wallet_id, state in states.items():
+            if state is None:
+                transaction.on_commit(partial(cls.invalidate, wallet_id))
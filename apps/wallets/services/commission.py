@@ -0,0 +1,126 @@
+"""
+Commission service
+"""
+
+from decimal import Decimal
+
+from django.db.models import F
+from django.db.models import Sum
+from django.db import transaction
+
+from apps.wallets.models.wallet import Wallet
+from apps.wallets.models.commission import CommissionAccrual
+from apps.wallets.services.cache import WalletCacheService
+from apps.wallets.services.rollup import RollupService
+
+from src.settings.utils.logging import logger
+
+
+class CommissionService:
+    """
+    Accrues transfer commissions without locking the admin wallet.
+
+    Commissions are added to one of `SHARDS` accrual rows chosen by sender wallet,
+    so concurrent transfers from different senders rarely touch the same row.
+    A periodic task settles the pending accruals into the admin wallet.
+    """
+
+    ADMIN_WALLET_ID = 1
+    SHARDS = 16
+
+    admin_wallet_found = False
+
+    @classmethod
+    def shard_for(cls, wallet_id: int) -> int:
+        """
+        Return the accrual shard used for commissions paid by a wallet.
+
+        :param wallet_id: ID of the wallet paying the commission
+        :type wallet_id: int
+        :return: Shard number
+        :rtype: int
+        """
+        return wallet_id % cls.SHARDS
+
+    @classmethod
+    def admin_wallet_exists(cls) -> bool:
+        """
+        Check whether the admin wallet receiving commissions exists.
+
+        Once found, the admin wallet is remembered for the life of the process,
+        so transfers paying commission skip the lookup.
+
+        :return: True if the admin wallet exists
+        :rtype: bool
+        """
+        if not cls.admin_wallet_found:
+            cls.admin_wallet_found = Wallet.objects.filter(id=cls.ADMIN_WALLET_ID).exists()
+        return cls.admin_wallet_found
+
+    @classmethod
+    def accrue(cls, shard: int, amount: Decimal):
+        """
+        Add a commission amount to an accrual shard.
+
+        Must be called inside the transaction that debits the commission.
+
+        :param shard: Shard number
+        :type shard: int
+        :param amount: Commission amount
+        :type amount: Decimal
+        """
+        updated = CommissionAccrual.objects.filter(shard=shard).update(
+            amount=F('amount') + amount
+        )
+        if not updated:
+            CommissionAccrual.objects.get_or_create(shard=shard)
+            CommissionAccrual.objects.filter(shard=shard).update(
+                amount=F('amount') + amount
+            )
+
+    @classmethod
+    def pending_total(cls) -> Decimal:
+        """
+        Return the total commission accrued but not yet settled.
+
+        :return: Pending commission amount
+        :rtype: Decimal
+        """
+        total = CommissionAccrual.objects.aggregate(total=Sum('amount'))['total']
+        return total or Decimal('0')
+
+    @classmethod
+    def settle(cls) -> Decimal:
+        """
+        Move all pending accruals into the admin wallet in one transaction.
+
+        The admin wallet is locked before the accrual rows, matching the
+        wallet-then-accrual lock order of the transfer path.
+
+        :return: Settled commission amount
+        :rtype: Decimal
+        """
+        with transaction.atomic():
+            admin_wallet = Wallet.objects.select_for_update().filter(id=cls.ADMIN_WALLET_ID).first() # noqa
+            if not admin_wallet:
+                logger.warning("Admin wallet %s not found, commissions left pending", cls.ADMIN_WALLET_ID) # noqa
+                return Decimal('0')
+
+            accruals = list(
+                CommissionAccrual.objects.select_for_update()
+                .filter(amount__gt=0)
+                .order_by('shard')
+            )
+            total = sum((accrual.amount for accrual in accruals), Decimal('0'))
+            if not total:
+                return total
+
+            Wallet.objects.filter(id=cls.ADMIN_WALLET_ID).update(balance=F('balance') + total, version=F('version') + 1) # noqa
+            CommissionAccrual.objects.filter(id__in=[accrual.id for accrual in accruals]).update(amount=0) # noqa
+            RollupService.record({cls.ADMIN_WALLET_ID: [total, Decimal('0'), Decimal('0'), 0, 0]}) # noqa
+            WalletCacheService.on_commit({
+                cls.ADMIN_WALLET_ID: (admin_wallet.balance + total, admin_wallet.version + 1)
+            })
+
+            logger.info("Settled %s commission from %s shards", total, len(accruals))
+            return total
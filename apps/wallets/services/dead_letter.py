@@ -0,0 +1,102 @@
+"""
+Dead letter service
+"""
+
+from functools import partial
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.wallets.enums.notification import DeadLetterKind
+from apps.wallets.models.dead_letter import NotificationDeadLetter
+from apps.wallets.tasks.notify import send_notification_batch
+from apps.wallets.tasks.notify import flush_notification_digest
+
+
+class DeadLetterService:
+    """
+    Keeps notifications that exhausted their retries, and replays them.
+
+    Every dead letter stores what its task needs to run again: the
+    [recipient_id, amount, sender_id, transaction_group_id] of a notification,
+    or the buffered items of a digest. Redriving claims pending letters with
+    `SKIP LOCKED`, so several redrives can run side by side, marks them redriven
+    and enqueues them as fresh tasks with a full retry budget once that
+    transaction commits.
+    """
+
+    @staticmethod
+    def record(kind: DeadLetterKind, letters: list, error: str, attempts: int):
+        """
+        Save dead letters with one insert.
+
+        :param kind: Kind of the failed deliveries
+        :param letters: Tuples of (recipient_id, payload)
+        :param error: Last delivery error
+        :param attempts: Number of delivery attempts made
+        """
+        NotificationDeadLetter.objects.bulk_create([
+            NotificationDeadLetter(
+                kind=kind.value,
+                recipient_id=recipient_id,
+                payload=payload,
+                error=error,
+                attempts=attempts
+            )
+            for recipient_id, payload in letters
+        ])
+
+    @staticmethod
+    def pending():
+        return NotificationDeadLetter.objects.filter(redriven_at__isnull=True)
+
+    @staticmethod
+    def replay(letters: list, batch_size: int):
+        """
+        Enqueue dead letters as new delivery tasks.
+
+        :param letters: Dead letters
+        :param batch_size: Maximum notifications per `send_notification_batch` task
+        """
+        notifications = [
+            letter.payload for letter in letters
+            if letter.kind == DeadLetterKind.NOTIFICATION.value
+        ]
+        for start in range(0, len(notifications), batch_size):
+            send_notification_batch.delay(notifications[start:start + batch_size])
+
+        for letter in letters:
+            if letter.kind == DeadLetterKind.DIGEST.value:
+                flush_notification_digest.apply_async(
+                    args=[letter.recipient_id],
+                    kwargs={'items': letter.payload}
+                )
+
+    @classmethod
+    def redrive_batch(cls, queryset, batch_size: int) -> int:
+        """
+        Claim, mark redriven and replay one batch of pending dead letters.
+
+        The tasks are only published after the batch is marked redriven and
+        committed, so a failed update never leaves letters enqueued twice.
+
+        :param queryset: Dead letters to pick from, oldest first
+        :param batch_size: Maximum number of dead letters
+        :return: Number of redriven dead letters
+        :rtype: int
+        """
+        with transaction.atomic():
+            letters = list(
+                queryset.filter(redriven_at__isnull=True)
+                .select_for_update(skip_locked=True)
+                .order_by('id')[:batch_size]
+            )
+            if not letters:
+                return 0
+
+            NotificationDeadLetter.objects.filter(
+                id__in=[letter.id for letter in letters]
+            ).update(redriven_at=timezone.now())
+            transaction.on_commit(partial(cls.replay, letters, batch_size))
+
+        return len(letters)
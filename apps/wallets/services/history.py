@@ -0,0 +1,164 @@
+"""
+Transaction history service
+"""
+
+from datetime import datetime
+
+from django.db.models import Q
+from django.db import connection
+
+from apps.wallets.models.transaction import Transaction
+
+from src.settings.utils.pagination import encode_cursor
+from src.settings.utils.pagination import decode_cursor
+
+
+class TransactionHistoryService:
+    """
+    Keyset-paginated transaction history for a wallet.
+
+    Each page is fetched with a constant number of queries regardless of depth:
+        - A UNION ALL of two index range scans over `(sender, created_at, id)` and
+          `(recipient, created_at, id)` selecting the page's IDs.
+        - One query loading those transactions with sender and recipient usernames joined.
+
+    `aget_page` runs the same queries through the async ORM.
+    """
+
+    DEFAULT_LIMIT = 50
+    MAX_LIMIT = 200
+
+    @staticmethod
+    def _parse_cursor(cursor: str) -> tuple:
+        created_at, pk = decode_cursor(cursor, 2)
+        try:
+            return datetime.fromisoformat(created_at), int(pk)
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+
+    @staticmethod
+    def _cursor_for(item: Transaction) -> str:
+        return encode_cursor(item.created_at.isoformat(), item.id)
+
+    @classmethod
+    def _keys(
+        cls,
+        wallet_id: int,
+        limit: int,
+        before: str = None,
+        after: str = None,
+        filters: dict = None
+    ):
+        """
+        Build the query selecting the IDs and creation times of one page, plus one row.
+
+        :raises ValueError: If a cursor is malformed or both cursors are given
+        :return: Queryset of dicts with id and created_at
+        """
+        if before and after:
+            raise ValueError("Only one of 'before' and 'after' may be given")
+
+        filters = filters or {}
+        condition = Q()
+        if filters.get('date_from'):
+            condition &= Q(created_at__gte=filters['date_from'])
+        if filters.get('date_to'):
+            condition &= Q(created_at__lt=filters['date_to'])
+        if filters.get('transaction_type'):
+            condition &= Q(transaction_type=filters['transaction_type'])
+        if filters.get('status'):
+            condition &= Q(status=filters['status'])
+
+        ordering = ('-created_at', '-id')
+        if before:
+            created_at, pk = cls._parse_cursor(before)
+            condition &= Q(created_at__lte=created_at) & (
+                Q(created_at__lt=created_at) | Q(id__lt=pk)
+            )
+        elif after:
+            created_at, pk = cls._parse_cursor(after)
+            condition &= Q(created_at__gte=created_at) & (
+                Q(created_at__gt=created_at) | Q(id__gt=pk)
+            )
+            ordering = ('created_at', 'id')
+
+        size = limit + 1
+        branches = [
+            Transaction.objects.filter(condition, **{field: wallet_id})
+            .order_by(*ordering)
+            .values('id', 'created_at')
+            for field in ('sender_id', 'recipient_id')
+        ]
+        if connection.features.supports_slicing_ordering_in_compound:
+            branches = [branch[:size] for branch in branches]
+        else:
+            branches = [branch.order_by() for branch in branches]
+
+        return branches[0].union(branches[1], all=True).order_by(*ordering)[:size]
+
+    @staticmethod
+    def _rows():
+        return Transaction.objects.select_related('sender__user', 'recipient__user')
+
+    @classmethod
+    def get_page(
+        cls,
+        wallet_id: int,
+        limit: int = DEFAULT_LIMIT,
+        before: str = None,
+        after: str = None,
+        filters: dict = None
+    ) -> dict:
+        """
+        Fetch one page of a wallet's transactions, newest first.
+
+        :param wallet_id: ID of the wallet to fetch transactions for
+        :param limit: Maximum number of transactions on the page
+        :param before: Cursor returning transactions older than the cursor row
+        :param after: Cursor returning transactions newer than the cursor row
+        :param filters: Optional filters: date_from, date_to, transaction_type, status
+        :raises ValueError: If a cursor is malformed or both cursors are given
+        :return: Page with transactions and the cursors of the adjacent pages
+        :rtype: dict
+        """
+        keys = list(cls._keys(wallet_id, limit, before, after, filters))
+        loaded = cls._rows().in_bulk([key['id'] for key in keys[:limit]])
+        return cls._page(keys, loaded, limit, before, after)
+
+    @classmethod
+    async def aget_page(
+        cls,
+        wallet_id: int,
+        limit: int = DEFAULT_LIMIT,
+        before: str = None,
+        after: str = None,
+        filters: dict = None
+    ) -> dict:
+        """
+        Async variant of `get_page`.
+
+        :raises ValueError: If a cursor is malformed or both cursors are given
+        :return: Page with transactions and the cursors of the adjacent pages
+        :rtype: dict
+        """
+        keys = [key async for key in cls._keys(wallet_id, limit, before, after, filters)]
+        loaded = await cls._rows().ain_bulk([key['id'] for key in keys[:limit]])
+        return cls._page(keys, loaded, limit, before, after)
+
+    @classmethod
+    def _page(cls, keys: list, loaded: dict, limit: int, before: str, after: str) -> dict:
+        has_more = len(keys) > limit
+        keys = keys[:limit]
+        items = [loaded[key['id']] for key in keys if key['id'] in loaded]
+
+        if after:
+            items.reverse()
+            has_newer, has_older = has_more, True
+        else:
+            has_newer, has_older = bool(before), has_more
+
+        return {
+            'results': items,
+            'before': cls._cursor_for(items[-1]) if items and has_older else None,
+            'after': cls._cursor_for(items[0]) if items and has_newer else None,
+        }
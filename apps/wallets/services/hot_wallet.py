@@ -0,0 +1,350 @@
+"""
+Hot wallet service
+"""
+
+import json
+import math
+import time
+import uuid
+
+from decimal import Decimal
+from datetime import timedelta
+
+import redis
+
+from django.db.models import Count
+from django.db import connections
+from django.utils import timezone
+
+from apps.wallets.models.transaction import Transaction
+from apps.wallets.enums.transaction import TransactionType
+from apps.wallets.tasks.hot_wallet import drain_hot_wallet
+from apps.wallets.exceptions.transfer import WalletNotFoundError
+from apps.wallets.exceptions.transfer import WalletOwnershipError
+from apps.wallets.exceptions.transfer import InsufficientFundsError
+from apps.wallets.exceptions.transfer import TransferValidationError
+from apps.wallets.exceptions.transfer import HotWalletBusyError
+from apps.wallets.exceptions.transfer import HotWalletQueueError
+from apps.wallets.exceptions.transfer import InsufficientFundsForCommissionError
+
+from src.settings.config.config import config
+from src.settings.utils.redis import get_redis
+from src.settings.utils.logging import logger
+
+
+class HotWalletService:
+    """
+    Serializes the transfers of hot wallets through one writer per wallet.
+
+    A transfer touching a hot wallet, listed in `HOT_WALLET_IDS` or detected by
+    `detect` from the transfers of the last `HOT_WALLET_WINDOW` seconds, is
+    pushed to a Redis list of that wallet instead of locking it. The first push
+    to an idle list schedules `drain_hot_wallet` on the ``hot_wallets`` Celery
+    queue; the drain pops up to `HOT_WALLET_BATCH_SIZE` transfers at a time,
+    capped at `TransferService.MAX_BATCH_SIZE`, applies them with
+    `TransferService.execute_batch` in non-atomic mode under a single lock of
+    the wallets involved, and pushes each result to a reply list the caller
+    waits on with `BLPOP`.
+
+    Concurrent requests therefore wait in Redis, holding no database connection
+    or row lock, and a hot wallet pays for one lock per batch instead of one per
+    transfer. A scheduled marker owned by the running drain keeps a single
+    writer per wallet.
+
+    Transfers running inside a transaction, such as those stored under an
+    idempotency key, are never routed: they must commit with that transaction.
+
+    Draining pops batches with ``LPOP key count``, which needs Redis 6.2 or later.
+    """
+
+    QUEUE_KEY = 'hot:queue:{wallet_id}'
+    SCHEDULED_KEY = 'hot:scheduled:{wallet_id}'
+    REPLY_KEY = 'hot:reply:{request_id}'
+    DETECTED_KEY = 'hot:wallets'
+
+    SCHEDULED_TTL = 30
+    REPLY_TTL = 60
+    REPLY_GRACE = 5.0
+    BATCH_BUDGET = 2.0
+    LOCAL_TTL = 1.0
+
+    ERRORS = {
+        error.reason: error
+        for error in (
+            TransferValidationError,
+            WalletNotFoundError,
+            WalletOwnershipError,
+            InsufficientFundsError,
+            InsufficientFundsForCommissionError,
+            HotWalletBusyError
+        )
+    }
+
+    hot_cache = (0.0, frozenset())
+
+    @staticmethod
+    def enabled() -> bool:
+        settings = config.wallet
+        return bool(settings.HOT_WALLET_QUEUE_URL and (settings.HOT_WALLET_IDS or settings.HOT_WALLET_AUTO_THRESHOLD)) # noqa
+
+    @classmethod
+    def hot_wallets(cls) -> frozenset:
+        """
+        Return the configured and detected hot wallets, cached in-process for `LOCAL_TTL`.
+
+        :return: Hot wallet IDs
+        :rtype: frozenset
+        """
+        checked_at, wallet_ids = cls.hot_cache
+        now = time.monotonic()
+        if now - checked_at < cls.LOCAL_TTL:
+            return wallet_ids
+
+        wallet_ids = set(config.wallet.HOT_WALLET_IDS)
+        if config.wallet.HOT_WALLET_AUTO_THRESHOLD:
+            try:
+                detected = get_redis(config.wallet.HOT_WALLET_QUEUE_URL).smembers(cls.DETECTED_KEY)
+                wallet_ids.update(int(wallet_id) for wallet_id in detected)
+            except redis.RedisError as e:
+                logger.warning("Hot wallet set unavailable: %s", e)
+
+        cls.hot_cache = (now, frozenset(wallet_ids))
+        return cls.hot_cache[1]
+
+    @classmethod
+    def route(cls, sender_id: int, recipient_id: int):
+        """
+        Return the hot wallet whose queue should apply a transfer.
+
+        :param sender_id: ID of the sending wallet
+        :param recipient_id: ID of the receiving wallet
+        :return: ID of the hot wallet, the lowest if both are hot, or None
+        :rtype: int | None
+        """
+        if not cls.enabled():
+            return None
+        hot = cls.hot_wallets()
+        if sender_id in hot and (recipient_id not in hot or sender_id < recipient_id):
+            return sender_id
+        if recipient_id in hot:
+            return recipient_id
+        return None
+
+    @classmethod
+    def submit(
+        cls,
+        wallet_id: int,
+        sender_id: int,
+        recipient_id: int,
+        amount: Decimal,
+        description: str = '',
+        owner_id: int = None
+    ) -> dict:
+        """
+        Queue a transfer for the writer of a hot wallet and wait for its result.
+
+        :param wallet_id: ID of the hot wallet
+        :param sender_id: ID of the sending wallet
+        :param recipient_id: ID of the receiving wallet
+        :param amount: Amount to transfer
+        :param description: Optional transaction description
+        :param owner_id: If given, ID of the user the sender wallet must belong to
+        :raises TransferValidationError: If wallets not found or not owned by owner_id
+        :raises InsufficientFundsError: If insufficient funds
+        :raises HotWalletBusyError: If the transfer expired in the queue unapplied
+        :raises HotWalletQueueError: If no result came back in time, leaving the outcome unknown
+        :return: Transfer details, see `TransferService.execute_transfer`, or None
+            if the transfer could not be queued
+        :rtype: dict | None
+        """
+        client = get_redis(config.wallet.HOT_WALLET_QUEUE_URL)
+        timeout = config.wallet.HOT_WALLET_TIMEOUT
+        reply_key = cls.REPLY_KEY.format(request_id=uuid.uuid4().hex)
+
+        pipeline = client.pipeline(transaction=False)
+        pipeline.rpush(cls.QUEUE_KEY.format(wallet_id=wallet_id), json.dumps({
+            'sender_id': sender_id,
+            'recipient_id': recipient_id,
+            'amount': str(amount),
+            'description': description,
+            'owner_id': owner_id,
+            'deadline': time.time() + timeout,
+            'reply': reply_key
+        }))
+        pipeline.set(cls.SCHEDULED_KEY.format(wallet_id=wallet_id), 1, nx=True, ex=cls.SCHEDULED_TTL) # noqa
+        try:
+            _, first = pipeline.execute()
+        except redis.RedisError as e:
+            logger.warning("Hot wallet queue unavailable, transferring directly: %s", e)
+            return None
+        if first:
+            drain_hot_wallet.delay(wallet_id)
+
+        cls.release_connections()
+        reply = client.blpop([reply_key], timeout=timeout + cls.REPLY_GRACE)
+        if reply is None:
+            raise HotWalletQueueError(
+                f"Transfer outcome unknown: hot wallet {wallet_id} queue did not answer in time"
+            )
+
+        result = json.loads(reply[1])
+        if not result['success']:
+            error = cls.ERRORS.get(result.get('reason'))
+            if error is None:
+                raise HotWalletQueueError(result['error'])
+            raise error(result['error'])
+
+        return {
+            'success': True,
+            'transaction_id': result['transaction_id'],
+            'transaction_group': result['transaction_group'],
+            'amount': result['amount'],
+            'commission': result['commission'],
+            'total_debited': result['total_debited']
+        }
+
+    @staticmethod
+    def release_connections():
+        """
+        Return the database connections of this thread to the pool before waiting,
+        so callers queued behind a hot wallet do not hold any. Connections inside a
+        transaction are kept; the others are reopened on their next query.
+        """
+        for alias_connection in connections.all(initialized_only=True):
+            if not alias_connection.in_atomic_block:
+                alias_connection.close()
+
+    @classmethod
+    def drain(cls, wallet_id: int) -> int:
+        """
+        Apply the queued transfers of a hot wallet in batches until the queue is empty.
+
+        Transfers whose deadline is less than `BATCH_BUDGET` seconds away are
+        answered as expired without being applied, so a batch has that budget
+        plus `REPLY_GRACE` to commit before their callers stop waiting. If a batch
+        fails as a whole, its callers get an error and nothing of it is committed.
+
+        :param wallet_id: ID of the hot wallet
+        :return: Number of transfers taken from the queue
+        :rtype: int
+        """
+        from apps.wallets.services.transfer import TransferService
+
+        client = get_redis(config.wallet.HOT_WALLET_QUEUE_URL)
+        queue_key = cls.QUEUE_KEY.format(wallet_id=wallet_id)
+        scheduled_key = cls.SCHEDULED_KEY.format(wallet_id=wallet_id)
+        batch_size = min(config.wallet.HOT_WALLET_BATCH_SIZE, TransferService.MAX_BATCH_SIZE)
+        drained = 0
+
+        while True:
+            client.expire(scheduled_key, cls.SCHEDULED_TTL)
+            raw_items = client.lpop(queue_key, batch_size)
+            if not raw_items:
+                client.delete(scheduled_key)
+                if client.llen(queue_key) and client.set(scheduled_key, 1, nx=True, ex=cls.SCHEDULED_TTL): # noqa
+                    continue
+                return drained
+
+            drained += len(raw_items)
+            cutoff = time.time() + cls.BATCH_BUDGET
+            items = []
+            expired = []
+            for item in map(json.loads, raw_items):
+                (items if item['deadline'] > cutoff else expired).append(item)
+
+            if expired:
+                logger.warning("Hot wallet %s dropped %s expired transfers", wallet_id, len(expired)) # noqa
+                cls.reply(client, expired, [{
+                    'success': False,
+                    'error': f"Hot wallet {wallet_id} is busy, the transfer was not applied",
+                    'reason': HotWalletBusyError.reason
+                }] * len(expired))
+            if not items:
+                continue
+
+            try:
+                results = TransferService.execute_batch(
+                    [
+                        {
+                            'sender_id': item['sender_id'],
+                            'recipient_id': item['recipient_id'],
+                            'amount': Decimal(item['amount']),
+                            'description': item['description'],
+                            'owner_id': item['owner_id']
+                        }
+                        for item in items
+                    ],
+                    atomic=False
+                )['results']
+            except Exception as e:
+                logger.error("Hot wallet %s batch failed: %s", wallet_id, e, exc_info=True)
+                results = [{'success': False, 'error': 'Internal server error'}] * len(items)
+
+            cls.reply(client, items, results)
+
+    @classmethod
+    def reply(cls, client, items: list, results: list):
+        """
+        Push the result of each queued transfer to the list its caller waits on.
+
+        :param client: Redis client of the queue
+        :param items: Queued transfers
+        :param results: Result of each transfer, in the same order
+        """
+        pipeline = client.pipeline(transaction=False)
+        for item, result in zip(items, results):
+            pipeline.rpush(item['reply'], json.dumps(result))
+            pipeline.expire(item['reply'], cls.REPLY_TTL)
+        pipeline.execute()
+
+    @classmethod
+    def detect(cls) -> list[int]:
+        """
+        Store the wallets taking part in at least `HOT_WALLET_AUTO_THRESHOLD`
+        transfers over the last `HOT_WALLET_WINDOW` seconds as hot.
+
+        Such a wallet sent or received at least half of them, so candidates are
+        found per side first and only their transfers on both sides are summed.
+
+        :return: Detected hot wallet IDs
+        :rtype: list[int]
+        """
+        threshold = config.wallet.HOT_WALLET_AUTO_THRESHOLD
+        window = config.wallet.HOT_WALLET_WINDOW
+        recent = Transaction.objects.filter(
+            created_at__gte=timezone.now() - timedelta(seconds=window),
+            transaction_type=TransactionType.TRANSFER.value
+        )
+        sides = ('sender_id', 'recipient_id')
+
+        candidates = set()
+        for field in sides:
+            candidates.update(
+                recent.exclude(**{field: None})
+                .values(field)
+                .annotate(transfers=Count('id'))
+                .filter(transfers__gte=math.ceil(threshold / 2))
+                .values_list(field, flat=True)
+            )
+
+        counts = {}
+        if candidates:
+            for field in sides:
+                rows = (
+                    recent.filter(**{f'{field}__in': candidates})
+                    .values(field)
+                    .annotate(transfers=Count('id'))
+                    .values_list(field, 'transfers')
+                )
+                for wallet_id, transfers in rows:
+                    counts[wallet_id] = counts.get(wallet_id, 0) + transfers
+
+        detected = sorted(wallet_id for wallet_id, transfers in counts.items() if transfers >= threshold) # noqa
+
+        pipeline = get_redis(config.wallet.HOT_WALLET_QUEUE_URL).pipeline(transaction=True)
+        pipeline.delete(cls.DETECTED_KEY)
+        if detected:
+            pipeline.sadd(cls.DETECTED_KEY, *detected)
+            pipeline.expire(cls.DETECTED_KEY, window * 3)
+        pipeline.execute()
+        return detected
@@ -0,0 +1,153 @@
+"""
+Idempotency service
+"""
+
+import json
+import hashlib
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.wallets.models.idempotency import IdempotencyKey
+from apps.wallets.exceptions.idempotency import IdempotencyKeyReusedError
+
+from src.settings.config.config import config
+
+
+class IdempotencyService:
+    """
+    Stores responses of requests carrying an `Idempotency-Key` header and replays them.
+
+    Features:
+        - The key is stored in the same database transaction as the operation it guards,
+          so a committed operation always has its stored response.
+        - Replays are served from the cache without touching wallet rows,
+          falling back to the database on a cache miss.
+        - Keys expire after `IDEMPOTENCY_KEY_TTL` seconds, in the cache and in the database.
+    """
+
+    HEADER = 'Idempotency-Key'
+    MAX_KEY_LENGTH = 255
+    PURGE_CHUNK_SIZE = 5000
+
+    @staticmethod
+    def fingerprint(payload) -> str:
+        """
+        Return a stable hash of a request payload.
+
+        :param payload: JSON-serializable request payload
+        :return: SHA-256 hex digest
+        :rtype: str
+        """
+        raw = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    @staticmethod
+    def cache_key(user_id: int, key: str) -> str:
+        """
+        Return the cache key holding the stored response of an idempotency key.
+
+        :param user_id: ID of the user owning the key
+        :param key: Idempotency key sent by the client
+        :return: Cache key
+        :rtype: str
+        """
+        return f"idempotency:{user_id}:{hashlib.sha256(key.encode()).hexdigest()}"
+
+    @classmethod
+    def lookup(cls, user_id: int, key: str, fingerprint: str):
+        """
+        Return the stored response for an idempotency key, if any.
+
+        :param user_id: ID of the user owning the key
+        :param key: Idempotency key sent by the client
+        :param fingerprint: Fingerprint of the current request payload
+        :raises IdempotencyKeyReusedError: If the key was used with a different payload
+        :return: Tuple of (response body, status code), or None if the key is unused
+        :rtype: tuple | None
+        """
+        cache_key = cls.cache_key(user_id, key)
+        record = cache.get(cache_key)
+
+        if record is None:
+            stored = IdempotencyKey.objects.filter(user_id=user_id, key=key).first()
+            if stored is None:
+                return None
+
+            if stored.expires_at <= timezone.now():
+                stored.delete()
+                return None
+
+            record = (stored.fingerprint, stored.response, stored.status_code)
+            timeout = (stored.expires_at - timezone.now()).total_seconds()
+            cache.set(cache_key, record, timeout=max(int(timeout), 1))
+
+        stored_fingerprint, response, status_code = record
+        if stored_fingerprint != fingerprint:
+            raise IdempotencyKeyReusedError(
+                "Idempotency-Key was already used with a different request payload"
+            )
+        return response, status_code
+
+    @classmethod
+    def execute(cls, user_id: int, key: str, fingerprint: str, operation, status_code: int):
+        """
+        Run an operation and store its response under the idempotency key atomically.
+
+        A concurrent request committing the same key first makes this call fail with
+        `IntegrityError` and roll back the operation; the caller should then replay.
+
+        :param user_id: ID of the user owning the key
+        :param key: Idempotency key sent by the client
+        :param fingerprint: Fingerprint of the request payload
+        :param operation: Callable returning the JSON-serializable response body
+        :param status_code: HTTP status code of a successful response
+        :raises django.db.IntegrityError: If the key was stored concurrently
+        :return: Response body returned by the operation
+        :rtype: dict
+        """
+        ttl = config.wallet.IDEMPOTENCY_KEY_TTL
+
+        with transaction.atomic():
+            response = operation()
+
+            IdempotencyKey.objects.create(
+                user_id=user_id,
+                key=key,
+                fingerprint=fingerprint,
+                status_code=status_code,
+                response=response,
+                expires_at=timezone.now() + timedelta(seconds=ttl)
+            )
+
+            transaction.on_commit(
+                lambda: cache.set(
+                    cls.cache_key(user_id, key),
+                    (fingerprint, response, status_code),
+                    timeout=ttl
+                )
+            )
+
+        return response
+
+    @classmethod
+    def purge_expired(cls) -> int:
+        """
+        Delete expired idempotency keys in chunks.
+
+        :return: Number of deleted keys
+        :rtype: int
+        """
+        now = timezone.now()
+        deleted = 0
+        while True:
+            ids = list(
+                IdempotencyKey.objects.filter(expires_at__lte=now)
+                .values_list('id', flat=True)[:cls.PURGE_CHUNK_SIZE]
+            )
+            if not ids:
+                return deleted
+            deleted += IdempotencyKey.objects.filter(id__in=ids).delete()[0]
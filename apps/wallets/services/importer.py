@@ -0,0 +1,623 @@
+"""
+Bulk import service
+"""
+
+import io
+import re
+import csv
+import gzip
+import json
+import time
+import uuid
+import secrets
+
+from datetime import datetime
+from decimal import Decimal
+from decimal import InvalidOperation
+from itertools import islice
+
+from django.db import connection
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.contrib.auth.models import User
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+
+from apps.wallets.enums.status import Status
+from apps.wallets.enums.transaction import TransactionType
+from apps.wallets.exceptions.importer import ImportRowError
+from apps.wallets.models.wallet import Wallet
+from apps.wallets.models.transaction import Transaction
+from apps.wallets.services.rollup import RollupService
+from apps.wallets.services.commission import CommissionService
+from apps.wallets.services.reconciliation import ReconciliationService
+
+from src.settings.utils.logging import logger
+
+
+class ImportService:
+    """
+    Loads users with their wallets, and historical transactions, from CSV or NDJSON files.
+
+    Features:
+        - Files are parsed as a stream, gzip-compressed or not, so memory stays
+          bounded by one chunk whatever the file size.
+        - Rows are validated in chunks of `chunk_size`. Each valid chunk is loaded in
+          its own transaction, through ``COPY ... FROM STDIN`` on PostgreSQL and
+          `bulk_create` on other backends.
+        - Invalid rows are reported with their line number. The import stops at the
+          first chunk with errors, or skips the invalid rows with `skip_invalid`;
+          chunks loaded before stay committed.
+        - Completed transactions are added to the daily rollups of their day.
+        - After a transaction import, the balance of every wallet it touched is
+          compared with its incoming minus outgoing completed transactions.
+
+    File columns, or NDJSON object keys:
+        - wallets: ``username``, optional ``email``, ``balance`` and ``created_at``.
+          Each row creates a user without a usable password and its wallet.
+        - transactions: ``recipient`` and optional ``sender`` usernames, ``amount``,
+          optional ``transaction_type`` (transfer), ``status`` (completed),
+          ``created_at`` (now), ``transaction_group`` and ``description``.
+
+    Imported balances are taken as they are; they must equal the net of the
+    transactions imported afterwards for the ledger reconciliation to pass.
+    """
+
+    WALLETS = 'wallets'
+    TRANSACTIONS = 'transactions'
+    KINDS = (WALLETS, TRANSACTIONS)
+    FORMATS = ('csv', 'ndjson')
+    EXTENSIONS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+
+    CHUNK_SIZE = 20000
+    LOOKUP_BATCH_SIZE = 5000
+    ERROR_LIMIT = 100
+    CENT = Decimal('0.01')
+    MAX_AMOUNT = Decimal('9999999999.99')
+    USERNAME_PATTERN = re.compile(User.username_validator.regex)
+    TRANSACTION_TYPES = {tag.value for tag in TransactionType}
+    STATUSES = {tag.value for tag in Status}
+    DEFAULT_TYPE = TransactionType.TRANSFER.value
+    DEFAULT_STATUS = Status.COMPLETED.value
+
+    @classmethod
+    def detect_format(cls, name: str) -> tuple[str, bool]:
+        """
+        Infer the file format and compression from a file name.
+
+        :param name: File name, e.g. ``wallets.ndjson.gz``
+        :return: Format, or None if unknown, and whether the file is gzip-compressed
+        :rtype: tuple[str, bool]
+        """
+        name = name.lower()
+        compressed = name.endswith('.gz')
+        if compressed:
+            name = name[:-3]
+        for extension, fmt in cls.EXTENSIONS.items():
+            if name.endswith(extension):
+                return fmt, compressed
+        return None, compressed
+
+    @staticmethod
+    def read_rows(stream, fmt: str, compressed: bool = False):
+        """
+        Parse a binary stream row by row.
+
+        :param stream: Binary file object
+        :param fmt: ``csv`` or ``ndjson``
+        :param compressed: Whether the stream is gzip-compressed
+        :return: Generator of (line number, row) with rows as dicts, or None for
+            NDJSON lines that are not valid JSON
+        """
+        if compressed:
+            stream = gzip.GzipFile(fileobj=stream)
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+        if fmt == 'csv':
+            reader = csv.DictReader(text)
+            for row in reader:
+                yield reader.line_num, row
+            return
+
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line, parse_float=Decimal)
+            except ValueError:
+                yield line_number, None
+
+    @staticmethod
+    def text(row: dict, field: str) -> str:
+        value = row.get(field)
+        return '' if value is None else str(value).strip()
+
+    @classmethod
+    def amount(cls, row: dict, field: str, default: str = None, positive: bool = False) -> Decimal: # noqa
+        value = cls.text(row, field) or default
+        if value is None:
+            raise ImportRowError(f"{field} is required")
+        try:
+            amount = Decimal(value)
+        except InvalidOperation:
+            raise ImportRowError(f"{field} is not a number: {value!r}")
+        if not amount.is_finite() or amount.quantize(cls.CENT) != amount:
+            raise ImportRowError(f"{field} must have at most 2 decimal places: {value!r}")
+        if amount < 0 or (positive and amount == 0) or amount > cls.MAX_AMOUNT:
+            raise ImportRowError(f"{field} is out of range: {value!r}")
+        return amount.quantize(cls.CENT)
+
+    @classmethod
+    def moment(cls, row: dict, field: str, default: datetime, tz) -> datetime:
+        value = cls.text(row, field)
+        if not value:
+            return default
+        try:
+            moment = parse_datetime(value)
+        except ValueError:
+            moment = None
+        if moment is None:
+            raise ImportRowError(f"{field} is not an ISO 8601 datetime: {value!r}")
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=tz)
+        return moment
+
+    @classmethod
+    def validate_wallet(cls, row: dict, now: datetime, tz, seen: set) -> tuple:
+        """
+        Validate a wallet row.
+
+        :param row: Parsed row
+        :param now: Creation time of rows without ``created_at``
+        :param tz: Time zone of datetimes without an offset
+        :param seen: Usernames of the rows validated so far, updated in place
+        :return: Tuple of (username, email, balance, created_at)
+        :rtype: tuple
+        """
+        username = cls.text(row, 'username')
+        if not username:
+            raise ImportRowError("username is required")
+        if len(username) > 150 or not cls.USERNAME_PATTERN.match(username):
+            raise ImportRowError(f"username is invalid: {username!r}")
+        if username in seen:
+            raise ImportRowError(f"username is duplicated in the file: {username!r}")
+
+        email = cls.text(row, 'email')
+        if len(email) > 254 or (email and '@' not in email):
+            raise ImportRowError(f"email is invalid: {email!r}")
+
+        balance = cls.amount(row, 'balance', default='0')
+        created_at = cls.moment(row, 'created_at', now, tz)
+        seen.add(username)
+        return username, email, balance, created_at
+
+    @classmethod
+    def validate_transaction(cls, row: dict, now: datetime, tz) -> tuple:
+        """
+        Validate a transaction row, leaving the usernames to be resolved per chunk.
+
+        :param row: Parsed row
+        :param now: Creation time of rows without ``created_at``
+        :param tz: Time zone of datetimes without an offset
+        :return: Tuple of (sender username or None, recipient username, amount,
+            transaction type, status, transaction group, description, created_at)
+        :rtype: tuple
+        """
+        sender = cls.text(row, 'sender') or None
+        recipient = cls.text(row, 'recipient')
+        if not recipient:
+            raise ImportRowError("recipient is required")
+        if sender == recipient:
+            raise ImportRowError("sender and recipient must differ")
+
+        amount = cls.amount(row, 'amount', positive=True)
+
+        transaction_type = cls.text(row, 'transaction_type') or cls.DEFAULT_TYPE
+        if transaction_type not in cls.TRANSACTION_TYPES:
+            raise ImportRowError(f"transaction_type is invalid: {transaction_type!r}")
+        status = cls.text(row, 'status') or cls.DEFAULT_STATUS
+        if status not in cls.STATUSES:
+            raise ImportRowError(f"status is invalid: {status!r}")
+
+        group = cls.text(row, 'transaction_group')
+        try:
+            group = uuid.UUID(group) if group else uuid.uuid4()
+        except ValueError:
+            raise ImportRowError(f"transaction_group is not a UUID: {group!r}")
+
+        return (
+            sender,
+            recipient,
+            amount,
+            transaction_type,
+            status,
+            group,
+            cls.text(row, 'description') or None,
+            cls.moment(row, 'created_at', now, tz)
+        )
+
+    @classmethod
+    def batches(cls, values: list):
+        for start in range(0, len(values), cls.LOOKUP_BATCH_SIZE):
+            yield values[start:start + cls.LOOKUP_BATCH_SIZE]
+
+    @classmethod
+    def prepare_wallets(cls, rows: list[tuple], errors: list) -> list[tuple]:
+        """
+        Drop wallet rows whose username is already taken.
+
+        :param rows: (line number, validated row) pairs
+        :param errors: (line number, message) pairs, appended to
+        :return: Rows to load
+        :rtype: list[tuple]
+        """
+        taken = set()
+        for usernames in cls.batches([row[0] for _, row in rows]):
+            taken.update(User.objects.filter(username__in=usernames).values_list('username', flat=True)) # noqa
+
+        valid = []
+        for line_number, row in rows:
+            if row[0] in taken:
+                errors.append((line_number, f"username already exists: {row[0]!r}"))
+            else:
+                valid.append(row)
+        return valid
+
+    @classmethod
+    def prepare_transactions(cls, rows: list[tuple], errors: list) -> list[tuple]:
+        """
+        Replace sender and recipient usernames with wallet IDs.
+
+        :param rows: (line number, validated row) pairs
+        :param errors: (line number, message) pairs, appended to
+        :return: Rows to load, with wallet IDs in place of usernames
+        :rtype: list[tuple]
+        """
+        usernames = {row[1] for _, row in rows} | {row[0] for _, row in rows if row[0]}
+        wallet_ids = {}
+        for batch in cls.batches(list(usernames)):
+            wallet_ids.update(Wallet.objects.filter(
+                user__username__in=batch
+            ).values_list('user__username', 'id'))
+
+        valid = []
+        for line_number, (sender, recipient, *fields) in rows:
+            missing = [name for name in (sender, recipient) if name and name not in wallet_ids]
+            if missing:
+                errors.append((line_number, f"no wallet for username {missing[0]!r}"))
+            else:
+                valid.append((wallet_ids.get(sender), wallet_ids[recipient], *fields))
+        return valid
+
+    @staticmethod
+    def use_copy() -> bool:
+        return connection.vendor == 'postgresql'
+
+    @classmethod
+    def copy_rows(cls, cursor, table: str, columns: tuple, rows):
+        """
+        Stream rows into a table with ``COPY ... FROM STDIN``.
+
+        :param cursor: Django cursor on a psycopg connection
+        :param table: Quoted table name
+        :param columns: Column names, in row order
+        :param rows: Iterable of row tuples
+        """
+        with cursor.cursor.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+
+    @staticmethod
+    def unusable_password() -> str:
+        # Same format as `make_password(None)`, without its per-character random choice.
+        return UNUSABLE_PASSWORD_PREFIX + secrets.token_urlsafe(30)
+
+    @classmethod
+    def restore_timestamps(cls, model, pairs):
+        """
+        Set the imported creation time of rows inserted by `bulk_create`, which
+        `auto_now_add` replaced with the time of the insert.
+
+        One ``UPDATE`` is run per distinct timestamp, since `bulk_update` builds a
+        ``CASE`` over every row of a batch and is far slower on large chunks.
+
+        :param model: Model of the inserted rows
+        :param pairs: Pairs of (inserted object, imported creation time)
+        """
+        ids = {}
+        for item, created_at in pairs:
+            ids.setdefault(created_at, []).append(item.pk)
+
+        for created_at, moment_ids in ids.items():
+            for batch in cls.batches(moment_ids):
+                model.objects.filter(pk__in=batch).update(created_at=created_at, updated_at=created_at) # noqa
+
+    @classmethod
+    def load_wallets(cls, rows: list[tuple]):
+        """
+        Create users and their wallets.
+
+        On PostgreSQL the rows are copied into a temporary table, then both tables
+        are filled from it with one ``INSERT ... SELECT`` statement.
+
+        :param rows: Tuples of (username, email, balance, created_at)
+        :type rows: list[tuple]
+        """
+        if not cls.use_copy():
+            users = User.objects.bulk_create(
+                [
+                    User(username=username, email=email, password=cls.unusable_password(), date_joined=created_at) # noqa
+                    for username, email, _, created_at in rows
+                ],
+                batch_size=1000
+            )
+            wallets = Wallet.objects.bulk_create(
+                [Wallet(user=user, balance=row[2]) for user, row in zip(users, rows)],
+                batch_size=1000
+            )
+            cls.restore_timestamps(Wallet, zip(wallets, (row[3] for row in rows)))
+            return
+
+        quote = connection.ops.quote_name
+        users = quote(User._meta.db_table)
+        wallets = quote(Wallet._meta.db_table)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE TEMPORARY TABLE IF NOT EXISTS import_wallets ("
+                "username varchar(150), email varchar(254), balance numeric(12, 2), "
+                "created_at timestamptz) ON COMMIT DROP"
+            )
+            cursor.execute("TRUNCATE import_wallets")
+            cls.copy_rows(cursor, 'import_wallets', ('username', 'email', 'balance', 'created_at'), rows) # noqa
+            cursor.execute(
+                f"WITH created AS ("
+                f"INSERT INTO {users} (password, is_superuser, username, first_name, last_name, "
+                f"email, is_staff, is_active, date_joined) "
+                f"SELECT '!' || md5(random()::text || username), false, username, '', '', "
+                f"email, false, true, created_at FROM import_wallets "
+                f"RETURNING id, username) "
+                f"INSERT INTO {wallets} (user_id, balance, version, created_at, updated_at) "
+                f"SELECT created.id, import_wallets.balance, 0, import_wallets.created_at, "
+                f"import_wallets.created_at FROM created "
+                f"JOIN import_wallets ON import_wallets.username = created.username"
+            )
+
+    @classmethod
+    def load_transactions(cls, rows: list[tuple]):
+        """
+        Insert transactions and add the completed ones to the daily rollups.
+
+        :param rows: Tuples of (sender_id, recipient_id, amount, transaction_type,
+            status, transaction_group, description, created_at)
+        :type rows: list[tuple]
+        """
+        if not cls.use_copy():
+            created = Transaction.objects.bulk_create(
+                [
+                    Transaction(
+                        sender_id=sender_id,
+                        recipient_id=recipient_id,
+                        amount=amount,
+                        transaction_type=transaction_type,
+                        status=status,
+                        transaction_group=group,
+                        description=description
+                    )
+                    for sender_id, recipient_id, amount, transaction_type, status, group, description, _ in rows # noqa
+                ],
+                batch_size=1000
+            )
+            cls.restore_timestamps(Transaction, zip(created, (row[7] for row in rows)))
+        else:
+            columns = (
+                'sender_id',
+                'recipient_id',
+                'amount',
+                'transaction_type',
+                'status',
+                'transaction_group',
+                'description',
+                'created_at',
+                'updated_at'
+            )
+            with connection.cursor() as cursor:
+                cls.copy_rows(
+                    cursor,
+                    connection.ops.quote_name(Transaction._meta.db_table),
+                    columns,
+                    (row + (row[7],) for row in rows)
+                )
+
+        cls.record_rollups(rows)
+
+    @classmethod
+    def record_rollups(cls, rows: list[tuple]):
+        """
+        Add completed transactions to the rollups of their day, counting commission
+        rows as inflow of their recipient like `RollupService.backfill` does.
+
+        :param rows: Validated transaction rows with wallet IDs
+        :type rows: list[tuple]
+        """
+        completed = Status.COMPLETED.value
+        days = {}
+        for sender_id, recipient_id, amount, transaction_type, status, _, _, created_at in rows:
+            if status != completed:
+                continue
+            totals = days.setdefault(timezone.localdate(created_at), {})
+            if transaction_type == TransactionType.TRANSFER.value:
+                if sender_id is None:
+                    recipient = totals.setdefault(recipient_id, RollupService.empty())
+                    recipient[0] += amount
+                    recipient[3] += 1
+                else:
+                    RollupService.add_transfer(totals, sender_id, recipient_id, amount, Decimal('0')) # noqa
+            else:
+                if sender_id is not None:
+                    totals.setdefault(sender_id, RollupService.empty())[2] += amount
+                totals.setdefault(recipient_id, RollupService.empty())[0] += amount
+
+        for day, totals in sorted(days.items()):
+            RollupService.record(totals, day)
+
+    @classmethod
+    def check_balances(cls, wallet_ids: set) -> dict:
+        """
+        Compare wallet balances with their incoming minus outgoing completed transactions.
+
+        The admin wallet is expected to lag its commission rows by the pending accruals.
+
+        :param wallet_ids: IDs of the wallets to check
+        :return: Number of wallets checked and drifted, with the first drifted wallets
+        :rtype: dict
+        """
+        completed = Transaction.objects.filter(status=Status.COMPLETED.value)
+        drifted = []
+        ids = sorted(wallet_ids)
+
+        for chunk in cls.batches(ids):
+            expected = dict.fromkeys(chunk, Decimal('0'))
+            for field, sign in (('recipient_id', 1), ('sender_id', -1)):
+                totals = (
+                    completed.filter(**{f'{field}__in': chunk})
+                    .values(field)
+                    .annotate(total=Sum('amount'))
+                    .order_by()
+                )
+                for row in totals:
+                    expected[row[field]] += sign * row['total']
+
+            if CommissionService.ADMIN_WALLET_ID in expected:
+                expected[CommissionService.ADMIN_WALLET_ID] -= (
+                    Decimal(ReconciliationService.pending_commission()) / ReconciliationService.MINOR_UNITS # noqa
+                )
+
+            for wallet_id, balance in Wallet.objects.filter(id__in=chunk).values_list('id', 'balance'): # noqa
+                if balance != expected[wallet_id]:
+                    drifted.append({
+                        'wallet_id': wallet_id,
+                        'balance': f"{balance:.2f}",
+                        'expected': f"{expected[wallet_id]:.2f}",
+                        'drift': f"{balance - expected[wallet_id]:.2f}"
+                    })
+
+        return {
+            'wallets_checked': len(ids),
+            'drifted_count': len(drifted),
+            'drifted': drifted[:cls.ERROR_LIMIT]
+        }
+
+    @classmethod
+    def run(
+        cls,
+        stream,
+        kind: str,
+        fmt: str,
+        compressed: bool = False,
+        chunk_size: int = None,
+        skip_invalid: bool = False,
+        dry_run: bool = False,
+        check: bool = True
+    ) -> dict:
+        """
+        Import a file of wallets or transactions.
+
+        :param stream: Binary file object
+        :param kind: ``wallets`` or ``transactions``
+        :param fmt: ``csv`` or ``ndjson``
+        :param compressed: Whether the stream is gzip-compressed
+        :param chunk_size: Rows validated and loaded per transaction, defaults to `CHUNK_SIZE`
+        :param skip_invalid: Load the valid rows of chunks with invalid rows instead of stopping
+        :param dry_run: Validate the whole file without loading anything
+        :param check: Check the balances of the wallets touched by a transaction import
+        :return: Report with row counts, errors, throughput and the balance check
+        :rtype: dict
+        """
+        if kind not in cls.KINDS:
+            raise ValueError(f"Unknown import kind: {kind}")
+        if fmt not in cls.FORMATS:
+            raise ValueError(f"Unknown import format: {fmt}")
+
+        chunk_size = chunk_size or cls.CHUNK_SIZE
+        started = time.perf_counter()
+        now = timezone.now()
+        tz = timezone.get_current_timezone()
+        rows = cls.read_rows(stream, fmt, compressed)
+
+        seen = set()
+        touched = set()
+        errors = []
+        errors_count = 0
+        read = loaded = chunks = 0
+        aborted = False
+
+        while chunk := list(islice(rows, chunk_size)):
+            read += len(chunk)
+            chunk_errors = []
+            validated = []
+            for line_number, row in chunk:
+                try:
+                    if not isinstance(row, dict):
+                        raise ImportRowError("row is not a JSON object")
+                    if kind == cls.WALLETS:
+                        validated.append((line_number, cls.validate_wallet(row, now, tz, seen)))
+                    else:
+                        validated.append((line_number, cls.validate_transaction(row, now, tz)))
+                except ImportRowError as e:
+                    chunk_errors.append((line_number, str(e)))
+
+            if kind == cls.WALLETS:
+                valid = cls.prepare_wallets(validated, chunk_errors)
+            else:
+                valid = cls.prepare_transactions(validated, chunk_errors)
+
+            errors_count += len(chunk_errors)
+            errors.extend(
+                {'line': line_number, 'error': message}
+                for line_number, message in sorted(chunk_errors)[:cls.ERROR_LIMIT - len(errors)]
+            )
+            if chunk_errors and not skip_invalid and not dry_run:
+                aborted = True
+                break
+            if dry_run or not valid:
+                continue
+
+            with transaction.atomic():
+                if kind == cls.WALLETS:
+                    cls.load_wallets(valid)
+                else:
+                    cls.load_transactions(valid)
+                    for row in valid:
+                        touched.add(row[1])
+                        if row[0] is not None:
+                            touched.add(row[0])
+            loaded += len(valid)
+            chunks += 1
+
+        elapsed = time.perf_counter() - started
+        report = {
+            'kind': kind,
+            'rows_read': read,
+            'rows_loaded': loaded,
+            'rows_invalid': errors_count,
+            'chunks': chunks,
+            'aborted': aborted,
+            'dry_run': dry_run,
+            'errors': errors,
+            'elapsed_s': round(elapsed, 3),
+            'rows_per_s': round(loaded / elapsed, 1) if elapsed else 0.0,
+            'backend': 'copy' if cls.use_copy() else 'bulk_create',
+            'check': None
+        }
+
+        if check and touched:
+            report['check'] = cls.check_balances(touched)
+            if report['check']['drifted_count']:
+                logger.warning(
+                    "Transaction import left %s wallets inconsistent with their history",
+                    report['check']['drifted_count']
+                )
+
+        return report
@@ -0,0 +1,223 @@
+"""
+Transfer metrics service
+"""
+
+import time
+
+from decimal import Decimal
+
+from prometheus_client import Counter
+from prometheus_client import Histogram
+
+from apps.wallets.enums.engine import TransferEngine
+
+from src.settings.utils.metrics import LATENCY_BUCKETS
+
+
+TRANSFER_PHASE_SECONDS = Histogram(
+    'wallet_transfer_phase_seconds',
+    'Time spent in each phase of a transfer: lock, check, write and commit',
+    ['engine', 'phase'],
+    buckets=LATENCY_BUCKETS
+)
+TRANSFER_SECONDS = Histogram(
+    'wallet_transfer_seconds',
+    'Time spent executing a single transfer or a batch, commit included',
+    ['engine', 'kind'],
+    buckets=LATENCY_BUCKETS
+)
+TRANSFERS = Counter(
+    'wallet_transfers',
+    'Completed transfers',
+    ['kind']
+)
+TRANSFER_REJECTIONS = Counter(
+    'wallet_transfer_rejections',
+    'Transfers rejected by the service, by reason',
+    ['reason']
+)
+COMMISSION_VOLUME = Counter(
+    'wallet_commission_amount',
+    'Commission charged on completed transfers, in currency units'
+)
+COMMISSION_TRANSFERS = Counter(
+    'wallet_commission_transfers',
+    'Completed transfers charged a commission'
+)
+WALLET_CACHE_LOOKUPS = Counter(
+    'wallet_cache_lookups',
+    'Wallet snapshot cache lookups, by store and result: hit, miss or error',
+    ['store', 'result']
+)
+WALLET_CACHE_WRITES = Counter(
+    'wallet_cache_writes',
+    'Wallet balances written to the snapshot cache, by store and result: applied or stale',
+    ['store', 'result']
+)
+NOTIFICATION_DELIVERIES = Counter(
+    'wallet_notification_deliveries',
+    'Notification delivery attempts, by backend and result: sent or failed',
+    ['backend', 'result']
+)
+NOTIFICATION_DELIVERY_SECONDS = Histogram(
+    'wallet_notification_delivery_seconds',
+    'Time spent delivering one notification, semaphore wait excluded',
+    ['backend'],
+    buckets=LATENCY_BUCKETS
+)
+
+PHASES = ('lock', 'check', 'write', 'commit')
+BATCH = 'batch'
+SINGLE = 'single'
+
+
+class PhaseTimer:
+    """
+    Times consecutive phases of one transfer.
+
+    Each `mark` observes the time since the previous mark into a histogram child
+    bound once per engine, so recording allocates nothing but a float.
+    """
+
+    __slots__ = ('engine', 'phases', 'started', 'last')
+
+    children = {
+        engine.value: {phase: TRANSFER_PHASE_SECONDS.labels(engine.value, phase) for phase in PHASES} # noqa
+        for engine in TransferEngine
+    }
+
+    def __init__(self, engine: str):
+        self.engine = engine
+        self.phases = self.children[engine]
+        self.started = self.last = time.perf_counter()
+
+    def mark(self, phase: str):
+        """
+        Close the current phase.
+
+        :param phase: Name of the phase that just ended, one of `PHASES`
+        :type phase: str
+        """
+        now = time.perf_counter()
+        self.phases[phase].observe(now - self.last)
+        self.last = now
+
+    def elapsed(self) -> float:
+        return self.last - self.started
+
+
+class TransferMetrics:
+    """
+    Records transfer outcomes, rejections and commission volume.
+    """
+
+    rejection_children = {}
+
+    @classmethod
+    def timer(cls, engine: str) -> PhaseTimer:
+        """
+        Start timing a transfer.
+
+        :param engine: Transfer engine value
+        :type engine: str
+        :return: Phase timer
+        :rtype: PhaseTimer
+        """
+        return PhaseTimer(engine)
+
+    @classmethod
+    def completed(cls, timer: PhaseTimer, kind: str, count: int, commission: Decimal, charged: int):
+        """
+        Record transfers committed together.
+
+        :param timer: Timer of the transfer or batch, with its commit phase marked
+        :param kind: `SINGLE` or `BATCH`
+        :param count: Number of completed transfers
+        :param commission: Total commission charged
+        :param charged: Number of transfers charged a commission
+        """
+        TRANSFER_SECONDS.labels(timer.engine, kind).observe(timer.elapsed())
+        TRANSFERS.labels(kind).inc(count)
+        if charged:
+            COMMISSION_TRANSFERS.inc(charged)
+            COMMISSION_VOLUME.inc(float(commission))
+
+    @classmethod
+    def rejected(cls, error: ValueError):
+        """
+        Record a rejected transfer by the `reason` of its error.
+
+        :param error: Error the transfer was rejected with
+        :type error: ValueError
+        """
+        reason = getattr(error, 'reason', 'invalid')
+        child = cls.rejection_children.get(reason)
+        if child is None:
+            child = cls.rejection_children[reason] = TRANSFER_REJECTIONS.labels(reason)
+        child.inc()
+
+
+class WalletCacheMetrics:
+    """
+    Records wallet snapshot cache hits, misses and versioned writes.
+    """
+
+    children = {}
+
+    @classmethod
+    def child(cls, metric: Counter, store: str, result: str):
+        child = cls.children.get((metric, store, result))
+        if child is None:
+            child = cls.children[(metric, store, result)] = metric.labels(store, result)
+        return child
+
+    @classmethod
+    def lookup(cls, store: str, result: str):
+        """
+        Record a cache lookup.
+
+        :param store: Name of the snapshot store
+        :param result: `hit`, `miss` or `error`
+        """
+        cls.child(WALLET_CACHE_LOOKUPS, store, result).inc()
+
+    @classmethod
+    def written(cls, store: str, applied: int, stale: int):
+        """
+        Record balance writes, split into applied and rejected as stale.
+
+        :param store: Name of the snapshot store
+        :param applied: Number of balances written
+        :param stale: Number of balances older than the cached ones
+        """
+        if applied:
+            cls.child(WALLET_CACHE_WRITES, store, 'applied').inc(applied)
+        if stale:
+            cls.child(WALLET_CACHE_WRITES, store, 'stale').inc(stale)
+
+
+class NotificationMetrics:
+    """
+    Records notification delivery attempts and their latency.
+    """
+
+    children = {}
+
+    @classmethod
+    def delivered(cls, backend: str, elapsed: float, sent: bool):
+        """
+        Record one delivery attempt.
+
+        :param backend: Delivery backend
+        :param elapsed: Duration of the attempt in seconds
+        :param sent: Whether the notification was accepted
+        """
+        children = cls.children.get(backend)
+        if children is None:
+            children = cls.children[backend] = (
+                NOTIFICATION_DELIVERY_SECONDS.labels(backend),
+                NOTIFICATION_DELIVERIES.labels(backend, 'sent'),
+                NOTIFICATION_DELIVERIES.labels(backend, 'failed')
+            )
+        children[0].observe(elapsed)
+        children[1 if sent else 2].inc()
@@ -0,0 +1,160 @@
+"""
+Notification service
+"""
+
+import json
+
+from decimal import Decimal
+
+import redis
+
+from celery import current_app
+
+from apps.wallets.tasks.notify import send_notification_batch
+from apps.wallets.tasks.notify import flush_notification_digest
+
+from src.settings.config.config import config
+from src.settings.utils.redis import get_redis
+from src.settings.utils.logging import logger
+
+
+class NotificationService:
+    """
+    Coalesces transfer notifications into one digest per recipient and window.
+
+    Notifications are appended to a per-recipient Redis list. The first notification
+    of a window schedules a single `flush_notification_digest` task, delayed by
+    `CELERY_NOTIFY_DIGEST_WINDOW` seconds, which drains the list and sends one digest.
+    A recipient of 200 transfers in a window costs one broker message and one delivery
+    instead of 200.
+
+    Without a Redis buffer, with a zero window, or when Redis is unreachable,
+    notifications are sent individually by `send_notification_batch` tasks of up
+    to `CELERY_NOTIFY_BATCH_SIZE` transfers, each delivered concurrently.
+    """
+
+    BUFFER_KEY = 'notify:digest:{recipient_id}'
+    SCHEDULED_KEY = 'notify:digest:{recipient_id}:scheduled'
+
+    @staticmethod
+    def get_buffer():
+        """
+        Return the Redis client used as the digest buffer, if digests are enabled.
+
+        :return: Redis client, or None when digests are disabled
+        :rtype: redis.Redis | None
+        """
+        if config.task.CELERY_NOTIFY_DIGEST_WINDOW <= 0 or not config.task.CELERY_NOTIFY_BUFFER_URL: # noqa
+            return None
+        return get_redis(config.task.CELERY_NOTIFY_BUFFER_URL)
+
+    @classmethod
+    def enqueue(cls, recipient_id: int, amount: Decimal, sender_id: int, transaction_group_id: str): # noqa
+        """
+        Queue a notification about one transfer.
+
+        :param recipient_id: ID of the recipient wallet
+        :param amount: Amount transferred
+        :param sender_id: ID of the sender wallet
+        :param transaction_group_id: UUID of the transaction group
+        """
+        cls.enqueue_many([(recipient_id, amount, sender_id, transaction_group_id)])
+
+    @classmethod
+    def enqueue_many(cls, notifications: list):
+        """
+        Queue notifications about many transfers with one Redis round trip.
+
+        :param notifications: Tuples of (recipient_id, amount, sender_id, transaction_group_id)
+        :type notifications: list
+        """
+        if not notifications:
+            return
+
+        buffer = cls.get_buffer()
+        if buffer is not None:
+            try:
+                cls._buffer(buffer, notifications)
+                return
+            except redis.RedisError as e:
+                logger.warning("Notification buffer unavailable, sending individually: %s", e)
+
+        batch_size = config.task.CELERY_NOTIFY_BATCH_SIZE
+        with current_app.producer_or_acquire() as producer:
+            for start in range(0, len(notifications), batch_size):
+                send_notification_batch.apply_async(
+                    args=[[
+                        [recipient_id, str(amount), sender_id, str(transaction_group_id)]
+                        for recipient_id, amount, sender_id, transaction_group_id
+                        in notifications[start:start + batch_size]
+                    ]],
+                    producer=producer
+                )
+
+    @classmethod
+    def _buffer(cls, buffer, notifications: list):
+        window = config.task.CELERY_NOTIFY_DIGEST_WINDOW
+        recipient_ids = []
+
+        pipeline = buffer.pipeline(transaction=False)
+        for recipient_id, amount, sender_id, transaction_group_id in notifications:
+            pipeline.rpush(
+                cls.BUFFER_KEY.format(recipient_id=recipient_id),
+                json.dumps({
+                    'amount': str(amount),
+                    'sender_id': sender_id,
+                    'transaction_group_id': str(transaction_group_id)
+                })
+            )
+            if recipient_id not in recipient_ids:
+                recipient_ids.append(recipient_id)
+
+        for recipient_id in recipient_ids:
+            pipeline.set(
+                cls.SCHEDULED_KEY.format(recipient_id=recipient_id),
+                1,
+                nx=True,
+                ex=window * 10
+            )
+        scheduled = pipeline.execute()[-len(recipient_ids):]
+
+        for recipient_id, is_first in zip(recipient_ids, scheduled):
+            if is_first:
+                flush_notification_digest.apply_async(args=[recipient_id], countdown=window)
+
+    @classmethod
+    def drain(cls, recipient_id: int) -> list:
+        """
+        Take every buffered notification of a recipient.
+
+        The scheduled marker is cleared before the list is taken, so a notification
+        buffered concurrently is either part of this digest or schedules the next one.
+
+        :param recipient_id: ID of the recipient wallet
+        :return: Buffered notifications, oldest first
+        :rtype: list
+        """
+        buffer = get_redis(config.task.CELERY_NOTIFY_BUFFER_URL)
+        buffer.delete(cls.SCHEDULED_KEY.format(recipient_id=recipient_id))
+
+        key = cls.BUFFER_KEY.format(recipient_id=recipient_id)
+        pipeline = buffer.pipeline(transaction=True)
+        pipeline.lrange(key, 0, -1)
+        pipeline.delete(key)
+        raw_items, _ = pipeline.execute()
+        return [json.loads(item) for item in raw_items]
+
+    @staticmethod
+    def build_digest(items: list) -> dict:
+        """
+        Build the digest payload for buffered notifications.
+
+        :param items: Buffered notifications
+        :return: Digest with transfer count, total amount and the transfers
+        :rtype: dict
+        """
+        return {
+            'count': len(items),
+            'total_amount': str(sum((Decimal(item['amount']) for item in items), Decimal('0'))), # noqa
+            'transfers': items
+        }
@@ -0,0 +1,163 @@
+"""
+Outbox service
+"""
+
+from datetime import timedelta
+
+from django.db.models import F
+from django.db import transaction
+from django.utils import timezone
+
+from apps.wallets.models.outbox import OutboxEvent
+from apps.wallets.enums.outbox import OutboxEventType
+from apps.wallets.services.notification import NotificationService
+
+from src.settings.config.config import config
+from src.settings.utils.logging import logger
+
+
+class OutboxService:
+    """
+    Transactional outbox for transfer side effects.
+
+    Events are written in the same database transaction as the transfer, so a
+    committed transfer always has its event and the request thread never talks
+    to the broker. A relay claims pending events in bulk with `SKIP LOCKED`,
+    so several relays can run side by side, publishes them in batches and marks
+    them delivered. Delivery is at-least-once.
+    """
+
+    PURGE_CHUNK_SIZE = 5000
+
+    @staticmethod
+    def transfer_completed(
+        recipient_id: int,
+        amount,
+        sender_id: int,
+        transaction_group_id: str
+    ) -> OutboxEvent:
+        """
+        Build an unsaved event announcing a completed transfer.
+
+        :param recipient_id: ID of the recipient wallet
+        :param amount: Amount transferred
+        :param sender_id: ID of the sender wallet
+        :param transaction_group_id: UUID of the transaction group
+        :return: Unsaved outbox event
+        :rtype: OutboxEvent
+        """
+        return OutboxEvent(
+            event_type=OutboxEventType.TRANSFER_COMPLETED.value,
+            payload={
+                'recipient_id': recipient_id,
+                'amount': str(amount),
+                'sender_id': sender_id,
+                'transaction_group_id': str(transaction_group_id)
+            }
+        )
+
+    @staticmethod
+    def record(events: list[OutboxEvent]):
+        """
+        Save events in the current database transaction with one insert.
+
+        :param events: Unsaved outbox events
+        :type events: list[OutboxEvent]
+        """
+        OutboxEvent.objects.bulk_create(events)
+
+    @staticmethod
+    def publish(events: list[OutboxEvent]):
+        """
+        Publish claimed events to their consumers.
+
+        :param events: Outbox events
+        :type events: list[OutboxEvent]
+        """
+        notifications = [
+            (
+                event.payload['recipient_id'],
+                event.payload['amount'],
+                event.payload['sender_id'],
+                event.payload['transaction_group_id']
+            )
+            for event in events
+            if event.event_type == OutboxEventType.TRANSFER_COMPLETED.value
+        ]
+        NotificationService.enqueue_many(notifications)
+
+    @classmethod
+    def relay_batch(cls, batch_size: int = None) -> int:
+        """
+        Claim, publish and mark delivered one batch of pending events.
+
+        Rows stay locked until the batch is marked delivered; if publishing fails,
+        the transaction rolls back and the events are retried by the next relay run.
+
+        :param batch_size: Maximum number of events, `CELERY_OUTBOX_BATCH_SIZE` by default
+        :return: Number of relayed events
+        :rtype: int
+        """
+        batch_size = batch_size or config.task.CELERY_OUTBOX_BATCH_SIZE
+
+        with transaction.atomic():
+            events = list(
+                OutboxEvent.objects.select_for_update(skip_locked=True)
+                .filter(delivered_at__isnull=True)
+                .order_by('id')[:batch_size]
+            )
+            if not events:
+                return 0
+
+            cls.publish(events)
+
+            OutboxEvent.objects.filter(id__in=[event.id for event in events]).update(
+                delivered_at=timezone.now(),
+                attempts=F('attempts') + 1
+            )
+
+        return len(events)
+
+    @classmethod
+    def relay(cls, batch_size: int = None, time_budget: float = None) -> int:
+        """
+        Relay pending events batch by batch until none are left or the time budget is spent.
+
+        :param batch_size: Maximum number of events per batch
+        :param time_budget: Maximum duration in seconds, unlimited by default
+        :return: Number of relayed events
+        :rtype: int
+        """
+        batch_size = batch_size or config.task.CELERY_OUTBOX_BATCH_SIZE
+        deadline = timezone.now() + timedelta(seconds=time_budget) if time_budget else None
+
+        relayed = 0
+        while True:
+            count = cls.relay_batch(batch_size)
+            relayed += count
+            if count < batch_size or (deadline and timezone.now() >= deadline):
+                break
+
+        if relayed:
+            logger.info("Relayed %s outbox events", relayed)
+        return relayed
+
+    @classmethod
+    def purge_delivered(cls, older_than: timedelta = timedelta(days=1)) -> int:
+        """
+        Delete delivered events in chunks.
+
+        :param older_than: Minimum age of the deleted events
+        :return: Number of deleted events
+        :rtype: int
+        """
+        threshold = timezone.now() - older_than
+        deleted = 0
+        while True:
+            ids = list(
+                OutboxEvent.objects.filter(delivered_at__lt=threshold)
+                .values_list('id', flat=True)[:cls.PURGE_CHUNK_SIZE]
+            )
+            if not ids:
+                return deleted
+            deleted += OutboxEvent.objects.filter(id__in=ids).delete()[0]
@@ -0,0 +1,340 @@
+"""
+Ledger reconciliation service
+"""
+
+import time
+import zlib
+
+from array import array
+
+from django.db import connection
+from django.db import transaction
+
+from apps.wallets.enums.status import Status
+from apps.wallets.enums.transaction import TransactionType
+from apps.wallets.models.wallet import Wallet
+from apps.wallets.models.transaction import Transaction
+from apps.wallets.models.commission import CommissionAccrual
+from apps.wallets.models.reconciliation import ReconciliationCheckpoint
+from apps.wallets.services.commission import CommissionService
+
+from src.settings.utils.logging import logger
+
+try:
+    import numpy as np
+except ImportError: # pragma: no cover
+    np = None
+
+
+class Ledger:
+    """
+    Per-wallet accumulator of net ledger movements in integer minor units.
+
+    Indexed directly by wallet ID. Backed by a NumPy ``int64`` array when NumPy is
+    installed and by a standard library ``array('q')`` otherwise; both serialize
+    to the same bytes.
+    """
+
+    def __init__(self, size: int = 0, data: bytes = b''):
+        if np is not None:
+            self.values = np.frombuffer(data, dtype=np.int64).copy()
+        else:
+            self.values = array('q')
+            self.values.frombytes(data)
+        self.grow(size)
+
+    def __len__(self):
+        return len(self.values)
+
+    def grow(self, size: int):
+        """
+        Extend the accumulator with zeros up to the given size.
+
+        :param size: Minimum number of slots
+        :type size: int
+        """
+        missing = size - len(self.values)
+        if missing <= 0:
+            return
+
+        if np is not None:
+            self.values = np.concatenate([self.values, np.zeros(missing, dtype=np.int64)])
+        else:
+            self.values.extend(array('q', bytes(8 * missing)))
+
+    def apply(self, rows: list[tuple]):
+        """
+        Add a chunk of ``(id, sender_id, recipient_id, amount, is_commission)`` rows.
+
+        Amounts are credited to the recipient and debited from the sender.
+
+        :param rows: Transaction rows with amounts in minor units and sender 0 for none
+        :type rows: list[tuple]
+        """
+        if np is not None:
+            chunk = np.array(rows, dtype=np.int64)
+            self.grow(int(chunk[:, 1:3].max()) + 1)
+            np.add.at(self.values, chunk[:, 2], chunk[:, 3])
+            np.subtract.at(self.values, chunk[:, 1], chunk[:, 3])
+        else:
+            self.grow(max(max(row[1], row[2]) for row in rows) + 1)
+            values = self.values
+            for _, sender_id, recipient_id, amount, _ in rows:
+                values[recipient_id] += amount
+                values[sender_id] -= amount
+        self.values[0] = 0
+
+    def drift(self, balances: 'Ledger', adjustments: dict) -> list[tuple]:
+        """
+        Compare balances against the ledger.
+
+        :param balances: Wallet balances in minor units, indexed by wallet ID
+        :param adjustments: Expected balance corrections by wallet ID
+        :return: Tuples of (wallet_id, balance, expected) for every drifted wallet
+        :rtype: list[tuple]
+        """
+        size = max(len(self), len(balances))
+        self.grow(size)
+        balances.grow(size)
+
+        expected = self.values.copy() if np is not None else array('q', self.values)
+        for wallet_id, adjustment in adjustments.items():
+            if wallet_id < size:
+                expected[wallet_id] += adjustment
+
+        if np is not None:
+            ids = np.nonzero(balances.values != expected)[0]
+        else:
+            ids = [
+                wallet_id for wallet_id in range(size)
+                if balances.values[wallet_id] != expected[wallet_id]
+            ]
+
+        return [
+            (int(wallet_id), int(balances.values[wallet_id]), int(expected[wallet_id]))
+            for wallet_id in ids
+        ]
+
+    def to_bytes(self) -> bytes:
+        return self.values.tobytes()
+
+
+class ReconciliationService:
+    """
+    Checks that every wallet balance equals its incoming minus outgoing completed
+    transactions, commission rows included.
+
+    Transactions are streamed in keyset chunks with amounts already converted to
+    integer minor units by the database, aggregated into a `Ledger`, and compared
+    with a bulk balance snapshot taken in the same database snapshot. The admin
+    wallet is expected to lag its commission rows by the pending accruals.
+
+    Each run stores a `ReconciliationCheckpoint` with the per-wallet ledger, so
+    incremental runs only scan transactions created since. A full run is only
+    meaningful while the transaction history is complete; once retention has
+    removed old rows, keep reconciling incrementally from an earlier checkpoint.
+    """
+
+    MINOR_UNITS = 100
+    CHUNK_SIZE = 50000
+    REPORT_LIMIT = 100
+    KEEP_CHECKPOINTS = 5
+    # Transactions committed out of ID order are caught by rescanning this many IDs
+    # below the previous checkpoint and skipping the ones it already counted.
+    ID_OVERLAP = 10000
+
+    @staticmethod
+    def _begin_snapshot():
+        """
+        Make all reads of the current transaction see a single database snapshot.
+        """
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+
+    @classmethod
+    def _minor(cls, column: str) -> str:
+        return f"CAST(ROUND({column} * {cls.MINOR_UNITS}) AS BIGINT)"
+
+    @classmethod
+    def snapshot_balances(cls, chunk_size: int) -> tuple[Ledger, int]:
+        """
+        Read all wallet balances in minor units.
+
+        :param chunk_size: Wallets read per query
+
+        :return: Balances indexed by wallet ID and the number of wallets read
+        :rtype: tuple[Ledger, int]
+        """
+        table = connection.ops.quote_name(Wallet._meta.db_table)
+        balances = Ledger()
+        count = 0
+        last_id = 0
+
+        while True:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT id, {cls._minor('balance')} FROM {table} "
+                    f"WHERE id > %s ORDER BY id LIMIT %s",
+                    [last_id, chunk_size]
+                )
+                rows = cursor.fetchall()
+
+            if not rows:
+                return balances, count
+
+            count += len(rows)
+            last_id = rows[-1][0]
+            balances.grow(last_id + 1)
+            if np is not None:
+                chunk = np.array(rows, dtype=np.int64)
+                balances.values[chunk[:, 0]] = chunk[:, 1]
+            else:
+                for wallet_id, balance in rows:
+                    balances.values[wallet_id] = balance
+
+    @classmethod
+    def stream_transactions(cls, after_id: int, skip_ids: set, chunk_size: int):
+        """
+        Yield completed transactions after an ID in chunks.
+
+        :param after_id: Only transactions with a greater ID are read
+        :param skip_ids: IDs already counted by the previous checkpoint
+        :param chunk_size: Transactions read per query
+        :return: Generator of row chunks ``(id, sender_id, recipient_id, amount, is_commission)``
+        """
+        table = connection.ops.quote_name(Transaction._meta.db_table)
+        sql = (
+            f"SELECT id, COALESCE(sender_id, 0), recipient_id, {cls._minor('amount')}, "
+            f"CASE WHEN transaction_type = %s THEN 1 ELSE 0 END "
+            f"FROM {table} WHERE id > %s AND status = %s ORDER BY id LIMIT %s"
+        )
+
+        while True:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [
+                    TransactionType.COMMISSION.value,
+                    after_id,
+                    Status.COMPLETED.value,
+                    chunk_size
+                ])
+                rows = cursor.fetchall()
+
+            if not rows:
+                return
+
+            after_id = rows[-1][0]
+            if skip_ids:
+                rows = [row for row in rows if row[0] not in skip_ids]
+            if rows:
+                yield rows
+
+    @classmethod
+    def recent_ids(cls, last_id: int) -> array:
+        """
+        Return the completed transaction IDs within the overlap window below an ID.
+
+        :param last_id: Highest transaction ID of the run
+        :return: Transaction IDs
+        :rtype: array
+        """
+        return array('q', Transaction.objects.filter(
+            id__gt=last_id - cls.ID_OVERLAP,
+            id__lte=last_id,
+            status=Status.COMPLETED.value
+        ).values_list('id', flat=True))
+
+    @classmethod
+    def pending_commission(cls) -> int:
+        """
+        Return the commission accrued but not yet settled, in minor units.
+
+        :return: Pending commission
+        :rtype: int
+        """
+        total = sum(CommissionAccrual.objects.values_list('amount', flat=True))
+        return int(total * cls.MINOR_UNITS)
+
+    @classmethod
+    def run(cls, full: bool = False, chunk_size: int = None) -> dict:
+        """
+        Reconcile wallet balances against the transaction ledger and store a checkpoint.
+
+        :param full: Scan the whole history instead of resuming from the last checkpoint
+        :type full: bool
+        :param chunk_size: Rows read per query, defaults to `CHUNK_SIZE`
+        :type chunk_size: int
+        :return: Report with drifted wallets, scanned rows and throughput
+        :rtype: dict
+        """
+        chunk_size = chunk_size or cls.CHUNK_SIZE
+        started = time.perf_counter()
+        checkpoint = None if full else ReconciliationCheckpoint.objects.first()
+
+        if checkpoint:
+            ledger = Ledger(data=zlib.decompress(checkpoint.ledger))
+            skip_ids = set(array('q', zlib.decompress(checkpoint.recent_ids)))
+            after_id = max(checkpoint.last_transaction_id - cls.ID_OVERLAP, 0)
+        else:
+            ledger = Ledger()
+            skip_ids = set()
+            after_id = 0
+
+        scanned = 0
+        commission_rows = 0
+        last_id = checkpoint.last_transaction_id if checkpoint else 0
+
+        with transaction.atomic():
+            cls._begin_snapshot()
+
+            for rows in cls.stream_transactions(after_id, skip_ids, chunk_size):
+                ledger.apply(rows)
+                scanned += len(rows)
+                commission_rows += sum(row[4] for row in rows)
+                last_id = max(last_id, rows[-1][0])
+
+            balances, wallets_checked = cls.snapshot_balances(chunk_size)
+            pending = cls.pending_commission()
+            recent_ids = cls.recent_ids(last_id)
+
+        drifted = ledger.drift(balances, {CommissionService.ADMIN_WALLET_ID: -pending})
+        elapsed = time.perf_counter() - started
+
+        report = [
+            {
+                'wallet_id': wallet_id,
+                'balance': f"{balance / cls.MINOR_UNITS:.2f}",
+                'expected': f"{expected / cls.MINOR_UNITS:.2f}",
+                'drift': f"{(balance - expected) / cls.MINOR_UNITS:.2f}"
+            }
+            for wallet_id, balance, expected in drifted[:cls.REPORT_LIMIT]
+        ]
+
+        saved = ReconciliationCheckpoint.objects.create(
+            last_transaction_id=last_id,
+            transactions_scanned=scanned,
+            wallets_checked=wallets_checked,
+            drifted_count=len(drifted),
+            drifted=report,
+            ledger=zlib.compress(ledger.to_bytes()),
+            recent_ids=zlib.compress(recent_ids.tobytes())
+        )
+        stale = ReconciliationCheckpoint.objects.values_list('id', flat=True)[cls.KEEP_CHECKPOINTS:]
+        ReconciliationCheckpoint.objects.filter(id__in=list(stale)).delete()
+
+        if drifted:
+            logger.warning("Ledger reconciliation found %s drifted wallets", len(drifted))
+
+        return {
+            'checkpoint_id': saved.id,
+            'mode': 'incremental' if checkpoint else 'full',
+            'last_transaction_id': last_id,
+            'transactions_scanned': scanned,
+            'wallets_checked': wallets_checked,
+            'commission_rows': commission_rows,
+            'drifted_count': len(drifted),
+            'drifted': report,
+            'elapsed_s': round(elapsed, 3),
+            'rows_per_s': round(scanned / elapsed, 1) if elapsed else 0.0,
+            'backend': 'numpy' if np is not None else 'array'
+        }
@@ -0,0 +1,207 @@
+"""
+Transaction retention service
+"""
+
+import re
+import time
+
+from datetime import datetime
+from datetime import timezone as dt_timezone
+
+from django.db import connection
+from django.utils import timezone
+
+from apps.wallets.enums.status import Status
+from apps.wallets.models.transaction import Transaction
+
+from src.settings.utils.logging import logger
+
+
+class RetentionService:
+    """
+    Removes old transactions without competing with live transfers.
+
+    Two modes, chosen per run:
+        - Partitioned: when `transactions` is a PostgreSQL table partitioned by range
+          on `created_at`, every partition entirely older than the threshold is detached
+          and dropped, which removes its rows regardless of status without touching
+          the live partitions.
+        - Chunked: completed transactions older than the threshold are deleted with raw
+          `DELETE` statements of at most `batch_size` rows, each committed on its own,
+          with a pause between chunks. Rows are never loaded into Python.
+
+    Partitioned mode expects the table to have been converted by a DBA to
+    `PARTITION BY RANGE (created_at)` with a primary key of `(id, created_at)`;
+    `create_partitions` then keeps monthly partitions ahead of time.
+    """
+
+    PARTITION_UPPER_BOUND = re.compile(r"TO \('([^']+)'\)")
+
+    @staticmethod
+    def table() -> str:
+        return Transaction._meta.db_table
+
+    @classmethod
+    def is_partitioned(cls) -> bool:
+        """
+        Check whether the transactions table is a partitioned PostgreSQL table.
+
+        :return: True if the table is partitioned
+        :rtype: bool
+        """
+        if connection.vendor != 'postgresql':
+            return False
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+                [cls.table()]
+            )
+            return cursor.fetchone() is not None
+
+    @classmethod
+    def partitions(cls) -> list[tuple]:
+        """
+        List range partitions of the transactions table with their exclusive upper bound.
+
+        The default partition, if any, is not listed.
+
+        :return: Tuples of (partition name, upper bound)
+        :rtype: list[tuple]
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+                FROM pg_inherits
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE pg_inherits.inhparent = to_regclass(%s)
+                """,
+                [cls.table()]
+            )
+            rows = cursor.fetchall()
+
+        partitions = []
+        for name, bound in rows:
+            match = cls.PARTITION_UPPER_BOUND.search(bound or '')
+            if match:
+                partitions.append((name, datetime.fromisoformat(match.group(1))))
+        return sorted(partitions, key=lambda partition: partition[1])
+
+    @classmethod
+    def drop_partitions(cls, threshold: datetime) -> list[str]:
+        """
+        Detach and drop every partition whose rows are all older than the threshold.
+
+        :param threshold: Retention threshold
+        :return: Names of the dropped partitions
+        :rtype: list[str]
+        """
+        dropped = []
+        for name, upper_bound in cls.partitions():
+            if upper_bound > threshold:
+                break
+
+            quoted = connection.ops.quote_name(name)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"ALTER TABLE {connection.ops.quote_name(cls.table())} DETACH PARTITION {quoted}" # noqa
+                )
+                cursor.execute(f"DROP TABLE {quoted}")
+            dropped.append(name)
+            logger.info("Dropped transaction partition %s (rows before %s)", name, upper_bound)
+        return dropped
+
+    @classmethod
+    def create_partitions(cls, months_ahead: int = 3) -> list[str]:
+        """
+        Create missing monthly partitions from the current month on.
+
+        :param months_ahead: Number of months after the current one to cover
+        :return: Names of the created partitions
+        :rtype: list[str]
+        """
+        if not cls.is_partitioned():
+            return []
+
+        now = timezone.now().astimezone(dt_timezone.utc)
+        existing = {name for name, _ in cls.partitions()}
+        created = []
+
+        year, month = now.year, now.month
+        for _ in range(months_ahead + 1):
+            next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+            name = f"{cls.table()}_p{year:04d}{month:02d}"
+
+            if name not in existing:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f"CREATE TABLE IF NOT EXISTS {connection.ops.quote_name(name)} "
+                        f"PARTITION OF {connection.ops.quote_name(cls.table())} "
+                        f"FOR VALUES FROM ('{year:04d}-{month:02d}-01 00:00:00+00') "
+                        f"TO ('{next_year:04d}-{next_month:02d}-01 00:00:00+00')"
+                    )
+                created.append(name)
+
+            year, month = next_year, next_month
+        return created
+
+    @classmethod
+    def delete_in_chunks(cls, threshold: datetime, batch_size: int, throttle: float) -> int:
+        """
+        Delete completed transactions older than the threshold in small committed chunks.
+
+        :param threshold: Retention threshold
+        :param batch_size: Maximum number of rows per DELETE statement
+        :param throttle: Seconds to sleep between chunks
+        :return: Number of deleted rows
+        :rtype: int
+        """
+        table = connection.ops.quote_name(cls.table())
+        sql = (
+            f"DELETE FROM {table} WHERE id IN ("
+            f"SELECT id FROM {table} WHERE created_at < %s AND status = %s "
+            f"ORDER BY id LIMIT %s)"
+        )
+
+        deleted = 0
+        while True:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [threshold, Status.COMPLETED.value, batch_size])
+                chunk = cursor.rowcount
+            deleted += chunk
+
+            if chunk < batch_size:
+                return deleted
+            if throttle:
+                time.sleep(throttle)
+
+    @classmethod
+    def purge(cls, threshold: datetime, batch_size: int, throttle: float) -> dict:
+        """
+        Remove transactions older than the threshold using the best available mode.
+
+        :param threshold: Retention threshold
+        :param batch_size: Maximum number of rows per DELETE statement
+        :param throttle: Seconds to sleep between chunks
+        :return: Report with mode, dropped partitions, deleted rows and rows per second
+        :rtype: dict
+        """
+        started = time.perf_counter()
+
+        dropped = []
+        mode = 'chunked'
+        if cls.is_partitioned():
+            mode = 'partitioned'
+            dropped = cls.drop_partitions(threshold)
+
+        deleted_count = cls.delete_in_chunks(threshold, batch_size, throttle)
+        elapsed = time.perf_counter() - started
+
+        return {
+            'mode': mode,
+            'dropped_partitions': dropped,
+            'deleted_count': deleted_count,
+            'elapsed_s': round(elapsed, 3),
+            'rows_per_s': round(deleted_count / elapsed, 1) if elapsed else 0.0
+        }
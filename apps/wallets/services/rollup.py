@@ -0,0 +1,238 @@
+"""
+Wallet rollup service
+"""
+
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+
+from decimal import Decimal
+
+from django.db.models import Sum
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+
+from apps.wallets.enums.status import Status
+from apps.wallets.enums.transaction import TransactionType
+from apps.wallets.models.rollup import WalletDailyRollup
+from apps.wallets.models.transaction import Transaction
+
+
+class RollupService:
+    """
+    Maintains per-wallet daily totals so statistics never scan `transactions`.
+
+    Features:
+        - Transfers add to the rollups of the sender and the recipient with one
+          ``INSERT ... ON CONFLICT DO UPDATE`` statement per transfer or batch, in the
+          same transaction as the balance update. The wallet rows are locked at that
+          point, so rollup rows are written without extra contention.
+        - Commissions reach the admin wallet rollup when they are settled, the moment
+          they are credited to its balance, so transfers never write the admin row.
+        - `backfill` rebuilds the rollups of past days from the transaction history.
+
+    Days are calendar days in `TIME_ZONE`.
+    """
+
+    FIELDS = ('inflow', 'outflow', 'commission_paid', 'transfers_in', 'transfers_out')
+    BACKFILL_CHUNK_DAYS = 7
+    MAX_STATS_DAYS = 366
+
+    @staticmethod
+    def empty() -> list:
+        return [Decimal('0'), Decimal('0'), Decimal('0'), 0, 0]
+
+    @classmethod
+    def add_transfer(
+        cls,
+        totals: dict,
+        sender_id: int,
+        recipient_id: int,
+        amount: Decimal,
+        commission: Decimal
+    ) -> dict:
+        """
+        Add one transfer to per-wallet totals.
+
+        :param totals: Lists of (inflow, outflow, commission_paid, transfers_in, transfers_out)
+            by wallet ID, updated in place
+        :param sender_id: ID of the sending wallet
+        :param recipient_id: ID of the receiving wallet
+        :param amount: Amount transferred
+        :param commission: Commission paid by the sender
+        :return: The updated totals
+        :rtype: dict
+        """
+        sender = totals.setdefault(sender_id, cls.empty())
+        sender[1] += amount
+        sender[2] += commission
+        sender[4] += 1
+
+        recipient = totals.setdefault(recipient_id, cls.empty())
+        recipient[0] += amount
+        recipient[3] += 1
+        return totals
+
+    @classmethod
+    def record(cls, totals: dict, day: date = None):
+        """
+        Add per-wallet totals to the rollups of a day in one upsert.
+
+        :param totals: Totals by wallet ID, see `add_transfer`
+        :type totals: dict
+        :param day: Day of the rollups, today by default
+        :type day: date
+        """
+        if not totals:
+            return
+
+        ops = connection.ops
+        table = ops.quote_name(WalletDailyRollup._meta.db_table)
+        day = ops.adapt_datefield_value(day or timezone.localdate())
+        now = ops.adapt_datetimefield_value(timezone.now())
+
+        params = []
+        for wallet_id, (inflow, outflow, commission, transfers_in, transfers_out) in sorted(totals.items()): # noqa
+            params.extend((
+                wallet_id,
+                day,
+                ops.adapt_decimalfield_value(inflow, 14, 2),
+                ops.adapt_decimalfield_value(outflow, 14, 2),
+                ops.adapt_decimalfield_value(commission, 14, 2),
+                transfers_in,
+                transfers_out,
+                now,
+                now
+            ))
+
+        columns = ('wallet_id', 'day') + cls.FIELDS + ('created_at', 'updated_at')
+        values = ', '.join(['(' + ', '.join(['%s'] * len(columns)) + ')'] * len(totals))
+        increments = ', '.join(f"{field} = {table}.{field} + EXCLUDED.{field}" for field in cls.FIELDS) # noqa
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES {values} "
+                f"ON CONFLICT (wallet_id, day) DO UPDATE SET {increments}, "
+                f"updated_at = EXCLUDED.updated_at",
+                params
+            )
+
+    @classmethod
+    def backfill(cls, date_from: date, date_to: date) -> dict:
+        """
+        Rebuild the rollups of a range of days from completed transactions.
+
+        Each chunk of `BACKFILL_CHUNK_DAYS` days is replaced in its own transaction.
+        Commission rows are counted as admin inflow on the day they were charged.
+        Rebuilding today while transfers run loses their increments, so backfill
+        complete days only.
+
+        :param date_from: First day to rebuild
+        :param date_to: Day after the last day to rebuild
+        :return: Number of days and rollup rows written
+        :rtype: dict
+        """
+        rows_written = 0
+        chunk_start = date_from
+
+        while chunk_start < date_to:
+            chunk_end = min(chunk_start + timedelta(days=cls.BACKFILL_CHUNK_DAYS), date_to)
+            rows_written += cls._backfill_chunk(chunk_start, chunk_end)
+            chunk_start = chunk_end
+
+        return {'days': (date_to - date_from).days, 'rows': rows_written}
+
+    @classmethod
+    def _backfill_chunk(cls, date_from: date, date_to: date) -> int:
+        tz = timezone.get_current_timezone()
+        completed = Transaction.objects.filter(
+            status=Status.COMPLETED.value,
+            created_at__gte=datetime.combine(date_from, datetime.min.time(), tz),
+            created_at__lt=datetime.combine(date_to, datetime.min.time(), tz)
+        ).annotate(day=TruncDate('created_at'))
+
+        transfers = completed.filter(transaction_type=TransactionType.TRANSFER.value)
+        commissions = completed.filter(transaction_type=TransactionType.COMMISSION.value)
+
+        totals = {}
+        # (queryset, wallet field, amount slot, count slot)
+        for queryset, field, amount_slot, count_slot in (
+            (transfers, 'sender_id', 1, 4),
+            (transfers, 'recipient_id', 0, 3),
+            (commissions, 'sender_id', 2, None),
+            (commissions, 'recipient_id', 0, None),
+        ):
+            grouped = (
+                queryset.exclude(**{field: None})
+                .values(field, 'day')
+                .annotate(total=Sum('amount'), count=Count('id'))
+                .order_by()
+            )
+            for row in grouped:
+                slots = totals.setdefault((row[field], row['day']), cls.empty())
+                slots[amount_slot] += row['total']
+                if count_slot is not None:
+                    slots[count_slot] += row['count']
+
+        with transaction.atomic():
+            WalletDailyRollup.objects.filter(day__gte=date_from, day__lt=date_to).delete()
+            WalletDailyRollup.objects.bulk_create(
+                [
+                    WalletDailyRollup(
+                        wallet_id=wallet_id,
+                        day=day,
+                        **dict(zip(cls.FIELDS, slots))
+                    )
+                    for (wallet_id, day), slots in sorted(totals.items())
+                ],
+                batch_size=1000
+            )
+        return len(totals)
+
+    @classmethod
+    def summarize(cls, rows: list[dict]) -> dict:
+        totals = {field: 0 for field in cls.FIELDS}
+        for row in rows:
+            for field in cls.FIELDS:
+                totals[field] += row[field]
+        return totals
+
+    @classmethod
+    def wallet_stats(cls, wallet_id: int, date_from: date, date_to: date) -> dict:
+        """
+        Read the daily statistics of a wallet from its rollups.
+
+        :param wallet_id: Wallet ID
+        :param date_from: First day, inclusive
+        :param date_to: Last day, inclusive
+        :return: Totals over the range and one entry per day with activity
+        :rtype: dict
+        """
+        days = list(
+            WalletDailyRollup.objects.filter(
+                wallet_id=wallet_id,
+                day__gte=date_from,
+                day__lte=date_to
+            ).order_by('day').values('day', *cls.FIELDS)
+        )
+        return {'totals': cls.summarize(days), 'days': days}
+
+    @classmethod
+    def daily_totals(cls, date_from: date, date_to: date) -> list[dict]:
+        """
+        Sum the rollups of all wallets per day.
+
+        :param date_from: First day, inclusive
+        :param date_to: Last day, inclusive
+        :return: One entry per day with activity, oldest first
+        :rtype: list[dict]
+        """
+        return list(
+            WalletDailyRollup.objects.filter(day__gte=date_from, day__lte=date_to)
+            .values('day')
+            .annotate(**{field: Sum(field) for field in cls.FIELDS})
+            .order_by('day')
+        )
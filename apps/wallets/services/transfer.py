@@ -5,14 +5,36 @@ Transfer service
 import uuid
 
 from decimal import Decimal
+from decimal import ROUND_HALF_UP
+
+from asgiref.sync import sync_to_async
 
 from django.db.models import F
+from django.db.models import Case
+from django.db.models import When
+from django.db.models import Value
+from django.db.models import DecimalField
+from django.db import connection
 from django.db import transaction
 
 from apps.wallets.models.wallet import Wallet
+from apps.wallets.enums.engine import TransferEngine
 from apps.wallets.models.transaction import Transaction
-from apps.wallets.tasks.notify import send_notification
+from apps.wallets.services.commission import CommissionService
+from apps.wallets.services.cache import WalletCacheService
+from apps.wallets.services.outbox import OutboxService
+from apps.wallets.services.rollup import RollupService
+from apps.wallets.services.hot_wallet import HotWalletService
+from apps.wallets.services.metrics import BATCH
+from apps.wallets.services.metrics import SINGLE
+from apps.wallets.services.metrics import PhaseTimer
+from apps.wallets.services.metrics import TransferMetrics
+from apps.wallets.exceptions.transfer import WalletNotFoundError
+from apps.wallets.exceptions.transfer import WalletOwnershipError
+from apps.wallets.exceptions.transfer import InsufficientFundsError
+from apps.wallets.exceptions.transfer import InsufficientFundsForCommissionError
 
+from src.settings.config.config import config
 from src.settings.utils.logging import logger
 
 
@@ -22,13 +44,227 @@ class TransferService:
 
     Features:
         - Atomic transactions with race condition protection.
-        - Commission applied for large transfers.
-        - Async notification sent after successful transfer.
+        - Commission applied for large transfers, accrued without locking the admin wallet.
+        - Async notification published through the transactional outbox.
+        - Batch execution of many transfers in a single database transaction.
+        - New balances written through to `WalletCacheService` after commit.
+        - Per-wallet daily totals maintained by `RollupService` in the same transaction.
+        - Transfers touching a hot wallet applied in micro-batches by `HotWalletService`.
     """
 
     COMMISSION_THRESHOLD = Decimal('1000.00')
     COMMISSION_RATE = Decimal('0.10')  # 10%
-    ADMIN_WALLET_ID = 1
+    ADMIN_WALLET_ID = CommissionService.ADMIN_WALLET_ID
+    MAX_BATCH_SIZE = 1000
+    DEBIT_RETRIES = 3
+
+    @classmethod
+    def calculate_commission(cls, amount: Decimal) -> Decimal:
+        """
+        Calculate the commission charged for a transfer of the given amount.
+
+        :param amount: Amount to transfer
+        :type amount: Decimal
+        :return: Commission amount rounded to cents (zero below the threshold)
+        :rtype: Decimal
+        """
+        if amount > cls.COMMISSION_THRESHOLD:
+            return (amount * cls.COMMISSION_RATE).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP) # noqa
+        return Decimal('0')
+
+    @staticmethod
+    def check_funds(balance: Decimal, amount: Decimal, total_debit: Decimal):
+        """
+        Ensure a sender balance covers the transfer amount and its commission.
+
+        :param balance: Current balance of the sending wallet
+        :param amount: Amount to transfer
+        :param total_debit: Amount plus commission
+        :raises InsufficientFundsError: If the balance is insufficient
+        """
+        if balance < amount:
+            raise InsufficientFundsError(f"Insufficient funds. Available: {balance}, Required: {amount}") # noqa
+
+        if balance < total_debit:
+            raise InsufficientFundsForCommissionError(
+                f"Insufficient funds including commission. Available: {balance}, Required: {total_debit}" # noqa
+            )
+
+    @staticmethod
+    def check_wallets(sender, recipient, owner_id: int = None):
+        """
+        Ensure the locked sender and recipient exist and the sender belongs to the owner.
+
+        :param sender: Locked sender wallet, or None if it does not exist
+        :param recipient: Locked recipient wallet, or None if it does not exist
+        :param owner_id: If given, ID of the user the sender wallet must belong to
+        :raises WalletNotFoundError: If a wallet does not exist
+        :raises WalletOwnershipError: If the sender wallet belongs to another user
+        """
+        if sender is None:
+            raise WalletNotFoundError("Source wallet does not exist")
+
+        if recipient is None:
+            raise WalletNotFoundError("Destination wallet does not exist")
+
+        if owner_id is not None and sender.user_id != owner_id:
+            raise WalletOwnershipError("Source wallet does not belong to the current user")
+
+    @classmethod
+    def _apply_locking(
+        cls,
+        sender_id: int,
+        recipient_id: int,
+        amount: Decimal,
+        total_debit: Decimal,
+        owner_id: int,
+        timer: PhaseTimer
+    ) -> dict:
+        """
+        Move balances after locking both wallets and checking funds in Python.
+
+        :return: New (balance, version) of both wallets by wallet ID
+        :rtype: dict
+        """
+        wallet_ids = sorted([sender_id, recipient_id])
+        locked_wallets = {
+            w.id: w for w in Wallet.objects.select_for_update().filter(id__in=wallet_ids) # noqa
+        }
+        timer.mark('lock')
+
+        sender = locked_wallets.get(sender_id)
+        recipient = locked_wallets.get(recipient_id)
+
+        cls.check_wallets(sender, recipient, owner_id)
+        cls.check_funds(sender.balance, amount, total_debit)
+        timer.mark('check')
+
+        Wallet.objects.filter(id=sender_id).update(balance=F('balance') - total_debit, version=F('version') + 1) # noqa
+        Wallet.objects.filter(id=recipient_id).update(balance=F('balance') + amount, version=F('version') + 1) # noqa
+
+        return {
+            sender_id: (sender.balance - total_debit, sender.version + 1),
+            recipient_id: (recipient.balance + amount, recipient.version + 1)
+        }
+
+    @classmethod
+    def _apply_optimistic(
+        cls,
+        sender_id: int,
+        recipient_id: int,
+        amount: Decimal,
+        total_debit: Decimal,
+        owner_id: int,
+        timer: PhaseTimer
+    ) -> dict:
+        """
+        Move balances with conditional updates and no prior reads.
+
+        Rows are updated in ascending ID order, like the locking engine locks them,
+        so opposite transfers between two wallets cannot deadlock. Locking and the
+        balance check happen inside the debit statement, so they are timed as writes.
+
+        :return: New (balance, version) of both wallets by wallet ID, None where unknown
+        :rtype: dict
+        """
+        if recipient_id < sender_id:
+            credited = cls._credit(recipient_id, amount)
+            debited = cls._debit(sender_id, amount, total_debit, owner_id)
+        else:
+            debited = cls._debit(sender_id, amount, total_debit, owner_id)
+            credited = cls._credit(recipient_id, amount)
+
+        return {sender_id: debited, recipient_id: credited}
+
+    @classmethod
+    def _credit(cls, recipient_id: int, amount: Decimal):
+        """
+        Credit a wallet, using `UPDATE ... RETURNING` where the backend supports it.
+
+        :raises WalletNotFoundError: If the wallet does not exist
+        :return: New balance and version of the wallet, or None if the backend cannot return them
+        :rtype: tuple | None
+        """
+        if connection.features.can_return_columns_from_insert:
+            table = connection.ops.quote_name(Wallet._meta.db_table)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"UPDATE {table} SET balance = balance + %s, version = version + 1 "
+                    f"WHERE id = %s RETURNING balance, version",
+                    [amount, recipient_id]
+                )
+                row = cursor.fetchone()
+            if row is None:
+                raise WalletNotFoundError("Destination wallet does not exist")
+            return Decimal(str(row[0])), row[1]
+
+        if not Wallet.objects.filter(id=recipient_id).update(balance=F('balance') + amount, version=F('version') + 1): # noqa
+            raise WalletNotFoundError("Destination wallet does not exist")
+        return None
+
+    @classmethod
+    def _debit(cls, sender_id: int, amount: Decimal, total_debit: Decimal, owner_id: int = None):
+        """
+        Debit a wallet only if it holds enough funds, in one statement.
+
+        Uses `UPDATE ... RETURNING` where the backend supports it, so the new balance
+        comes back in the same round trip. When no row is updated, the wallet is read
+        to report why. If that read shows enough funds, a concurrent write got in
+        between and the debit is tried again, up to `DEBIT_RETRIES` times; the last
+        read locks the wallet row, so the debit after it cannot miss.
+
+        :return: New balance and version of the wallet, or None if the backend cannot return them
+        :rtype: tuple | None
+        """
+        for attempt in range(cls.DEBIT_RETRIES + 2):
+            debited = cls._conditional_debit(sender_id, total_debit, owner_id)
+            if debited is not False:
+                return debited
+
+            sender = Wallet.objects.filter(id=sender_id).only('id', 'user', 'balance')
+            if attempt >= cls.DEBIT_RETRIES:
+                sender = sender.select_for_update()
+            sender = sender.first()
+            if sender is None:
+                raise WalletNotFoundError("Source wallet does not exist")
+            if owner_id is not None and sender.user_id != owner_id:
+                raise WalletOwnershipError("Source wallet does not belong to the current user")
+
+            cls.check_funds(sender.balance, amount, total_debit)
+
+        raise RuntimeError(f"Debit of wallet {sender_id} kept failing on a locked row")
+
+    @staticmethod
+    def _conditional_debit(sender_id: int, total_debit: Decimal, owner_id: int = None):
+        """
+        Run the conditional debit statement once.
+
+        :return: New balance and version, None if debited but the backend cannot
+            return them, or False if no row matched
+        :rtype: tuple | None | bool
+        """
+        if connection.features.can_return_columns_from_insert:
+            table = connection.ops.quote_name(Wallet._meta.db_table)
+            sql = (
+                f"UPDATE {table} SET balance = balance - %s, version = version + 1 "
+                f"WHERE id = %s AND balance >= %s"
+            )
+            params = [total_debit, sender_id, total_debit]
+            if owner_id is not None:
+                sql += " AND user_id = %s"
+                params.append(owner_id)
+
+            with connection.cursor() as cursor:
+                cursor.execute(sql + " RETURNING balance, version", params)
+                row = cursor.fetchone()
+            return (Decimal(str(row[0])), row[1]) if row else False
+
+        debited = Wallet.objects.filter(id=sender_id, balance__gte=total_debit)
+        if owner_id is not None:
+            debited = debited.filter(user_id=owner_id)
+        if debited.update(balance=F('balance') - total_debit, version=F('version') + 1):
+            return None
+        return False
 
     @classmethod
     def execute_transfer(
@@ -36,53 +272,163 @@ class TransferService:
         sender_id: int,
         recipient_id: int,
         amount: Decimal,
-        description: str = ''
+        description: str = '',
+        owner_id: int = None
     ) -> dict:
 
         """
         Perform an atomic wallet-to-wallet transfer with optional commission.
 
-        Prevents double-spending using `select_for_update` and schedules an async notification.
+        Prevents double-spending with the engine selected by `TRANSFER_ENGINE`:
+            - `locking`: `select_for_update` on the sender and recipient, then `F()` updates.
+            - `optimistic`: a single conditional debit `UPDATE ... WHERE balance >= total`,
+              with zero updated rows meaning insufficient funds.
+
+        The commission is added to a sharded accrual row that is settled into the admin
+        wallet periodically. A notification event is written to the outbox in the
+        same transaction. Phase timings, the outcome and rejection reasons are
+        recorded by `TransferMetrics`.
+
+        Outside a transaction, a transfer touching a hot wallet is handed to the
+        single writer of that wallet by `HotWalletService` and its result awaited.
 
         :param sender_id: ID of the sending wallet
         :param recipient_id: ID of the receiving wallet
         :param amount: Amount to transfer
         :param description: Optional transaction description
-        :raises ValueError: If wallets not found or insufficient funds
+        :param owner_id: If given, ID of the user the sender wallet must belong to
+        :raises TransferValidationError: If wallets not found or not owned by owner_id
+        :raises InsufficientFundsError: If insufficient funds
+        :raises HotWalletQueueError: If a hot wallet queue did not answer in time
         :return: Transfer details including transaction ID, group, amount, commission, and total debited
         :rtype: dict
         """
+        hot_wallet_id = None if connection.in_atomic_block else HotWalletService.route(sender_id, recipient_id) # noqa
+        if hot_wallet_id is not None:
+            result = HotWalletService.submit(
+                hot_wallet_id,
+                sender_id,
+                recipient_id,
+                amount,
+                description,
+                owner_id
+            )
+            if result is not None:
+                return result
 
-        with transaction.atomic():
-            wallet_ids = sorted([sender_id, recipient_id, cls.ADMIN_WALLET_ID])
-            locked_wallets = {
-                w.id: w for w in Wallet.objects.select_for_update().filter(id__in=wallet_ids) # noqa
-            }
+        return cls._direct_transfer(sender_id, recipient_id, amount, description, owner_id)
+
+    @classmethod
+    def _direct_transfer(
+        cls,
+        sender_id: int,
+        recipient_id: int,
+        amount: Decimal,
+        description: str,
+        owner_id: int
+    ) -> dict:
+        """
+        Run a transfer in this process, without hot wallet routing, and record
+        its metrics, see `execute_transfer`.
+        """
+        commission_amount = cls.calculate_commission(amount)
+        engine = TransferEngine(config.wallet.TRANSFER_ENGINE)
+        timer = TransferMetrics.timer(engine.value)
 
-            sender = locked_wallets.get(sender_id)
-            recipient = locked_wallets.get(recipient_id)
+        try:
+            result = cls._execute_transfer(
+                sender_id,
+                recipient_id,
+                amount,
+                commission_amount,
+                description,
+                owner_id,
+                engine,
+                timer
+            )
+        except ValueError as e:
+            TransferMetrics.rejected(e)
+            raise
 
-            if not sender or not recipient:
-                raise ValueError("Wallet not found")
+        timer.mark('commit')
+        TransferMetrics.completed(
+            timer,
+            SINGLE,
+            1,
+            commission_amount,
+            1 if commission_amount > 0 else 0
+        )
+        return result
 
-            if sender.balance < amount:
-                raise ValueError(f"Insufficient funds. Available: {sender.balance}, Required: {amount}")
+    @classmethod
+    async def aexecute_transfer(
+        cls,
+        sender_id: int,
+        recipient_id: int,
+        amount: Decimal,
+        description: str = '',
+        owner_id: int = None
+    ) -> dict:
+        """
+        Async variant of `execute_transfer`.
 
-            commission_amount = Decimal('0')
-            if amount > cls.COMMISSION_THRESHOLD:
-                commission_amount = amount * cls.COMMISSION_RATE
+        Django transactions are sync-only, so the whole transfer runs in a single
+        hop to the request's database thread instead of one hop per query. Waiting
+        for a hot wallet queue runs in a thread of its own, so it never holds up
+        the database thread; if the queue is unavailable, the transfer is applied
+        directly without being routed again.
 
-            total_debit = amount + commission_amount
+        :raises TransferValidationError: If wallets not found or not owned by owner_id
+        :raises InsufficientFundsError: If insufficient funds
+        :return: Transfer details, see `execute_transfer`
+        :rtype: dict
+        """
+        hot_wallet_id = HotWalletService.route(sender_id, recipient_id)
+        if hot_wallet_id is not None:
+            result = await sync_to_async(HotWalletService.submit, thread_sensitive=False)(
+                hot_wallet_id,
+                sender_id,
+                recipient_id,
+                amount,
+                description,
+                owner_id
+            )
+            if result is not None:
+                return result
 
-            if sender.balance < total_debit:
-                raise ValueError(
-                    f"Insufficient funds including commission. Available: {sender.balance}, Required: {total_debit}" # noqa
-                )
+        return await sync_to_async(cls._direct_transfer)(
+            sender_id,
+            recipient_id,
+            amount,
+            description,
+            owner_id
+        )
 
-            transaction_group_id = uuid.uuid4()
+    @classmethod
+    def _execute_transfer(
+        cls,
+        sender_id: int,
+        recipient_id: int,
+        amount: Decimal,
+        commission_amount: Decimal,
+        description: str,
+        owner_id: int,
+        engine: TransferEngine,
+        timer: PhaseTimer
+    ) -> dict:
+        """
+        Run a single transfer in its own transaction, see `execute_transfer`.
+        """
+        total_debit = amount + commission_amount
 
-            Wallet.objects.filter(id=sender_id).update(balance=F('balance') - total_debit) # noqa
-            Wallet.objects.filter(id=recipient_id).update(balance=F('balance') + amount) # noqa
+        with transaction.atomic():
+            if engine is TransferEngine.OPTIMISTIC:
+                states = cls._apply_optimistic(sender_id, recipient_id, amount, total_debit, owner_id, timer) # noqa
+            else:
+                states = cls._apply_locking(sender_id, recipient_id, amount, total_debit, owner_id, timer) # noqa
+            WalletCacheService.on_commit(states)
+
+            transaction_group_id = uuid.uuid4()
 
             main_transaction = Transaction.objects.create(
                 sender_id=sender_id,
@@ -95,10 +441,10 @@ class TransferService:
             )
 
             if commission_amount > 0:
-                admin_wallet = locked_wallets.get(cls.ADMIN_WALLET_ID)
-                if admin_wallet:
-                    Wallet.objects.filter(id=cls.ADMIN_WALLET_ID).update(
-                        balance=F('balance') + commission_amount
+                if CommissionService.admin_wallet_exists():
+                    CommissionService.accrue(
+                        CommissionService.shard_for(sender_id),
+                        commission_amount
                     )
 
                     Transaction.objects.create(
@@ -111,19 +457,37 @@ class TransferService:
                         description=f'Commission for transfer {transaction_group_id}' # noqa
                     )
 
+            RollupService.record(RollupService.add_transfer(
+                {},
+                sender_id,
+                recipient_id,
+                amount,
+                commission_amount
+            ))
+
             logger.info(
-                f"Transfer completed: {amount} from wallet {sender_id} "
-                f"to wallet {recipient_id}, commission: {commission_amount}"
+                "Transfer completed: %s from wallet %s to wallet %s, commission: %s",
+                amount,
+                sender_id,
+                recipient_id,
+                commission_amount,
+                extra={
+                    'event': 'transfer.completed',
+                    'sender_id': sender_id,
+                    'recipient_id': recipient_id,
+                    'transaction_group': transaction_group_id
+                }
             )
 
-            transaction.on_commit(
-                lambda: send_notification.delay(
+            OutboxService.record([
+                OutboxService.transfer_completed(
                     recipient_id,
                     amount,
                     sender_id,
-                    str(transaction_group_id)
+                    transaction_group_id
                 )
-            )
+            ])
+            timer.mark('write')
 
             return {
                 'success': True,
@@ -133,3 +497,195 @@ class TransferService:
                 'commission': str(commission_amount),
                 'total_debited': str(total_debit)
             }
+
+    @classmethod
+    def execute_batch(
+        cls,
+        transfers: list[dict],
+        atomic: bool = True,
+        owner_id: int = None
+    ) -> dict:
+        """
+        Perform many wallet-to-wallet transfers in a single database transaction.
+
+        All senders and recipients are locked once, in ascending ID order, and every transfer
+        is validated against the running in-memory balances in request order. Balance
+        changes are then applied with a single set-based `UPDATE`, commissions with one
+        accrual update per shard, and all transaction rows with one `bulk_create`.
+
+        With ``atomic=True`` the first failing transfer aborts the whole batch.
+        With ``atomic=False`` failing transfers are reported per item and leave no
+        trace, while the remaining transfers are committed.
+
+        :param transfers: Transfers with sender_id, recipient_id, amount, optional description
+            and optional owner_id overriding `owner_id` for that transfer
+        :type transfers: list[dict]
+        :param atomic: Whether the batch is all-or-nothing
+        :type atomic: bool
+        :param owner_id: If given, ID of the user every sender wallet must belong to
+        :type owner_id: int
+        :raises ValueError: In atomic mode, if any transfer fails validation
+        :return: Batch summary with per-item results in request order
+        :rtype: dict
+        """
+        if len(transfers) > cls.MAX_BATCH_SIZE:
+            raise ValueError(f"Batch size exceeds the limit of {cls.MAX_BATCH_SIZE} transfers")
+
+        timer = TransferMetrics.timer(TransferEngine.LOCKING.value)
+        commission_total = Decimal('0')
+        charged = 0
+
+        with transaction.atomic():
+            wallet_ids = set()
+            for item in transfers:
+                wallet_ids.update((item['sender_id'], item['recipient_id']))
+
+            locked_wallets = {
+                w.id: w for w in Wallet.objects.select_for_update()
+                .filter(id__in=wallet_ids)
+                .order_by('id')
+                .only('id', 'user', 'balance', 'version')
+            }
+            timer.mark('lock')
+            balances = {wallet_id: w.balance for wallet_id, w in locked_wallets.items()}
+            admin_exists = None
+
+            deltas = {}
+            accruals = {}
+            rollups = {}
+            rows = []
+            results = []
+            applied = []
+
+            for index, item in enumerate(transfers):
+                sender_id = item['sender_id']
+                recipient_id = item['recipient_id']
+                amount = item['amount']
+
+                try:
+                    cls.check_wallets(
+                        locked_wallets.get(sender_id),
+                        locked_wallets.get(recipient_id),
+                        item.get('owner_id', owner_id)
+                    )
+
+                    commission_amount = cls.calculate_commission(amount)
+                    total_debit = amount + commission_amount
+
+                    cls.check_funds(balances[sender_id], amount, total_debit)
+                except ValueError as e:
+                    TransferMetrics.rejected(e)
+                    if atomic:
+                        raise ValueError(f"Transfer #{index}: {e}")
+                    results.append({
+                        'success': False,
+                        'index': index,
+                        'error': str(e),
+                        'reason': getattr(e, 'reason', 'invalid')
+                    })
+                    continue
+
+                transaction_group_id = uuid.uuid4()
+
+                credited_commission = Decimal('0')
+                if commission_amount > 0:
+                    commission_total += commission_amount
+                    charged += 1
+                    if admin_exists is None:
+                        admin_exists = CommissionService.admin_wallet_exists()
+                    if admin_exists:
+                        credited_commission = commission_amount
+                        shard = CommissionService.shard_for(sender_id)
+                        accruals[shard] = accruals.get(shard, Decimal('0')) + commission_amount
+
+                for wallet_id, delta in ((sender_id, -total_debit), (recipient_id, amount)):
+                    balances[wallet_id] += delta
+                    deltas[wallet_id] = deltas.get(wallet_id, Decimal('0')) + delta
+                RollupService.add_transfer(rollups, sender_id, recipient_id, amount, commission_amount) # noqa
+
+                main_transaction = Transaction(
+                    sender_id=sender_id,
+                    recipient_id=recipient_id,
+                    amount=amount,
+                    transaction_type='transfer',
+                    status='completed',
+                    transaction_group=transaction_group_id,
+                    description=item.get('description', '')
+                )
+                rows.append(main_transaction)
+
+                if credited_commission > 0:
+                    rows.append(Transaction(
+                        sender_id=sender_id,
+                        recipient_id=cls.ADMIN_WALLET_ID,
+                        amount=credited_commission,
+                        transaction_type='commission',
+                        status='completed',
+                        transaction_group=transaction_group_id,
+                        description=f'Commission for transfer {transaction_group_id}' # noqa
+                    ))
+
+                result = {
+                    'success': True,
+                    'index': index,
+                    'transaction_group': str(transaction_group_id),
+                    'amount': str(amount),
+                    'commission': str(commission_amount),
+                    'total_debited': str(total_debit)
+                }
+                results.append(result)
+                applied.append((result, main_transaction, item))
+
+            timer.mark('check')
+
+            deltas = {wallet_id: delta for wallet_id, delta in deltas.items() if delta}
+            if deltas:
+                Wallet.objects.filter(id__in=deltas).update(
+                    balance=F('balance') + Case(
+                        *[When(id=wallet_id, then=Value(delta)) for wallet_id, delta in deltas.items()], # noqa
+                        output_field=DecimalField(max_digits=12, decimal_places=2)
+                    ),
+                    version=F('version') + 1
+                )
+                WalletCacheService.on_commit({
+                    wallet_id: (balances[wallet_id], locked_wallets[wallet_id].version + 1)
+                    for wallet_id in deltas
+                })
+
+            for shard, commission_amount in sorted(accruals.items()):
+                CommissionService.accrue(shard, commission_amount)
+
+            RollupService.record(rollups)
+
+            Transaction.objects.bulk_create(rows)
+
+            events = []
+            for result, main_transaction, item in applied:
+                result['transaction_id'] = main_transaction.id
+                events.append(OutboxService.transfer_completed(
+                    item['recipient_id'],
+                    item['amount'],
+                    item['sender_id'],
+                    result['transaction_group']
+                ))
+
+            OutboxService.record(events)
+            timer.mark('write')
+
+            succeeded = len(applied)
+            logger.info(
+                "Batch transfer completed: %s succeeded, %s failed",
+                succeeded,
+                len(transfers) - succeeded,
+                extra={'event': 'transfer.batch_completed'}
+            )
+
+        timer.mark('commit')
+        TransferMetrics.completed(timer, BATCH, succeeded, commission_total, charged)
+
+        return {
+            'success': succeeded == len(transfers),
+            'succeeded': succeeded,
+            'failed': len(transfers) - succeeded,
+            'results': results
+        }
@@ -0,0 +1,6 @@
+from .notify import * # noqa
+from .commission import * # noqa
+from .idempotency import * # noqa
+from .outbox import * # noqa
+from .reconciliation import * # noqa
+from .hot_wallet import * # noqa
@@ -0,0 +1,19 @@
+"""
+Background task for commissions
+"""
+
+from celery import shared_task
+
+from apps.wallets.services.commission import CommissionService
+
+
+@shared_task
+def settle_commissions():
+    """
+    Periodic task to settle accrued commissions into the admin wallet.
+
+    :return: Dictionary containing the settled amount
+    :rtype: dict
+    """
+    settled = CommissionService.settle()
+    return {'settled': str(settled)}
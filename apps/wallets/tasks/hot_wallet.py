@@ -0,0 +1,41 @@
+"""
+Background task for hot wallet queues
+"""
+
+from celery import shared_task
+
+from src.settings.config.config import config
+
+
+@shared_task
+def drain_hot_wallet(wallet_id):
+    """
+    Apply the queued transfers of a hot wallet until its queue is empty.
+
+    Routed to the ``hot_wallets`` queue, scheduled by the first transfer pushed
+    to an idle wallet queue, so only one drain runs per wallet at a time.
+
+    :param wallet_id: ID of the hot wallet
+    :type wallet_id: int
+    :return: Dictionary containing the number of drained transfers
+    :rtype: dict
+    """
+    from apps.wallets.services.hot_wallet import HotWalletService
+
+    drained_count = HotWalletService.drain(wallet_id)
+    return {'wallet_id': wallet_id, 'drained_count': drained_count}
+
+
+@shared_task
+def detect_hot_wallets():
+    """
+    Periodic task marking the wallets with the most recent transfers as hot.
+
+    :return: Dictionary containing the detected hot wallet IDs
+    :rtype: dict
+    """
+    from apps.wallets.services.hot_wallet import HotWalletService
+
+    if not (config.wallet.HOT_WALLET_QUEUE_URL and config.wallet.HOT_WALLET_AUTO_THRESHOLD):
+        return {'hot_wallet_ids': []}
+    return {'hot_wallet_ids': HotWalletService.detect()}
@@ -0,0 +1,22 @@
+"""
+Background task for idempotency keys
+"""
+
+from celery import shared_task
+
+from apps.wallets.services.idempotency import IdempotencyService
+
+from src.settings.utils.logging import logger
+
+
+@shared_task
+def purge_idempotency_keys():
+    """
+    Periodic task to delete expired idempotency keys.
+
+    :return: Dictionary containing the number of deleted keys
+    :rtype: dict
+    """
+    deleted_count = IdempotencyService.purge_expired()
+    logger.info("Purged %s expired idempotency keys", deleted_count)
+    return {'deleted_count': deleted_count}
@@ -2,24 +2,84 @@
 Background task for Transactions
 """
 
-import time
 import random
 
 from celery import shared_task
 
+from apps.wallets.enums.notification import DeadLetterKind
+from apps.wallets.services.delivery import DeliveryService
+
+from src.settings.config.config import config
 from src.settings.utils.logging import logger
 
 
+def deliver_notification(recipient_id, message):
+    """
+    Deliver a message to the owner of a wallet.
+
+    Goes through `DeliveryService`, to `CELERY_NOTIFY_URL` or, with the
+    ``simulated`` backend, a stand-in for a long request (e.g., Telegram API)
+    that fails 30% of the time.
+
+    :param recipient_id: ID of the recipient wallet
+    :type recipient_id: int
+    :param message: Notification payload
+    :type message: dict
+    :raises NotificationDeliveryError: If the notification service is unreachable
+    """
+    DeliveryService.deliver(recipient_id, message)
+
+
+def notification_message(amount, sender_id, transaction_group_id) -> dict:
+    return {
+        'amount': str(amount),
+        'sender_id': sender_id,
+        'transaction_group_id': transaction_group_id
+    }
+
+
+def defer(task, pause: float) -> dict:
+    """
+    Run a task again once the circuit breaker closes, without spending a retry.
+
+    :param task: Running task instance
+    :param pause: Seconds the breaker stays open
+    :return: Task result reporting the deferral
+    :rtype: dict
+    """
+    countdown = pause + random.uniform(0, pause)
+    task.signature_from_request(
+        task.request,
+        countdown=countdown,
+        retries=task.request.retries
+    ).apply_async()
+
+    logger.info(
+        "Notification endpoint failing, %s deferred by %.1fs",
+        task.name,
+        countdown,
+        extra={'event': 'notification.deferred'}
+    )
+    return {'status': 'deferred', 'countdown': countdown}
+
+
+def dead_letter(kind: DeadLetterKind, letters: list, error: Exception, attempts: int):
+    from apps.wallets.services.dead_letter import DeadLetterService
+
+    DeadLetterService.record(kind, letters, str(error), attempts)
+
+
 @shared_task(
     bind=True,
-    max_retries=3,
-    default_retry_delay=3
+    max_retries=config.task.CELERY_NOTIFY_MAX_RETRIES
 )
 def send_notification(self, recipient_id, amount, sender_id, transaction_group_id):
     """
     Asynchronous task to send a transfer notification.
 
-    Simulates a long request (e.g., Telegram API) and retries on failure.
+    Retries on failure after an exponential, jittered backoff, waits while the
+    circuit breaker is open, and saves the notification as a dead letter once
+    retries are exhausted.
 
     :param self: Task instance (bind=True)
     :param recipient_id: ID of the recipient wallet
@@ -33,21 +93,39 @@ def send_notification(self, recipient_id, amount, sender_id, transaction_group_i
     :return: Dictionary with task status and details
     :rtype: dict
     """
+    pause = DeliveryService.breaker.remaining()
+    if pause:
+        return defer(self, pause)
+
     try:
         logger.info(
-            f"[Attempt {self.request.retries + 1}/4] Sending notification to wallet {recipient_id}"
+            "[Attempt %s/%s] Sending notification to wallet %s",
+            self.request.retries + 1,
+            self.max_retries + 1,
+            recipient_id,
+            extra={
+                'event': 'notification.sending',
+                'recipient_id': recipient_id,
+                'transaction_group': transaction_group_id
+            }
         )
 
-        logger.info("Simulating long request (5 seconds)...")
-        time.sleep(5)
-
-        if random.random() < 0.3:
-            logger.warning("Simulated network error occurred")
-            raise Exception("Simulated network error: Failed to connect to notification service")
+        deliver_notification(
+            recipient_id,
+            notification_message(amount, sender_id, transaction_group_id)
+        )
 
         logger.info(
-            f"✓ Notification sent successfully to wallet {recipient_id}. "
-            f"Amount: {amount}, Transaction group: {transaction_group_id}"
+            "✓ Notification sent successfully to wallet %s. Amount: %s, Transaction group: %s",
+            recipient_id,
+            amount,
+            transaction_group_id,
+            extra={
+                'event': 'notification.sent',
+                'recipient_id': recipient_id,
+                'sender_id': sender_id,
+                'transaction_group': transaction_group_id
+            }
         )
 
         return {
@@ -59,16 +137,214 @@ def send_notification(self, recipient_id, amount, sender_id, transaction_group_i
 
     except Exception as exc:
         logger.error(
-            f"✗ Error sending notification (attempt {self.request.retries + 1}/4): {str(exc)}"
+            "✗ Error sending notification (attempt %s/%s): %s",
+            self.request.retries + 1,
+            self.max_retries + 1,
+            exc,
+            extra={
+                'event': 'notification.failed',
+                'recipient_id': recipient_id,
+                'transaction_group': transaction_group_id
+            }
+        )
+
+        if self.request.retries < self.max_retries:
+            countdown = DeliveryService.backoff(self.request.retries)
+            logger.info("Retrying in %.1f seconds...", countdown)
+            raise self.retry(exc=exc, countdown=countdown)
+        else:
+            dead_letter(
+                DeadLetterKind.NOTIFICATION,
+                [(recipient_id, [recipient_id, str(amount), sender_id, transaction_group_id])],
+                exc,
+                self.request.retries + 1
+            )
+            logger.error(
+                "✗ All retry attempts exhausted for wallet %s. Saved as a dead letter.",
+                recipient_id,
+                extra={
+                    'event': 'notification.exhausted',
+                    'recipient_id': recipient_id,
+                    'transaction_group': transaction_group_id
+                }
+            )
+            return {
+                'status': 'failed',
+                'error': str(exc),
+                'retries_exhausted': True
+            }
+
+
+@shared_task(
+    bind=True,
+    max_retries=config.task.CELERY_NOTIFY_MAX_RETRIES
+)
+def send_notification_batch(self, notifications):
+    """
+    Asynchronous task sending many transfer notifications concurrently.
+
+    Deliveries run side by side through `DeliveryService`, so one worker process
+    sends a whole batch in about the time of its slowest few requests. Retries
+    carry only the notifications that failed, after an exponential, jittered
+    backoff; those still failing after the last retry are saved as dead letters.
+
+    :param self: Task instance (bind=True)
+    :param notifications: Lists of [recipient_id, amount, sender_id, transaction_group_id]
+    :type notifications: list
+    :return: Dictionary with task status and the numbers of sent and failed notifications
+    :rtype: dict
+    """
+    pause = DeliveryService.breaker.remaining()
+    if pause:
+        return defer(self, pause)
+
+    errors = DeliveryService.deliver_many([
+        (recipient_id, notification_message(amount, sender_id, transaction_group_id))
+        for recipient_id, amount, sender_id, transaction_group_id in notifications
+    ])
+    failed = [
+        notification
+        for notification, error in zip(notifications, errors)
+        if error is not None
+    ]
+    sent = len(notifications) - len(failed)
+
+    logger.info(
+        "[Attempt %s/%s] Sent %s of %s notifications",
+        self.request.retries + 1,
+        self.max_retries + 1,
+        sent,
+        len(notifications),
+        extra={'event': 'notification.batch_sent', 'sent': sent, 'failed': len(failed)}
+    )
+    if not failed:
+        return {'status': 'success', 'sent': sent, 'failed': 0}
+
+    first_error = next(error for error in errors if error is not None)
+    logger.error(
+        "✗ %s notifications failed (attempt %s/%s): %s",
+        len(failed),
+        self.request.retries + 1,
+        self.max_retries + 1,
+        first_error,
+        extra={'event': 'notification.batch_failed', 'failed': len(failed)}
+    )
+
+    if self.request.retries < self.max_retries:
+        countdown = DeliveryService.backoff(self.request.retries)
+        logger.info("Retrying in %.1f seconds...", countdown)
+        raise self.retry(exc=first_error, countdown=countdown, args=[failed])
+
+    dead_letter(
+        DeadLetterKind.NOTIFICATION,
+        [(notification[0], notification) for notification in failed],
+        first_error,
+        self.request.retries + 1
+    )
+    logger.error(
+        "✗ All retry attempts exhausted for %s notifications. Saved as dead letters.",
+        len(failed),
+        extra={
+            'event': 'notification.batch_exhausted',
+            'recipient_ids': sorted({notification[0] for notification in failed})
+        }
+    )
+    return {
+        'status': 'failed',
+        'sent': sent,
+        'failed': len(failed),
+        'error': str(first_error),
+        'retries_exhausted': True
+    }
+
+
+@shared_task(
+    bind=True,
+    max_retries=config.task.CELERY_NOTIFY_MAX_RETRIES
+)
+def flush_notification_digest(self, recipient_id, items=None):
+    """
+    Asynchronous task sending one digest of all transfers buffered for a recipient.
+
+    Scheduled once per recipient and digest window by `NotificationService`.
+    Retries keep the drained items in the task arguments, so nothing is lost
+    and nothing is sent twice on failure; a digest still failing after the last
+    retry is saved as a dead letter.
+
+    :param self: Task instance (bind=True)
+    :param recipient_id: ID of the recipient wallet
+    :type recipient_id: int
+    :param items: Buffered notifications, drained from the buffer when not given
+    :type items: list
+    :return: Dictionary with task status and details
+    :rtype: dict
+    """
+    from apps.wallets.services.notification import NotificationService
+
+    pause = DeliveryService.breaker.remaining()
+    if pause:
+        return defer(self, pause)
+
+    if items is None:
+        items = NotificationService.drain(recipient_id)
+        if not items:
+            return {'status': 'empty', 'recipient_id': recipient_id}
+
+    digest = NotificationService.build_digest(items)
+
+    try:
+        logger.info(
+            "[Attempt %s/%s] Sending digest of %s transfers to wallet %s",
+            self.request.retries + 1,
+            self.max_retries + 1,
+            digest['count'],
+            recipient_id,
+            extra={'event': 'notification.digest_sending', 'recipient_id': recipient_id}
+        )
+
+        deliver_notification(recipient_id, digest)
+
+        logger.info(
+            "✓ Digest sent successfully to wallet %s. Transfers: %s, Total amount: %s",
+            recipient_id,
+            digest['count'],
+            digest['total_amount'],
+            extra={'event': 'notification.digest_sent', 'recipient_id': recipient_id}
+        )
+
+        return {
+            'status': 'success',
+            'recipient_id': recipient_id,
+            'coalesced': digest['count'],
+            'total_amount': digest['total_amount']
+        }
+
+    except Exception as exc:
+        logger.error(
+            "✗ Error sending digest (attempt %s/%s): %s",
+            self.request.retries + 1,
+            self.max_retries + 1,
+            exc,
+            extra={'event': 'notification.digest_failed', 'recipient_id': recipient_id}
         )
 
         if self.request.retries < self.max_retries:
-            logger.info(f"Retrying in 3 seconds... (attempt {self.request.retries + 2}/4)")
-            raise self.retry(exc=exc, countdown=3)
+            countdown = DeliveryService.backoff(self.request.retries)
+            logger.info("Retrying in %.1f seconds...", countdown)
+            raise self.retry(
+                exc=exc,
+                countdown=countdown,
+                args=[recipient_id],
+                kwargs={'items': items}
+            )
         else:
+            dead_letter(DeadLetterKind.DIGEST, [(recipient_id, items)], exc, self.request.retries + 1) # noqa
             logger.error(
-                f"✗ All retry attempts exhausted for wallet {recipient_id}. "
-                f"Manual intervention required."
+                "✗ All retry attempts exhausted for wallet %s. "
+                "%s notifications saved as a dead letter.",
+                recipient_id,
+                digest['count'],
+                extra={'event': 'notification.digest_exhausted', 'recipient_id': recipient_id}
             )
             return {
                 'status': 'failed',
@@ -82,18 +358,46 @@ def cleanup_old_transactions():
     """
     Periodic task to clean up old completed transactions (e.g., older than 90 days).
 
-    :return: Dictionary containing the number of deleted transactions
+    Drops whole partitions when the table is partitioned, otherwise deletes
+    in throttled chunks so retention never competes with live transfers.
+
+    :return: Retention report with the number of deleted transactions and rows per second
     :rtype: dict
     """
     from datetime import timedelta
     from django.utils import timezone
-    from apps.wallets.models.transaction import Transaction
+    from apps.wallets.services.retention import RetentionService
+
+    threshold_date = timezone.now() - timedelta(days=config.task.CELERY_RETENTION_DAYS)
+    report = RetentionService.purge(
+        threshold_date,
+        batch_size=config.task.CELERY_RETENTION_BATCH_SIZE,
+        throttle=config.task.CELERY_RETENTION_THROTTLE
+    )
+
+    logger.info(
+        "Cleaned up %s old transactions (%s rows/s, mode: %s, dropped partitions: %s)",
+        report['deleted_count'],
+        report['rows_per_s'],
+        report['mode'],
+        len(report['dropped_partitions'])
+    )
+    return report
+
 
-    threshold_date = timezone.now() - timedelta(days=90)
-    deleted_count = Transaction.objects.filter(
-        created_at__lt=threshold_date,
-        status='completed'
-    ).delete()[0]
+@shared_task
+def create_transaction_partitions():
+    """
+    Periodic task keeping monthly transaction partitions ahead of time.
+
+    Does nothing when the transactions table is not partitioned.
+
+    :return: Dictionary containing the created partitions
+    :rtype: dict
+    """
+    from apps.wallets.services.retention import RetentionService
 
-    logger.info(f"Cleaned up {deleted_count} old transactions")
-    return {'deleted_count': deleted_count}
+    created = RetentionService.create_partitions(config.task.CELERY_PARTITION_MONTHS_AHEAD)
+    if created:
+        logger.info("Created transaction partitions: %s", ', '.join(created))
+    return {'created': created}
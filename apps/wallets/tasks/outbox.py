@@ -0,0 +1,39 @@
+"""
+Background task for the transactional outbox
+"""
+
+from celery import shared_task
+
+from src.settings.config.config import config
+from src.settings.utils.logging import logger
+
+
+@shared_task
+def relay_outbox():
+    """
+    Periodic task publishing pending outbox events in batches.
+
+    Stops after one relay interval, so runs scheduled back to back do not pile up.
+
+    :return: Dictionary containing the number of relayed events
+    :rtype: dict
+    """
+    from apps.wallets.services.outbox import OutboxService
+
+    relayed_count = OutboxService.relay(time_budget=config.task.CELERY_OUTBOX_RELAY_INTERVAL)
+    return {'relayed_count': relayed_count}
+
+
+@shared_task
+def purge_outbox_events():
+    """
+    Periodic task to delete delivered outbox events older than one day.
+
+    :return: Dictionary containing the number of deleted events
+    :rtype: dict
+    """
+    from apps.wallets.services.outbox import OutboxService
+
+    deleted_count = OutboxService.purge_delivered()
+    logger.info("Purged %s delivered outbox events", deleted_count)
+    return {'deleted_count': deleted_count}
@@ -0,0 +1,34 @@
+"""
+Background task for ledger reconciliation
+"""
+
+from celery import shared_task
+
+from apps.wallets.services.reconciliation import ReconciliationService
+
+from src.settings.utils.logging import logger
+
+
+@shared_task
+def reconcile_ledger(full=False):
+    """
+    Periodic task to check wallet balances against the transaction ledger.
+
+    Resumes from the last checkpoint unless a full run is requested.
+
+    :param full: Scan the whole transaction history
+    :type full: bool
+    :return: Reconciliation report
+    :rtype: dict
+    """
+    report = ReconciliationService.run(full=full)
+
+    logger.info(
+        "Reconciled %s wallets against %s transactions (%s rows/s, mode: %s), drifted: %s",
+        report['wallets_checked'],
+        report['transactions_scanned'],
+        report['rows_per_s'],
+        report['mode'],
+        report['drifted_count']
+    )
+    return report
@@ -0,0 +1,39 @@
+"""
+Test helpers
+"""
+
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+
+from apps.wallets.models.wallet import Wallet
+
+
+def create_wallets(count: int, balance: str = '5000', prefix: str = 'user') -> list:
+    """
+    Create users with one wallet each.
+
+    :param count: Number of wallets
+    :param balance: Starting balance of every wallet
+    :param prefix: Username prefix, followed by the wallet index
+    :return: Created wallets
+    :rtype: list
+    """
+    return [
+        Wallet.objects.create(
+            user=User.objects.create(username=f'{prefix}{index}'),
+            balance=Decimal(balance)
+        )
+        for index in range(count)
+    ]
+
+
+def balances(wallets: list) -> list:
+    """
+    Read the current balances of wallets from the database.
+
+    :param wallets: Wallets
+    :return: Balances in the order of `wallets`
+    :rtype: list
+    """
+    return [Wallet.objects.get(id=wallet.id).balance for wallet in wallets]
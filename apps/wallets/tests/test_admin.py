@@ -0,0 +1,50 @@
+from decimal import Decimal
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from apps.wallets.models.transaction import Transaction
+from apps.wallets.services.transfer import TransferService
+from apps.wallets.tests.helpers import create_wallets
+
+
+class TransactionAdminSearchTests(TestCase):
+    def setUp(self):
+        self.alices = create_wallets(3, prefix='alice')
+        self.bob, = create_wallets(1, prefix='bob')
+        self.carol, = create_wallets(1, prefix='carol')
+        for wallet in self.alices:
+            TransferService.execute_transfer(wallet.id, self.bob.id, Decimal('1'))
+        TransferService.execute_transfer(self.bob.id, self.carol.id, Decimal('1'))
+        self.model_admin = admin.site._registry[Transaction]
+
+    def search(self, term: str) -> set:
+        queryset, may_have_duplicates = self.model_admin.get_search_results(
+            None, Transaction.objects.all(), term
+        )
+        self.assertFalse(may_have_duplicates)
+        return set(queryset.values_list('id', flat=True))
+
+    def test_username_matches_sender_or_recipient(self):
+        alice = Transaction.objects.filter(sender__user__username__startswith='alice')
+        carol = Transaction.objects.filter(recipient=self.carol)
+
+        self.assertEqual(self.search('alice'), set(alice.values_list('id', flat=True)))
+        self.assertEqual(self.search('CAROL'), set(carol.values_list('id', flat=True)))
+        self.assertEqual(len(self.search('bob')), 4)
+        self.assertEqual(self.search('nobody'), set())
+
+    def test_uuid_matches_the_transaction_group(self):
+        transfer = Transaction.objects.filter(recipient=self.carol).first()
+        group = Transaction.objects.filter(transaction_group=transfer.transaction_group)
+
+        self.assertEqual(self.search(f' {transfer.transaction_group} '), set(group.values_list('id', flat=True))) # noqa
+
+    def test_changelist_search(self):
+        staff = User.objects.create_superuser('admin', 'admin@example.com', 'secret')
+        self.client.force_login(staff)
+
+        response = self.client.get('/admin/wallets/transaction/', {'q': 'carol'})
+
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,52 @@
+from decimal import Decimal
+
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+
+from apps.wallets.models.transaction import Transaction
+from apps.wallets.exceptions.transfer import InsufficientFundsError
+from apps.wallets.tests.helpers import balances
+from apps.wallets.tests.helpers import create_wallets
+
+
+class BatchTransferAPITests(TestCase):
+    def setUp(self):
+        self.wallets = create_wallets(3)
+        self.client = APIClient()
+        self.client.force_authenticate(self.wallets[0].user)
+
+    def test_atomic_batch_rolls_back_every_transfer_on_failure(self):
+        first, second, third = self.wallets
+        response = self.client.post('/api/v1/transfers/batch/', {'transfers': [
+            {'sender_id': first.id, 'recipient_id': second.id, 'amount': '100'},
+            {'sender_id': second.id, 'recipient_id': third.id, 'amount': '9000'}
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(balances(self.wallets), [Decimal('5000')] * 3)
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_non_atomic_batch_commits_the_valid_transfers(self):
+        first, second, third = self.wallets
+        response = self.client.post('/api/v1/transfers/batch/', {'transfers': [
+            {'sender_id': first.id, 'recipient_id': second.id, 'amount': '100'},
+            {'sender_id': second.id, 'recipient_id': third.id, 'amount': '9000'}
+        ], 'atomic': False}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        results = response.json()['results']
+        self.assertTrue(results[0]['success'])
+        self.assertFalse(results[1]['success'])
+        self.assertEqual(results[1]['reason'], InsufficientFundsError.reason)
+        self.assertEqual(balances(self.wallets), [Decimal('4900'), Decimal('5100'), Decimal('5000')]) # noqa
+
+    def test_batch_over_the_size_limit_is_rejected(self):
+        first, second = self.wallets[:2]
+        transfer = {'sender_id': first.id, 'recipient_id': second.id, 'amount': '1'}
+        response = self.client.post('/api/v1/transfers/batch/', {
+            'transfers': [transfer] * 1001
+        }, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Transaction.objects.exists())
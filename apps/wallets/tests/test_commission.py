@@ -0,0 +1,50 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from apps.wallets.models.wallet import Wallet
+from apps.wallets.models.commission import CommissionAccrual
+from apps.wallets.services.commission import CommissionService
+from apps.wallets.services.transfer import TransferService
+from apps.wallets.tests.helpers import create_wallets
+
+
+class CommissionSettleTests(TestCase):
+    def setUp(self):
+        self.admin_wallet = Wallet.objects.create(
+            id=CommissionService.ADMIN_WALLET_ID,
+            user=User.objects.create(username='admin'),
+            balance=Decimal('0')
+        )
+        self.wallets = create_wallets(3)
+        self.addCleanup(setattr, CommissionService, 'admin_wallet_found', False)
+
+    def test_accruals_are_settled_into_the_admin_wallet(self):
+        first, second, third = self.wallets
+        TransferService.execute_transfer(first.id, second.id, Decimal('2000'))
+        TransferService.execute_batch([
+            {'sender_id': second.id, 'recipient_id': third.id, 'amount': Decimal('1500')}
+        ])
+
+        self.assertEqual(Wallet.objects.get(id=self.admin_wallet.id).balance, Decimal('0'))
+        self.assertEqual(CommissionService.pending_total(), Decimal('350'))
+
+        self.assertEqual(CommissionService.settle(), Decimal('350'))
+        self.assertEqual(Wallet.objects.get(id=self.admin_wallet.id).balance, Decimal('350'))
+        self.assertEqual(CommissionService.pending_total(), Decimal('0'))
+        self.assertEqual(CommissionService.settle(), Decimal('0'))
+
+    def test_commissions_are_spread_over_shards_by_sender(self):
+        first, second = self.wallets[:2]
+        CommissionService.accrue(CommissionService.shard_for(first.id), Decimal('5'))
+        CommissionService.accrue(CommissionService.shard_for(second.id), Decimal('7'))
+        CommissionService.accrue(CommissionService.shard_for(first.id), Decimal('1'))
+
+        self.assertEqual(
+            dict(CommissionAccrual.objects.filter(amount__gt=0).values_list('shard', 'amount')),
+            {
+                CommissionService.shard_for(first.id): Decimal('6'),
+                CommissionService.shard_for(second.id): Decimal('7')
+            }
+        )
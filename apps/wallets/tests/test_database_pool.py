@@ -0,0 +1,47 @@
+from dataclasses import replace
+from types import SimpleNamespace
+from unittest import mock
+
+from django.db import connections
+from django.test import SimpleTestCase
+
+from prometheus_client import REGISTRY
+
+from src.settings.config.config import config
+from src.settings.db.postgres.database import postgres_database
+from src.settings.utils.metrics import refresh_pool_metrics
+
+
+class DatabasePoolSettingsTests(SimpleTestCase):
+    URL = 'postgresql://wallet:secret@db:5432/wallets'
+
+    def test_pool_replaces_persistent_connections(self):
+        settings = replace(config.db, DB_POOL_ENABLED=True, DB_POOL_MIN_SIZE=3, DB_POOL_MAX_SIZE=7, DB_CONN_MAX_AGE=60) # noqa
+        database = postgres_database(self.URL, settings)
+
+        self.assertEqual(database['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+        self.assertEqual(database['OPTIONS']['pool']['min_size'], 3)
+        self.assertEqual(database['OPTIONS']['pool']['max_size'], 7)
+
+    def test_persistent_connections_without_the_pool(self):
+        settings = replace(config.db, DB_POOL_ENABLED=False, DB_CONN_MAX_AGE=60)
+        database = postgres_database(self.URL, settings)
+
+        self.assertEqual(database['CONN_MAX_AGE'], 60)
+        self.assertNotIn('pool', database.get('OPTIONS', {}))
+
+    def test_pool_statistics_are_exported(self):
+        pool = SimpleNamespace(closed=False, pop_stats=lambda: {
+            'pool_size': 5,
+            'pool_available': 2,
+            'pool_max': 10,
+            'requests_waiting': 1
+        })
+        with mock.patch.object(type(connections['default']), '_connection_pools', {'default': pool}, create=True): # noqa
+            refresh_pool_metrics(force=True)
+
+        self.assertEqual(REGISTRY.get_sample_value('db_pool_connections', {'alias': 'default', 'state': 'in_use'}), 3) # noqa
+        self.assertEqual(REGISTRY.get_sample_value('db_pool_connections', {'alias': 'default', 'state': 'idle'}), 2) # noqa
+        self.assertEqual(REGISTRY.get_sample_value('db_pool_max_connections', {'alias': 'default'}), 10) # noqa
+        self.assertEqual(REGISTRY.get_sample_value('db_pool_waiting_requests', {'alias': 'default'}), 1) # noqa
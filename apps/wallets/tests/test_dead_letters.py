@@ -0,0 +1,98 @@
+from unittest import mock
+
+import fakeredis
+
+from django.test import TestCase
+from django.test import SimpleTestCase
+
+from apps.wallets.enums.notification import DeadLetterKind
+from apps.wallets.models.dead_letter import NotificationDeadLetter
+from apps.wallets.services.breaker import CircuitBreaker
+from apps.wallets.services.delivery import DeliveryService
+from apps.wallets.services.dead_letter import DeadLetterService
+from apps.wallets.tasks.notify import send_notification_batch
+from apps.wallets.exceptions.delivery import NotificationDeliveryError
+
+from src.settings.config.config import config
+
+
+class BackoffTests(SimpleTestCase):
+    def test_delay_bound_doubles_up_to_the_cap(self):
+        with mock.patch.object(config.task, 'CELERY_NOTIFY_RETRY_BASE', 2.0), \
+             mock.patch.object(config.task, 'CELERY_NOTIFY_RETRY_CAP', 10.0), \
+             mock.patch('apps.wallets.services.delivery.random.uniform', side_effect=lambda low, high: high): # noqa
+            self.assertEqual([DeliveryService.backoff(retries) for retries in range(4)], [2.0, 4.0, 8.0, 10.0]) # noqa
+
+    def test_delay_is_jittered_below_the_bound(self):
+        delays = {DeliveryService.backoff(3) for _ in range(20)}
+
+        self.assertGreater(len(delays), 1)
+        self.assertTrue(all(0 <= delay <= config.task.CELERY_NOTIFY_RETRY_BASE * 8 for delay in delays)) # noqa
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.server = fakeredis.FakeServer()
+        patcher = mock.patch(
+            'apps.wallets.services.breaker.get_redis',
+            side_effect=lambda url: fakeredis.FakeRedis(server=self.server)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker('test', 'redis://breaker', threshold=5, cooldown=30)
+
+    def test_opens_after_threshold_failures(self):
+        self.breaker.record(succeeded=0, failed=3)
+        self.assertEqual(self.breaker.remaining(), 0.0)
+
+        self.breaker.record(succeeded=1, failed=2)
+        self.assertGreater(self.breaker.remaining(), 29)
+
+    def test_mostly_successful_round_resets_the_failures(self):
+        self.breaker.record(succeeded=0, failed=4)
+        self.breaker.record(succeeded=3, failed=1)
+        self.breaker.record(succeeded=0, failed=4)
+
+        self.assertEqual(self.breaker.remaining(), 0.0)
+
+    def test_stays_closed_while_redis_is_down(self):
+        self.server.connected = False
+        self.breaker.record(succeeded=0, failed=10)
+
+        self.assertEqual(self.breaker.remaining(), 0.0)
+
+
+class DeadLetterTests(TestCase):
+    def test_exhausted_batch_is_saved_as_dead_letters(self):
+        notifications = [[1, '10.00', 2, 'group-1'], [3, '5.00', 2, 'group-2']]
+        errors = [None, NotificationDeliveryError('unreachable')]
+
+        with mock.patch.object(DeliveryService.breaker, 'remaining', return_value=0.0), \
+             mock.patch.object(DeliveryService, 'deliver_many', return_value=errors):
+            result = send_notification_batch.apply(
+                args=[notifications],
+                retries=config.task.CELERY_NOTIFY_MAX_RETRIES
+            ).get()
+
+        self.assertEqual(result['failed'], 1)
+        letter = NotificationDeadLetter.objects.get()
+        self.assertEqual((letter.recipient_id, letter.payload, letter.error), (3, notifications[1], 'unreachable')) # noqa
+
+    def test_redrive_enqueues_after_commit_and_only_once(self):
+        DeadLetterService.record(DeadLetterKind.NOTIFICATION, [(1, [1, '1.00', 2, 'a']), (3, [3, '2.00', 2, 'b'])], 'error', 4) # noqa
+        DeadLetterService.record(DeadLetterKind.DIGEST, [(5, [['1.00', 2, 'c']])], 'error', 4)
+
+        with mock.patch('apps.wallets.services.dead_letter.send_notification_batch') as batch, \
+             mock.patch('apps.wallets.services.dead_letter.flush_notification_digest') as digest: # noqa
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                redriven = DeadLetterService.redrive_batch(DeadLetterService.pending(), 10)
+                batch.delay.assert_not_called()
+
+            self.assertEqual(redriven, 3)
+            self.assertEqual(len(callbacks), 1)
+            batch.delay.assert_called_once_with([[1, '1.00', 2, 'a'], [3, '2.00', 2, 'b']])
+            digest.apply_async.assert_called_once_with(args=[5], kwargs={'items': [['1.00', 2, 'c']]}) # noqa
+
+            self.assertEqual(DeadLetterService.redrive_batch(DeadLetterService.pending(), 10), 0)
+
+        self.assertFalse(DeadLetterService.pending().exists())
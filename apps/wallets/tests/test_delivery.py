@@ -0,0 +1,78 @@
+import time
+
+from unittest import mock
+
+from aiohttp import web
+
+from django.test import SimpleTestCase
+
+from apps.wallets.services.breaker import CircuitBreaker
+from apps.wallets.services.delivery import DeliveryService
+from apps.wallets.exceptions.delivery import NotificationDeliveryError
+
+from src.settings.config.config import config
+
+
+class DeliveryServiceTests(SimpleTestCase):
+    def setUp(self):
+        for patcher in (
+            mock.patch.object(DeliveryService, 'breaker', CircuitBreaker('notify', '', 20, 30)),
+            mock.patch.object(DeliveryService, 'SIMULATED_LATENCY', 0.05),
+            mock.patch.object(config.task, 'CELERY_NOTIFY_CONCURRENCY', 50),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def deliveries(self, count: int) -> list:
+        return [(recipient_id, {'amount': '1.00'}) for recipient_id in range(count)]
+
+    def test_simulated_deliveries_run_concurrently(self):
+        with mock.patch.object(config.task, 'CELERY_NOTIFY_BACKEND', DeliveryService.SIMULATED), \
+             mock.patch.object(DeliveryService, 'SIMULATED_FAILURE_RATE', 0):
+            started = time.perf_counter()
+            errors = DeliveryService.deliver_many(self.deliveries(50))
+
+        self.assertEqual(errors, [None] * 50)
+        self.assertLess(time.perf_counter() - started, 50 * 0.05 / 2)
+
+    def test_failures_are_returned_in_input_order(self):
+        with mock.patch.object(config.task, 'CELERY_NOTIFY_BACKEND', DeliveryService.SIMULATED), \
+             mock.patch.object(DeliveryService, 'SIMULATED_FAILURE_RATE', 1):
+            errors = DeliveryService.deliver_many(self.deliveries(3))
+
+            with self.assertRaises(NotificationDeliveryError):
+                DeliveryService.deliver(1, {'amount': '1.00'})
+
+        self.assertTrue(all(isinstance(error, NotificationDeliveryError) for error in errors))
+
+    def test_http_deliveries_reuse_one_session(self):
+        received = []
+
+        async def notify(request):
+            received.append(await request.json())
+            if received[-1]['recipient_id'] == 2:
+                return web.Response(status=503)
+            return web.Response(status=204)
+
+        app = web.Application()
+        app.router.add_post('/notify', notify)
+        runner = web.AppRunner(app)
+        loop = DeliveryService.loop()
+        loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        loop.run_until_complete(site.start())
+        self.addCleanup(loop.run_until_complete, runner.cleanup())
+        port = runner.addresses[0][1]
+
+        with mock.patch.object(config.task, 'CELERY_NOTIFY_BACKEND', DeliveryService.HTTP), \
+             mock.patch.object(config.task, 'CELERY_NOTIFY_URL', f'http://127.0.0.1:{port}/notify'): # noqa
+            errors = DeliveryService.deliver_many(self.deliveries(4))
+            session = DeliveryService.local.session
+            DeliveryService.deliver(0, {'amount': '1.00'})
+
+        self.addCleanup(setattr, DeliveryService.local, 'session', None)
+        self.addCleanup(loop.run_until_complete, session.close())
+        self.assertIs(DeliveryService.local.session, session)
+        self.assertEqual([error is None for error in errors], [True, True, False, True])
+        self.assertEqual(len(received), 5)
+        self.assertEqual(received[0], {'recipient_id': 0, 'message': {'amount': '1.00'}})
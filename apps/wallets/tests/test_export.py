@@ -0,0 +1,51 @@
+import io
+import csv
+import json
+
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+
+from apps.wallets.services.export import TransactionExportService
+from apps.wallets.services.transfer import TransferService
+from apps.wallets.tests.helpers import create_wallets
+
+
+class TransactionExportTests(TestCase):
+    def setUp(self):
+        self.wallets = create_wallets(3)
+        first, second, third = self.wallets
+        TransferService.execute_transfer(first.id, second.id, Decimal('10'), 'rent')
+        TransferService.execute_transfer(second.id, third.id, Decimal('20'))
+
+    def export(self, fmt: str) -> str:
+        queryset = TransactionExportService.queryset(wallet_id=self.wallets[1].id)
+        return b''.join(TransactionExportService.stream(queryset, fmt)).decode()
+
+    def test_csv_export(self):
+        rows = list(csv.reader(io.StringIO(self.export('csv'))))
+
+        self.assertEqual(tuple(rows[0]), TransactionExportService.COLUMNS)
+        self.assertEqual([row[5] for row in rows[1:]], ['10.00', '20.00'])
+        self.assertEqual(rows[1][3:5], ['user0', 'user1'])
+        self.assertEqual(rows[1][9], 'rent')
+
+    def test_ndjson_export(self):
+        records = [json.loads(line) for line in self.export('ndjson').splitlines()]
+
+        self.assertEqual([record['amount'] for record in records], ['10.00', '20.00'])
+        self.assertEqual(list(records[0]), list(TransactionExportService.COLUMNS))
+        self.assertEqual(records[1]['from_username'], 'user1')
+
+    def test_export_endpoint_streams_csv_to_staff(self):
+        staff = User.objects.create(username='staff', is_staff=True)
+        client = APIClient()
+        client.force_authenticate(staff)
+        response = client.get('/api/v1/transactions/export/', {'wallet_id': self.wallets[1].id})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        self.assertEqual(len(b''.join(response.streaming_content).decode().splitlines()), 3)
@@ -0,0 +1,49 @@
+from decimal import Decimal
+
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+
+from apps.wallets.models.transaction import Transaction
+from apps.wallets.services.transfer import TransferService
+from apps.wallets.tests.helpers import create_wallets
+
+
+class TransactionHistoryTests(TestCase):
+    def setUp(self):
+        self.wallets = create_wallets(3)
+        self.client = APIClient()
+        self.client.force_authenticate(self.wallets[0].user)
+        first, second, third = self.wallets
+        for amount in range(1, 8):
+            TransferService.execute_transfer(first.id, second.id, Decimal(amount))
+        TransferService.execute_transfer(second.id, third.id, Decimal('1'))
+        self.url = f'/api/v1/transactions/?wallet_id={first.id}&limit=3'
+
+    def test_cursors_round_trip(self):
+        pages = []
+        cursor = None
+        while True:
+            page = self.client.get(self.url + (f'&before={cursor}' if cursor else '')).json()
+            pages.append(page)
+            cursor = page['before']
+            if not cursor:
+                break
+
+        ids = [item['id'] for page in pages for item in page['results']]
+        expected = Transaction.objects.filter(sender=self.wallets[0]).values_list('id', flat=True)
+        self.assertEqual([len(page['results']) for page in pages], [3, 3, 1])
+        self.assertEqual(ids, sorted(expected, reverse=True))
+
+        previous = self.client.get(self.url + f"&after={pages[2]['after']}").json()
+        self.assertEqual(previous['results'], pages[1]['results'])
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(self.url + '&before=zzz')
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_wallet_id_is_required(self):
+        response = self.client.get('/api/v1/transactions/')
+
+        self.assertEqual(response.status_code, 400)
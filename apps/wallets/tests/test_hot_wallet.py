@@ -0,0 +1,167 @@
+import time
+import threading
+
+from decimal import Decimal
+from unittest import mock
+
+import fakeredis
+
+from asgiref.sync import async_to_sync
+
+from django.test import TestCase
+from django.test import TransactionTestCase
+
+from rest_framework.test import APIClient
+
+from apps.wallets.models.wallet import Wallet
+from apps.wallets.models.transaction import Transaction
+from apps.wallets.services.hot_wallet import HotWalletService
+from apps.wallets.services.transfer import TransferService
+from apps.wallets.exceptions.transfer import HotWalletBusyError
+from apps.wallets.exceptions.transfer import HotWalletQueueError
+from apps.wallets.exceptions.transfer import WalletOwnershipError
+from apps.wallets.exceptions.transfer import InsufficientFundsError
+from apps.wallets.tests.helpers import create_wallets
+from apps.wallets.tests.helpers import balances
+
+from src.settings.config.config import config
+
+
+class HotWalletQueueTests(TestCase):
+    def setUp(self):
+        self.hot, *self.senders = create_wallets(4, balance='100')
+        self.redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        HotWalletService.hot_cache = (0.0, frozenset())
+        self.addCleanup(setattr, HotWalletService, 'hot_cache', (0.0, frozenset()))
+
+        for patcher in (
+            mock.patch.object(config.wallet, 'HOT_WALLET_QUEUE_URL', 'redis://hot'),
+            mock.patch.object(config.wallet, 'HOT_WALLET_IDS', [self.hot.id]),
+            mock.patch('apps.wallets.services.hot_wallet.get_redis', return_value=self.redis),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch('apps.wallets.services.hot_wallet.drain_hot_wallet')
+        self.drain_task = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def submit_all(self, calls: list) -> list:
+        """
+        Submit transfers to the hot wallet from one thread each, drain the queue
+        once they are all waiting, and return the result or error of each call.
+        """
+        results = [None] * len(calls)
+
+        def submit(index, sender_id, amount, owner_id):
+            try:
+                results[index] = HotWalletService.submit(self.hot.id, sender_id, self.hot.id, Decimal(amount), '', owner_id) # noqa
+            except Exception as e:
+                results[index] = e
+
+        threads = [
+            threading.Thread(target=submit, args=(index, *call))
+            for index, call in enumerate(calls)
+        ]
+        for thread in threads:
+            thread.start()
+        queue_key = HotWalletService.QUEUE_KEY.format(wallet_id=self.hot.id)
+        while self.redis.llen(queue_key) < len(calls):
+            time.sleep(0.01)
+
+        self.drained = HotWalletService.drain(self.hot.id)
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_route_picks_the_hot_wallet(self):
+        first, second, _ = self.senders
+
+        self.assertEqual(HotWalletService.route(first.id, self.hot.id), self.hot.id)
+        self.assertEqual(HotWalletService.route(self.hot.id, first.id), self.hot.id)
+        self.assertIsNone(HotWalletService.route(first.id, second.id))
+
+    def test_queued_transfers_are_applied_in_one_drain(self):
+        first, second, third = self.senders
+        results = self.submit_all(
+            [(sender.id, '10', None) for sender in self.senders * 3]
+            + [(first.id, '5', second.user_id), (third.id, '1000', None)]
+        )
+
+        self.assertEqual(self.drained, 11)
+        self.drain_task.delay.assert_called_once_with(self.hot.id)
+        self.assertTrue(all(result['success'] for result in results[:9]))
+        self.assertIsInstance(results[9], WalletOwnershipError)
+        self.assertIsInstance(results[10], InsufficientFundsError)
+        self.assertEqual(Wallet.objects.get(id=self.hot.id).balance, Decimal('190'))
+        self.assertEqual(Transaction.objects.filter(recipient=self.hot).count(), 9)
+        self.assertFalse(self.redis.exists(HotWalletService.SCHEDULED_KEY.format(wallet_id=self.hot.id))) # noqa
+
+    def test_batches_never_exceed_the_transfer_batch_limit(self):
+        with mock.patch.object(TransferService, 'MAX_BATCH_SIZE', 2), \
+             mock.patch.object(config.wallet, 'HOT_WALLET_BATCH_SIZE', 200):
+            results = self.submit_all([(sender.id, '10', None) for sender in self.senders * 2])
+
+        self.assertTrue(all(result['success'] for result in results))
+        self.assertEqual(Wallet.objects.get(id=self.hot.id).balance, Decimal('160'))
+
+    def test_transfers_too_close_to_their_deadline_are_not_applied(self):
+        with mock.patch.object(config.wallet, 'HOT_WALLET_TIMEOUT', HotWalletService.BATCH_BUDGET / 2): # noqa
+            result, = self.submit_all([(self.senders[0].id, '10', None)])
+
+        self.assertIsInstance(result, HotWalletBusyError)
+        self.assertEqual(balances([self.hot, self.senders[0]]), [Decimal('100'), Decimal('100')])
+
+    def test_queue_errors_map_to_unavailable_statuses(self):
+        client = APIClient()
+        client.force_authenticate(self.senders[0].user)
+
+        for error, status_code in ((HotWalletBusyError('busy'), 503), (HotWalletQueueError('unknown'), 504)): # noqa
+            with mock.patch.object(TransferService, 'execute_transfer', side_effect=error):
+                response = client.post('/api/v1/transfer/', {
+                    'sender_id': self.senders[0].id,
+                    'recipient_id': self.hot.id,
+                    'amount': '5'
+                }, format='json')
+            self.assertEqual(response.status_code, status_code)
+
+
+class HotWalletFallbackTests(TransactionTestCase):
+    """
+    Transfers inside a transaction are never routed, so these run outside `TestCase`'s.
+    """
+
+    def setUp(self):
+        self.wallets = create_wallets(2)
+        HotWalletService.hot_cache = (0.0, frozenset())
+        self.addCleanup(setattr, HotWalletService, 'hot_cache', (0.0, frozenset()))
+
+        sender, recipient = self.wallets
+        for patcher in (
+            mock.patch.object(config.wallet, 'HOT_WALLET_QUEUE_URL', 'redis://127.0.0.1:1/0'),
+            mock.patch.object(config.wallet, 'HOT_WALLET_IDS', [recipient.id]),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch('apps.wallets.services.hot_wallet.drain_hot_wallet')
+        self.drain_task = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_transfer_applies_directly_when_redis_is_unavailable(self):
+        sender, recipient = self.wallets
+        self.assertEqual(HotWalletService.route(sender.id, recipient.id), recipient.id)
+
+        result = TransferService.execute_transfer(sender.id, recipient.id, Decimal('30'))
+
+        self.drain_task.delay.assert_not_called()
+        self.assertTrue(result['success'])
+        self.assertEqual(balances(self.wallets), [Decimal('4970'), Decimal('5030')])
+
+    def test_async_transfer_tries_the_queue_once(self):
+        sender, recipient = self.wallets
+
+        with mock.patch.object(HotWalletService, 'submit', wraps=HotWalletService.submit) as submit: # noqa
+            result = async_to_sync(TransferService.aexecute_transfer)(sender.id, recipient.id, Decimal('30')) # noqa
+
+        submit.assert_called_once()
+        self.assertTrue(result['success'])
+        self.assertEqual(balances(self.wallets), [Decimal('4970'), Decimal('5030')])
@@ -0,0 +1,61 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+
+from apps.wallets.models.transaction import Transaction
+from apps.wallets.tests.helpers import balances
+from apps.wallets.tests.helpers import create_wallets
+
+
+class IdempotencyTests(TestCase):
+    def setUp(self):
+        self.wallets = create_wallets(2)
+        self.client = APIClient()
+        self.client.force_authenticate(self.wallets[0].user)
+        self.body = {
+            'sender_id': self.wallets[0].id,
+            'recipient_id': self.wallets[1].id,
+            'amount': '20'
+        }
+        self.addCleanup(cache.clear)
+
+    def post(self, body, key):
+        return self.client.post('/api/v1/transfer/', body, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_the_stored_response(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self.post(self.body, 'transfer-1')
+        retry = self.post(self.body, 'transfer-1')
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(Transaction.objects.count(), 1)
+        self.assertEqual(balances(self.wallets), [Decimal('4980'), Decimal('5020')])
+
+    def test_replay_falls_back_to_the_database(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self.post(self.body, 'transfer-2')
+        cache.clear()
+        retry = self.post(self.body, 'transfer-2')
+
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(Transaction.objects.count(), 1)
+
+    def test_reused_key_with_another_payload_is_rejected(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post(self.body, 'transfer-3')
+        conflict = self.post(dict(self.body, amount='21'), 'transfer-3')
+
+        self.assertEqual(conflict.status_code, 422)
+        self.assertEqual(Transaction.objects.count(), 1)
+
+    def test_overlong_key_is_rejected(self):
+        response = self.post(self.body, 'k' * 300)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Transaction.objects.exists())
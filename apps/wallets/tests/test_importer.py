@@ -0,0 +1,77 @@
+import io
+
+from decimal import Decimal
+
+from django.test import TestCase
+
+from apps.wallets.models.wallet import Wallet
+from apps.wallets.models.transaction import Transaction
+from apps.wallets.services.importer import ImportService
+
+
+class ImporterValidationTests(TestCase):
+    CSV = (
+        'username,email,balance\n'
+        'alice,alice@example.com,100.00\n'
+        ',,5\n'
+        'bob,not-an-email,1\n'
+        'carol,,1.005\n'
+        'alice,,2\n'
+        'dave,,7\n'
+    )
+
+    def run_import(self, **options):
+        return ImportService.run(io.BytesIO(self.CSV.encode()), 'wallets', 'csv', **options)
+
+    def test_invalid_rows_abort_the_import(self):
+        report = self.run_import()
+
+        self.assertTrue(report['aborted'])
+        self.assertEqual(report['rows_loaded'], 0)
+        self.assertEqual(report['rows_invalid'], 4)
+        self.assertEqual([error['line'] for error in report['errors']], [3, 4, 5, 6])
+        self.assertFalse(Wallet.objects.exists())
+
+    def test_skip_invalid_loads_the_valid_rows(self):
+        report = self.run_import(skip_invalid=True)
+
+        self.assertFalse(report['aborted'])
+        self.assertEqual(report['rows_loaded'], 2)
+        self.assertEqual(
+            dict(Wallet.objects.values_list('user__username', 'balance')),
+            {'alice': Decimal('100.00'), 'dave': Decimal('7')}
+        )
+
+
+class TransactionImportTests(TestCase):
+    WALLETS = 'username,balance\nalice,70\nbob,25\n'
+    TRANSACTIONS = (
+        '{"recipient": "alice", "amount": "100"}\n'
+        '{"sender": "alice", "recipient": "bob", "amount": "30"}\n'
+        '{"sender": "alice", "recipient": "nobody", "amount": "1"}\n'
+    )
+
+    def setUp(self):
+        ImportService.run(io.BytesIO(self.WALLETS.encode()), 'wallets', 'csv')
+
+    def test_history_is_loaded_and_balances_checked(self):
+        report = ImportService.run(
+            io.BytesIO(self.TRANSACTIONS.encode()), 'transactions', 'ndjson', skip_invalid=True
+        )
+
+        self.assertEqual(report['rows_loaded'], 2)
+        self.assertEqual([error['line'] for error in report['errors']], [3])
+        self.assertEqual(Transaction.objects.count(), 2)
+        self.assertEqual(report['check']['wallets_checked'], 2)
+        self.assertEqual(report['check']['drifted'], [{
+            'wallet_id': Wallet.objects.get(user__username='bob').id,
+            'balance': '25.00',
+            'expected': '30.00',
+            'drift': '-5.00'
+        }])
+
+    def test_dry_run_loads_nothing(self):
+        report = ImportService.run(io.BytesIO(self.TRANSACTIONS.encode()), 'transactions', 'ndjson', dry_run=True) # noqa
+
+        self.assertEqual(report['rows_invalid'], 1)
+        self.assertFalse(Transaction.objects.exists())
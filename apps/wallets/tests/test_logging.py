@@ -0,0 +1,75 @@
+import io
+import sys
+import json
+import logging
+
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from src.settings.utils.logging import JsonFormatter
+from src.settings.utils.logging import SamplingFilter
+from src.settings.utils.logging import AsyncQueueHandler
+
+
+def make_record(level=logging.INFO, msg='Transfer %s done', args=(7,), **extra):
+    record = logging.LogRecord('wallets', level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class JsonFormatterTests(SimpleTestCase):
+    def test_extras_become_top_level_keys(self):
+        entry = json.loads(JsonFormatter().format(make_record(event='transfer', amount=Decimal('1.50')))) # noqa
+
+        self.assertEqual(entry['level'], 'INFO')
+        self.assertEqual(entry['logger'], 'wallets')
+        self.assertEqual(entry['message'], 'Transfer 7 done')
+        self.assertEqual(entry['event'], 'transfer')
+        self.assertEqual(entry['amount'], '1.50')
+        self.assertNotIn('args', entry)
+
+    def test_exceptions_are_formatted(self):
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            record = logging.LogRecord('wallets', logging.ERROR, __file__, 1, 'failed', (), sys.exc_info()) # noqa
+
+        entry = json.loads(JsonFormatter().format(record))
+        self.assertIn('ValueError: boom', entry['exc_info'])
+
+
+class SamplingFilterTests(SimpleTestCase):
+    def setUp(self):
+        self.filter = SamplingFilter({'transfer': 0, 'notification': 1})
+
+    def test_sampled_events(self):
+        self.assertFalse(self.filter.filter(make_record(event='transfer')))
+        self.assertTrue(self.filter.filter(make_record(event='notification')))
+
+    def test_unsampled_records_always_pass(self):
+        self.assertTrue(self.filter.filter(make_record()))
+        self.assertTrue(self.filter.filter(make_record(event='other')))
+        self.assertTrue(self.filter.filter(make_record(logging.WARNING, event='transfer')))
+
+
+class AsyncQueueHandlerTests(SimpleTestCase):
+    def test_records_are_written_by_the_listener(self):
+        handler = AsyncQueueHandler()
+        handler.target.setStream(stream := io.StringIO())
+        handler.setFormatter(JsonFormatter())
+
+        handler.handle(make_record(event='transfer'))
+        handler.close()
+
+        self.assertEqual(json.loads(stream.getvalue())['event'], 'transfer')
+
+    def test_records_are_dropped_when_the_queue_is_full(self):
+        handler = AsyncQueueHandler(queue_size=1)
+        self.addCleanup(handler.close)
+        handler.stop()
+
+        for _ in range(3):
+            handler.handle(make_record())
+
+        self.assertEqual(handler.dropped, 2)
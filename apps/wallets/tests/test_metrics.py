@@ -0,0 +1,57 @@
+from decimal import Decimal
+
+from django.test import TestCase
+
+from prometheus_client import REGISTRY
+
+from rest_framework.test import APIClient
+
+from apps.wallets.services.transfer import TransferService
+from apps.wallets.exceptions.transfer import InsufficientFundsError
+from apps.wallets.tests.helpers import create_wallets
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TransferMetricsTests(TestCase):
+    def setUp(self):
+        self.wallets = create_wallets(2)
+
+    def test_completed_and_rejected_transfers_are_counted(self):
+        sender, recipient = self.wallets
+        single = sample('wallet_transfers_total', kind='single')
+        batch = sample('wallet_transfers_total', kind='batch')
+        rejected = sample('wallet_transfer_rejections_total', reason=InsufficientFundsError.reason)
+        commission = sample('wallet_commission_amount_total')
+
+        TransferService.execute_transfer(sender.id, recipient.id, Decimal('2000'))
+        TransferService.execute_batch([
+            {'sender_id': sender.id, 'recipient_id': recipient.id, 'amount': Decimal('1')},
+            {'sender_id': recipient.id, 'recipient_id': sender.id, 'amount': Decimal('1')}
+        ])
+        with self.assertRaises(InsufficientFundsError):
+            TransferService.execute_transfer(sender.id, recipient.id, Decimal('9000'))
+
+        self.assertEqual(sample('wallet_transfers_total', kind='single') - single, 1)
+        self.assertEqual(sample('wallet_transfers_total', kind='batch') - batch, 2)
+        self.assertEqual(sample('wallet_transfer_rejections_total', reason=InsufficientFundsError.reason) - rejected, 1) # noqa
+        self.assertEqual(sample('wallet_commission_amount_total') - commission, 200)
+
+    def test_requests_are_measured_and_exposed(self):
+        client = APIClient()
+        client.force_authenticate(self.wallets[0].user)
+        before = sample('http_request_db_queries_count', view='transfer')
+
+        client.post('/api/v1/transfer/', {
+            'sender_id': self.wallets[0].id,
+            'recipient_id': self.wallets[1].id,
+            'amount': '1'
+        }, format='json')
+        response = self.client.get('/metrics')
+
+        self.assertEqual(sample('http_request_db_queries_count', view='transfer') - before, 1)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'wallet_transfers_total', response.content)
+        self.assertIn(b'http_request_duration_seconds_bucket', response.content)
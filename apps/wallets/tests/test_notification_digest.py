@@ -0,0 +1,71 @@
+from decimal import Decimal
+from unittest import mock
+
+import fakeredis
+
+from django.test import TestCase
+
+from apps.wallets.services.notification import NotificationService
+
+from src.settings.config.config import config
+
+
+@mock.patch.object(config.task, 'CELERY_NOTIFY_BUFFER_URL', 'redis://buffer')
+@mock.patch.object(config.task, 'CELERY_NOTIFY_DIGEST_WINDOW', 30)
+@mock.patch('apps.wallets.services.notification.send_notification_batch')
+@mock.patch('apps.wallets.services.notification.flush_notification_digest')
+class NotificationDigestTests(TestCase):
+    def setUp(self):
+        self.server = fakeredis.FakeServer()
+        patcher = mock.patch(
+            'apps.wallets.services.notification.get_redis',
+            return_value=fakeredis.FakeRedis(server=self.server)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_one_flush_is_scheduled_per_recipient_and_window(self, flush, send_batch):
+        NotificationService.enqueue_many([
+            (7, Decimal('10'), 1, 'group-1'),
+            (7, Decimal('2.50'), 2, 'group-2'),
+            (8, Decimal('1'), 1, 'group-3')
+        ])
+        NotificationService.enqueue(7, Decimal('5'), 3, 'group-4')
+
+        self.assertEqual(
+            sorted(call.kwargs['args'][0] for call in flush.apply_async.call_args_list),
+            [7, 8]
+        )
+        self.assertTrue(all(call.kwargs['countdown'] == 30 for call in flush.apply_async.call_args_list)) # noqa
+        send_batch.apply_async.assert_not_called()
+
+    def test_drain_takes_the_buffer_and_allows_the_next_window(self, flush, send_batch):
+        NotificationService.enqueue_many([
+            (7, Decimal('10'), 1, 'group-1'),
+            (7, Decimal('2.50'), 2, 'group-2')
+        ])
+
+        items = NotificationService.drain(7)
+        digest = NotificationService.build_digest(items)
+
+        self.assertEqual(digest['count'], 2)
+        self.assertEqual(digest['total_amount'], '12.50')
+        self.assertEqual([item['transaction_group_id'] for item in digest['transfers']], ['group-1', 'group-2']) # noqa
+        self.assertEqual(NotificationService.drain(7), [])
+
+        NotificationService.enqueue(7, Decimal('1'), 1, 'group-3')
+        self.assertEqual(flush.apply_async.call_count, 2)
+
+    def test_notifications_are_sent_individually_when_redis_is_unreachable(self, flush, send_batch): # noqa
+        self.server.connected = False
+        NotificationService.enqueue_many([
+            (7, Decimal('10'), 1, 'group-1'),
+            (8, Decimal('1'), 1, 'group-2')
+        ])
+
+        flush.apply_async.assert_not_called()
+        send_batch.apply_async.assert_called_once()
+        self.assertEqual(
+            send_batch.apply_async.call_args.kwargs['args'],
+            [[[7, '10', 1, 'group-1'], [8, '1', 1, 'group-2']]]
+        )
@@ -0,0 +1,71 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+
+from apps.wallets.models.transaction import Transaction
+from apps.wallets.services.transfer import TransferService
+from apps.wallets.exceptions.transfer import WalletOwnershipError
+from apps.wallets.exceptions.transfer import InsufficientFundsError
+from apps.wallets.exceptions.transfer import InsufficientFundsForCommissionError
+from apps.wallets.tests.helpers import balances
+from apps.wallets.tests.helpers import create_wallets
+
+from src.settings.config.config import config
+
+
+class OptimisticEngineTests(TestCase):
+    def setUp(self):
+        self.wallets = create_wallets(2, balance='1500')
+        patcher = mock.patch.object(config.wallet, 'TRANSFER_ENGINE', 'optimistic')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_transfer_moves_balances(self):
+        sender, recipient = self.wallets
+        result = TransferService.execute_transfer(sender.id, recipient.id, Decimal('500'))
+
+        self.assertTrue(result['success'])
+        self.assertEqual(balances(self.wallets), [Decimal('1000'), Decimal('2000')])
+
+    def test_insufficient_funds_leaves_balances_untouched(self):
+        recipient, sender = self.wallets
+        with self.assertRaises(InsufficientFundsError):
+            TransferService.execute_transfer(sender.id, recipient.id, Decimal('2000'))
+
+        self.assertEqual(balances(self.wallets), [Decimal('1500')] * 2)
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_insufficient_funds_for_commission(self):
+        sender, recipient = self.wallets
+        with self.assertRaises(InsufficientFundsForCommissionError):
+            TransferService.execute_transfer(sender.id, recipient.id, Decimal('1400'))
+
+        self.assertEqual(balances(self.wallets), [Decimal('1500')] * 2)
+
+    def test_ownership_mismatch_is_rejected(self):
+        sender, recipient = self.wallets
+        with self.assertRaises(WalletOwnershipError):
+            TransferService.execute_transfer(
+                sender.id,
+                recipient.id,
+                Decimal('10'),
+                owner_id=recipient.user_id
+            )
+
+        self.assertEqual(balances(self.wallets), [Decimal('1500')] * 2)
+
+    def test_debit_lost_to_a_concurrent_write_is_retried(self):
+        sender, recipient = self.wallets
+        conditional_debit = TransferService._conditional_debit
+        attempts = []
+
+        def lose_twice(*args):
+            attempts.append(args)
+            return False if len(attempts) <= 2 else conditional_debit(*args)
+
+        with mock.patch.object(TransferService, '_conditional_debit', side_effect=lose_twice):
+            TransferService.execute_transfer(sender.id, recipient.id, Decimal('10'))
+
+        self.assertEqual(len(attempts), 3)
+        self.assertEqual(balances(self.wallets), [Decimal('1490'), Decimal('1510')])
@@ -0,0 +1,65 @@
+from decimal import Decimal
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.wallets.models.outbox import OutboxEvent
+from apps.wallets.services.outbox import OutboxService
+from apps.wallets.services.transfer import TransferService
+from apps.wallets.tests.helpers import create_wallets
+
+
+@mock.patch.object(OutboxService, 'publish')
+class OutboxRelayTests(TestCase):
+    def setUp(self):
+        self.wallets = create_wallets(2)
+
+    def test_transfer_records_its_event_in_the_same_transaction(self, publish):
+        sender, recipient = self.wallets
+        result = TransferService.execute_transfer(sender.id, recipient.id, Decimal('25'))
+
+        event = OutboxEvent.objects.get()
+        self.assertIsNone(event.delivered_at)
+        self.assertEqual(event.payload, {
+            'recipient_id': recipient.id,
+            'amount': '25',
+            'sender_id': sender.id,
+            'transaction_group_id': result['transaction_group']
+        })
+
+    def test_relay_publishes_pending_events_in_batches(self, publish):
+        sender, recipient = self.wallets
+        for _ in range(5):
+            TransferService.execute_transfer(sender.id, recipient.id, Decimal('1'))
+
+        self.assertEqual(OutboxService.relay_batch(batch_size=3), 3)
+        self.assertEqual(OutboxService.relay(batch_size=3), 2)
+        self.assertEqual(OutboxService.relay_batch(batch_size=3), 0)
+
+        self.assertEqual([len(call.args[0]) for call in publish.call_args_list], [3, 2])
+        self.assertFalse(OutboxEvent.objects.filter(delivered_at__isnull=True).exists())
+        self.assertEqual(set(OutboxEvent.objects.values_list('attempts', flat=True)), {1})
+
+    def test_failed_publish_leaves_events_pending(self, publish):
+        sender, recipient = self.wallets
+        TransferService.execute_transfer(sender.id, recipient.id, Decimal('1'))
+        publish.side_effect = ConnectionError("broker down")
+
+        with self.assertRaises(ConnectionError):
+            OutboxService.relay_batch()
+
+        self.assertTrue(OutboxEvent.objects.filter(delivered_at__isnull=True, attempts=0).exists()) # noqa
+
+    def test_purge_deletes_only_old_delivered_events(self, publish):
+        now = timezone.now()
+        OutboxEvent.objects.bulk_create([
+            OutboxEvent(event_type='transfer.completed', payload={}, delivered_at=now - timedelta(days=2)), # noqa
+            OutboxEvent(event_type='transfer.completed', payload={}, delivered_at=now - timedelta(hours=1)), # noqa
+            OutboxEvent(event_type='transfer.completed', payload={})
+        ])
+
+        with mock.patch.object(OutboxService, 'PURGE_CHUNK_SIZE', 1):
+            self.assertEqual(OutboxService.purge_delivered(), 1)
+        self.assertEqual(OutboxEvent.objects.count(), 2)
@@ -0,0 +1,66 @@
+import uuid
+
+from decimal import Decimal
+
+from django.test import TransactionTestCase
+
+from apps.wallets.models.wallet import Wallet
+from apps.wallets.models.transaction import Transaction
+from apps.wallets.services.transfer import TransferService
+from apps.wallets.services.reconciliation import ReconciliationService
+from apps.wallets.tests.helpers import create_wallets
+
+
+class ReconciliationTests(TransactionTestCase):
+    """
+    Runs outside `TestCase`'s transaction: on PostgreSQL a run opens its own
+    repeatable-read snapshot, which must be the first statement of its transaction.
+    """
+
+    def setUp(self):
+        self.wallets = create_wallets(3, balance='0')
+        Transaction.objects.create(
+            sender=None,
+            recipient=self.wallets[0],
+            amount=Decimal('500.25'),
+            transaction_type='transfer',
+            status='completed',
+            transaction_group=uuid.uuid4()
+        )
+        Wallet.objects.filter(id=self.wallets[0].id).update(balance=Decimal('500.25'))
+
+    def test_consistent_ledger_has_no_drift(self):
+        first, second, third = self.wallets
+        TransferService.execute_transfer(first.id, second.id, Decimal('100.10'))
+        TransferService.execute_transfer(second.id, third.id, Decimal('0.05'))
+
+        report = ReconciliationService.run(full=True, chunk_size=2)
+
+        self.assertEqual(report['mode'], 'full')
+        self.assertEqual(report['transactions_scanned'], 3)
+        self.assertEqual(report['drifted_count'], 0)
+
+    def test_drifted_wallet_is_reported(self):
+        first, second = self.wallets[:2]
+        TransferService.execute_transfer(first.id, second.id, Decimal('100.10'))
+        Wallet.objects.filter(id=second.id).update(balance=Decimal('100.00'))
+
+        report = ReconciliationService.run(full=True)
+
+        self.assertEqual(report['drifted'], [{
+            'wallet_id': second.id,
+            'balance': '100.00',
+            'expected': '100.10',
+            'drift': '-0.10'
+        }])
+
+    def test_incremental_run_only_scans_new_transactions(self):
+        first, second = self.wallets[:2]
+        ReconciliationService.run(full=True)
+        TransferService.execute_transfer(first.id, second.id, Decimal('1'))
+
+        report = ReconciliationService.run()
+
+        self.assertEqual(report['mode'], 'incremental')
+        self.assertEqual(report['drifted_count'], 0)
+        self.assertEqual(report['last_transaction_id'], Transaction.objects.latest('id').id)
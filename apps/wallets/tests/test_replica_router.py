@@ -0,0 +1,77 @@
+import math
+
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+
+from django.test import TestCase
+from django.test import override_settings
+from django.core.cache import cache
+from django.utils.asyncio import async_unsafe
+
+from rest_framework.test import APIClient
+
+from apps.wallets.models.wallet import Wallet
+from apps.wallets.tests.helpers import create_wallets
+
+from src.settings.config.config import config
+from src.settings.db.router import PRIMARY
+from src.settings.db.router import ReplicaRouter
+from src.settings.db.router import replica_lag
+from src.settings.db.router import replica_reads
+from src.settings.db.router import is_pinned
+from src.settings.db.router import pin_to_primary
+
+
+async def read_stream(response) -> bytes:
+    return b''.join([chunk async for chunk in response.streaming_content])
+
+
+class ReplicaRouterTests(TestCase):
+    REPLICA = 'replica_1'
+
+    def setUp(self):
+        patcher = mock.patch('src.settings.db.router.replica_aliases', return_value=[self.REPLICA]) # noqa
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(replica_lag.checked_at.clear)
+        self.addCleanup(replica_lag.lags.clear)
+        self.addCleanup(cache.clear)
+
+    def route(self, lag: float) -> str:
+        token = replica_reads.set(True)
+        try:
+            with mock.patch.object(replica_lag, 'measure', return_value=lag):
+                replica_lag.refresh()
+                return ReplicaRouter().db_for_read(Wallet)
+        finally:
+            replica_reads.reset(token)
+
+    def test_reads_stay_on_primary_without_opt_in(self):
+        self.assertEqual(ReplicaRouter().db_for_read(Wallet), PRIMARY)
+
+    def test_reads_go_to_a_replica_within_the_allowed_lag(self):
+        self.assertEqual(self.route(0.0), self.REPLICA)
+
+    def test_lagging_or_unreachable_replica_falls_back_to_primary(self):
+        self.assertEqual(self.route(config.db.DB_REPLICA_MAX_LAG + 1), PRIMARY)
+        self.assertEqual(self.route(math.inf), PRIMARY)
+
+    def test_writes_pin_the_user_to_primary(self):
+        self.assertFalse(is_pinned(42))
+        pin_to_primary(42)
+        self.assertTrue(is_pinned(42))
+
+    @override_settings(DATABASE_ROUTERS=['src.settings.db.router.ReplicaRouter'])
+    def test_async_stream_checks_replica_lag_off_the_event_loop(self):
+        wallets = create_wallets(3)
+        client = APIClient()
+        client.force_authenticate(wallets[0].user)
+
+        # A lag check querying the replica is not allowed on the event loop.
+        with mock.patch.object(replica_lag, 'measure', async_unsafe(lambda alias: math.inf)):
+            response = client.get('/api/v1/async/wallets/?stream=true')
+            lines = async_to_sync(read_stream)(response).decode().splitlines()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(lines), 3)
@@ -0,0 +1,49 @@
+from decimal import Decimal
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.wallets.models.transaction import Transaction
+from apps.wallets.services.retention import RetentionService
+from apps.wallets.tests.helpers import create_wallets
+
+
+class RetentionTests(TestCase):
+    def setUp(self):
+        sender, recipient = create_wallets(2)
+        self.threshold = timezone.now() - timedelta(days=30)
+
+        def create(count, status, age):
+            ids = [
+                Transaction.objects.create(
+                    sender=sender,
+                    recipient=recipient,
+                    amount=Decimal('1'),
+                    transaction_type='transfer',
+                    status=status
+                ).id
+                for _ in range(count)
+            ]
+            Transaction.objects.filter(id__in=ids).update(created_at=timezone.now() - age)
+            return ids
+
+        self.expired = create(7, 'completed', timedelta(days=40))
+        self.pending = create(2, 'pending', timedelta(days=40))
+        self.recent = create(3, 'completed', timedelta(days=1))
+
+    def test_old_completed_transactions_are_deleted_in_chunks(self):
+        deleted = RetentionService.delete_in_chunks(self.threshold, batch_size=3, throttle=0)
+
+        self.assertEqual(deleted, 7)
+        self.assertEqual(
+            set(Transaction.objects.values_list('id', flat=True)),
+            set(self.pending + self.recent)
+        )
+
+    def test_purge_reports_chunked_mode_on_unpartitioned_tables(self):
+        report = RetentionService.purge(self.threshold, batch_size=100, throttle=0)
+
+        self.assertEqual(report['mode'], 'chunked')
+        self.assertEqual(report['dropped_partitions'], [])
+        self.assertEqual(report['deleted_count'], 7)
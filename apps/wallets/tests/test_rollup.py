@@ -0,0 +1,112 @@
+from io import StringIO
+from datetime import datetime
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from rest_framework.test import APIClient
+
+from apps.wallets.enums.status import Status
+from apps.wallets.enums.transaction import TransactionType
+from apps.wallets.models.rollup import WalletDailyRollup
+from apps.wallets.models.transaction import Transaction
+from apps.wallets.services.rollup import RollupService
+from apps.wallets.tests.helpers import create_wallets
+
+
+class RollupServiceTests(TestCase):
+    def setUp(self):
+        self.sender, self.recipient = create_wallets(2)
+        self.today = timezone.localdate()
+
+    def transaction(self, day, amount, transaction_type=TransactionType.TRANSFER, status=Status.COMPLETED): # noqa
+        created = Transaction.objects.create(
+            sender=self.sender,
+            recipient=self.recipient,
+            amount=Decimal(amount),
+            transaction_type=transaction_type.value,
+            status=status.value
+        )
+        created_at = datetime.combine(day, datetime.min.time(), timezone.get_current_timezone()) + timedelta(hours=12) # noqa
+        Transaction.objects.filter(id=created.id).update(created_at=created_at)
+
+    def test_record_adds_to_existing_rollups(self):
+        for _ in range(2):
+            totals = RollupService.add_transfer({}, self.sender.id, self.recipient.id, Decimal('10'), Decimal('1')) # noqa
+            RollupService.record(totals)
+
+        sender = WalletDailyRollup.objects.get(wallet=self.sender, day=self.today)
+        recipient = WalletDailyRollup.objects.get(wallet=self.recipient, day=self.today)
+        self.assertEqual((sender.outflow, sender.commission_paid, sender.transfers_out), (Decimal('20'), Decimal('2'), 2)) # noqa
+        self.assertEqual((recipient.inflow, recipient.transfers_in), (Decimal('20'), 2))
+
+    def test_backfill_rebuilds_days_from_completed_transactions(self):
+        yesterday = self.today - timedelta(days=1)
+        self.transaction(yesterday, '30')
+        self.transaction(yesterday, '2', TransactionType.COMMISSION)
+        self.transaction(yesterday, '99', status=Status.FAILED)
+        WalletDailyRollup.objects.create(wallet=self.sender, day=yesterday, outflow=Decimal('500'))
+
+        report = RollupService.backfill(yesterday - timedelta(days=9), self.today)
+
+        self.assertEqual(report, {'days': 10, 'rows': 2})
+        stats = RollupService.wallet_stats(self.sender.id, yesterday, yesterday)
+        self.assertEqual(stats['totals']['outflow'], Decimal('30'))
+        self.assertEqual(stats['totals']['commission_paid'], Decimal('2'))
+        self.assertEqual(stats['totals']['transfers_out'], 1)
+        recipient = RollupService.wallet_stats(self.recipient.id, yesterday, yesterday)
+        self.assertEqual(recipient['totals']['inflow'], Decimal('32'))
+        self.assertEqual(recipient['totals']['transfers_in'], 1)
+
+    def test_backfill_command_refuses_today(self):
+        with self.assertRaises(CommandError):
+            call_command('backfill_wallet_rollups', '--to', self.today.isoformat(), stdout=StringIO()) # noqa
+
+    def test_backfill_command_defaults_to_yesterday(self):
+        self.transaction(self.today - timedelta(days=3), '5')
+        self.transaction(self.today, '7')
+        out = StringIO()
+
+        call_command('backfill_wallet_rollups', stdout=out)
+
+        self.assertIn('Rebuilt 3 days', out.getvalue())
+        self.assertFalse(WalletDailyRollup.objects.filter(day=self.today).exists())
+
+
+class WalletStatsAPITests(TestCase):
+    def setUp(self):
+        self.sender, self.recipient = create_wallets(2)
+        self.client = APIClient()
+        self.client.force_authenticate(self.sender.user)
+
+    def test_transfers_show_up_in_the_stats_of_both_wallets(self):
+        for _ in range(2):
+            self.client.post('/api/v1/transfer/', {
+                'sender_id': self.sender.id,
+                'recipient_id': self.recipient.id,
+                'amount': '10'
+            }, format='json')
+
+        sender = self.client.get(f'/api/v1/wallets/{self.sender.id}/stats/').json()
+        recipient = self.client.get(f'/api/v1/wallets/{self.recipient.id}/stats/').json()
+
+        self.assertEqual(Decimal(sender['totals']['outflow']), Decimal('20'))
+        self.assertEqual(sender['totals']['transfers_out'], 2)
+        self.assertEqual(Decimal(recipient['totals']['inflow']), Decimal('20'))
+        self.assertEqual(len(recipient['days']), 1)
+
+    def test_unknown_wallet_is_not_found(self):
+        response = self.client.get('/api/v1/wallets/999999/stats/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_reversed_range_is_rejected(self):
+        today = timezone.localdate()
+        response = self.client.get(
+            f'/api/v1/wallets/{self.sender.id}/stats/',
+            {'date_from': today.isoformat(), 'date_to': (today - timedelta(days=1)).isoformat()}
+        )
+        self.assertEqual(response.status_code, 400)
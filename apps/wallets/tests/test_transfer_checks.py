@@ -0,0 +1,55 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+
+from apps.wallets.models.transaction import Transaction
+from apps.wallets.tests.helpers import balances
+from apps.wallets.tests.helpers import create_wallets
+
+from src.settings.config.config import config
+
+
+class TransferWalletCheckTests(TestCase):
+    def setUp(self):
+        self.wallets = create_wallets(2)
+        self.client = APIClient()
+        self.client.force_authenticate(self.wallets[0].user)
+
+    def post(self, sender_id, recipient_id):
+        return self.client.post('/api/v1/transfer/', {
+            'sender_id': sender_id,
+            'recipient_id': recipient_id,
+            'amount': '10'
+        }, format='json')
+
+    def assert_rejected(self, response, message):
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': {api_settings.NON_FIELD_ERRORS_KEY: [message]}})
+        self.assertFalse(Transaction.objects.exists())
+        self.assertEqual(balances(self.wallets), [Decimal('5000')] * 2)
+
+    def test_missing_wallets_are_reported_like_serializer_errors(self):
+        sender, recipient = self.wallets
+        self.assert_rejected(self.post(sender.id, recipient.id + 100), "Destination wallet does not exist") # noqa
+        self.assert_rejected(self.post(sender.id + 100, recipient.id), "Source wallet does not exist") # noqa
+
+    def test_foreign_sender_wallet_is_rejected_when_ownership_is_enforced(self):
+        sender, recipient = self.wallets
+        with mock.patch.object(config.wallet, 'TRANSFER_ENFORCE_OWNERSHIP', True):
+            response = self.post(recipient.id, sender.id)
+
+        self.assert_rejected(response, "Source wallet does not belong to the current user")
+
+    def test_staff_may_transfer_from_any_wallet(self):
+        sender, recipient = self.wallets
+        self.client.force_authenticate(User.objects.create(username='staff', is_staff=True))
+        with mock.patch.object(config.wallet, 'TRANSFER_ENFORCE_OWNERSHIP', True):
+            response = self.post(recipient.id, sender.id)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(balances(self.wallets), [Decimal('5010'), Decimal('4990')])
@@ -0,0 +1,61 @@
+import time
+
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+from django.db.models import F
+
+from rest_framework.test import APIClient
+
+from apps.wallets.models.wallet import Wallet
+from apps.wallets.services.cache import LocalWalletStore
+from apps.wallets.views.wallet import WalletDetailAPIView
+from apps.wallets.tests.helpers import create_wallets
+
+
+class LocalWalletStoreTests(TestCase):
+    def setUp(self):
+        self.store = LocalWalletStore(max_entries=2, ttl=60)
+
+    def test_older_versions_never_replace_a_balance(self):
+        fields = {'username': 'alice'}
+
+        self.assertEqual(self.store.store([('w:1', 2, '20.00', fields)]), [True])
+        self.assertEqual(self.store.store([('w:1', 1, '10.00', {})]), [False])
+        self.assertEqual(self.store.store([('w:1', 3, '30.00', {})]), [True])
+
+        self.assertEqual(self.store.get('w:1'), {'username': 'alice', 'version': '3', 'balance': '30.00'}) # noqa
+
+    def test_least_recently_used_entries_are_evicted(self):
+        self.store.store([('w:1', 1, '1.00', {}), ('w:2', 1, '2.00', {})])
+        self.store.get('w:1')
+        self.store.store([('w:3', 1, '3.00', {})])
+
+        self.assertEqual(self.store.get('w:2'), {})
+        self.assertEqual(self.store.get('w:1')['balance'], '1.00')
+
+    def test_expired_entries_are_misses(self):
+        self.store.store([('w:1', 1, '1.00', {})])
+        with mock.patch('apps.wallets.services.cache.time.monotonic', return_value=time.monotonic() + 61): # noqa
+            self.assertEqual(self.store.get('w:1'), {})
+
+
+class WalletUpdateTests(TestCase):
+    def setUp(self):
+        self.wallet, = create_wallets(1, balance='100')
+        self.client = APIClient()
+        self.client.force_authenticate(self.wallet.user)
+
+    def test_update_keeps_a_balance_changed_concurrently(self):
+        stale = Wallet.objects.select_related('user').get(id=self.wallet.id)
+        Wallet.objects.filter(id=self.wallet.id).update(balance=Decimal('40'), version=F('version') + 1) # noqa
+
+        for method in ('put', 'patch'):
+            with mock.patch.object(WalletDetailAPIView, 'get_object', return_value=stale):
+                response = getattr(self.client, method)(f'/api/v1/wallets/{self.wallet.id}/', {}, format='json') # noqa
+            self.assertEqual(response.status_code, 200)
+
+        self.wallet.refresh_from_db()
+        self.assertEqual(self.wallet.balance, Decimal('40'))
+        self.assertEqual(self.wallet.version, 1)
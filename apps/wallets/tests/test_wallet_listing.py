@@ -0,0 +1,38 @@
+import json
+
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+
+from apps.wallets.tests.helpers import create_wallets
+
+
+class WalletListingTests(TestCase):
+    def setUp(self):
+        self.wallets = create_wallets(12)
+        self.client = APIClient()
+        self.client.force_authenticate(self.wallets[0].user)
+
+    def test_cursor_visits_every_wallet_once(self):
+        ids = []
+        cursor = None
+        while True:
+            page = self.client.get('/api/v1/wallets/?limit=5' + (f'&after={cursor}' if cursor else '')).json() # noqa
+            ids += [wallet['id'] for wallet in page['results']]
+            cursor = page['next']
+            if not cursor:
+                break
+
+        self.assertEqual(ids, [wallet.id for wallet in self.wallets])
+
+    def test_stream_returns_every_wallet_as_ndjson(self):
+        response = self.client.get('/api/v1/wallets/?stream=true')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        self.assertEqual([json.loads(line)['id'] for line in lines], [wallet.id for wallet in self.wallets]) # noqa
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get('/api/v1/wallets/?after=abc')
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,165 @@
+"""
+API view bases
+"""
+
+from asgiref.sync import sync_to_async
+
+from django.views import View
+from django.http import JsonResponse
+from django.utils.decorators import classonlymethod
+
+from rest_framework import status
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.utils import encoders
+from rest_framework.settings import api_settings
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.permissions import IsAuthenticated
+
+from src.settings.db.router import use_replica
+from src.settings.db.router import replica_reads
+from src.settings.db.router import pin_to_primary
+
+
+def json_response(data, status_code=status.HTTP_200_OK, **kwargs):
+    """
+    Render data as JSON with the encoder DRF responses use.
+
+    :param data: Response body
+    :param status_code: HTTP status code
+    :return: JSON response
+    :rtype: django.http.JsonResponse
+    """
+    return JsonResponse(
+        data,
+        status=status_code,
+        encoder=encoders.JSONEncoder,
+        safe=False,
+        **kwargs
+    )
+
+
+def is_successful_write(request, response) -> bool:
+    return (
+        request.method not in SAFE_METHODS
+        and response.status_code < status.HTTP_400_BAD_REQUEST
+        and request.user.is_authenticated
+    )
+
+
+class ReplicaReadMixin:
+    """
+    Serve the reads of a DRF view from a read replica.
+
+    Safe methods run with `replica_reads` set, unless the user wrote within the
+    last `DB_REPLICA_STICKY_SECONDS`. Successful writes pin the user to the primary
+    for that window, so views that only write use the mixin as well.
+    """
+
+    replica_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if use_replica(request):
+            self.replica_token = replica_reads.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if self.replica_token is not None:
+            replica_reads.reset(self.replica_token)
+            self.replica_token = None
+        if is_successful_write(request, response):
+            pin_to_primary(request.user.pk)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class AsyncAPIView(View):
+    """
+    Base class for native async API views.
+
+    DRF views are sync-only, so under ASGI every request to them runs in a worker
+    thread. Subclasses define ``async`` handlers that receive a DRF `Request`,
+    authenticated and permission-checked like an `APIView`, and return
+    `json_response` results, so database access happens through the async ORM
+    and only blocking steps hop to a thread. Reads are routed to replicas as by
+    `ReplicaReadMixin`.
+    """
+
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    parser_classes = api_settings.DEFAULT_PARSER_CLASSES
+    permission_classes = [IsAuthenticated]
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # Session authentication enforces CSRF itself, as for DRF views.
+        view.csrf_exempt = True
+        return view
+
+    def initialize_request(self, request) -> Request:
+        return Request(
+            request,
+            parsers=[parser() for parser in self.parser_classes],
+            authenticators=[authenticator() for authenticator in self.authentication_classes]
+        )
+
+    def check_permissions(self, request: Request):
+        """
+        Authenticate the request and check every permission class.
+
+        :param request: DRF request object
+        :raises NotAuthenticated: If authentication is required but missing
+        :raises PermissionDenied: If a permission check fails
+        """
+        request.user
+        for permission in [permission() for permission in self.permission_classes]:
+            if not permission.has_permission(request, self):
+                if request.authenticators and not request.successful_authenticator:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied()
+
+    def initial(self, request: Request) -> bool:
+        """
+        Check permissions and decide where the reads of the request go.
+
+        :param request: DRF request object
+        :return: True if the reads of the request may be served by a replica
+        :rtype: bool
+        """
+        self.check_permissions(request)
+        return use_replica(request)
+
+    def handle_exception(self, request: Request, exc: exceptions.APIException):
+        """
+        Render an authentication, permission or parsing error like DRF does.
+        """
+        headers = {}
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            header = request.authenticators[0].authenticate_header(request) if request.authenticators else None # noqa
+            if header:
+                headers['WWW-Authenticate'] = header
+            else:
+                exc.status_code = status.HTTP_403_FORBIDDEN
+        return json_response({'detail': exc.detail}, exc.status_code, headers=headers)
+
+    async def dispatch(self, request, *args, **kwargs):
+        request = self.initialize_request(request)
+        handler = getattr(self, request.method.lower(), None)
+        if request.method.lower() not in self.http_method_names or handler is None:
+            return await self.http_method_not_allowed(request, *args, **kwargs)
+
+        try:
+            replica = await sync_to_async(self.initial)(request)
+        except exceptions.APIException as exc:
+            return self.handle_exception(request, exc)
+
+        token = replica_reads.set(replica)
+        try:
+            response = await handler(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            return self.handle_exception(request, exc)
+        finally:
+            replica_reads.reset(token)
+
+        if is_successful_write(request, response):
+            await sync_to_async(pin_to_primary)(request.user.pk)
+        return response
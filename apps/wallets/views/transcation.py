@@ -2,28 +2,43 @@
 Transaction API view
 """
 
+from django.http import StreamingHttpResponse
+
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.permissions import IsAdminUser
 from rest_framework.permissions import IsAuthenticated
 
-from apps.wallets.models.transaction import Transaction
+from apps.wallets.models.wallet import Wallet
+
+from apps.wallets.services.export import TransactionExportService
+from apps.wallets.services.history import TransactionHistoryService
 from apps.wallets.serializers.transaction import TransactionSerializer
+from apps.wallets.serializers.transaction import TransactionHistoryQuerySerializer
+from apps.wallets.serializers.transaction import TransactionExportQuerySerializer
+from apps.wallets.views.base import AsyncAPIView
+from apps.wallets.views.base import ReplicaReadMixin
+from apps.wallets.views.base import json_response
 
 
-class TransactionHistoryAPIView(APIView):
+class TransactionHistoryAPIView(ReplicaReadMixin, APIView):
     """
-    API endpoint to retrieve the last 50 transactions for a given wallet.
+    API endpoint to retrieve a wallet's transactions, newest first, with keyset pagination.
 
-    Query parameter:
+    Query parameters:
         - wallet_id (int, required): ID of the wallet to fetch transactions for.
+        - limit (int): Page size, 50 by default and at most 200.
+        - before / after (str): Cursors returned by a previous page.
+        - date_from / date_to (datetime): Creation date range.
+        - transaction_type / status (str): Exact filters.
 
     :param request: DRF request object
     :type request: rest_framework.request.Request
-    :return: JSON response containing serialized transactions or an error message
+    :return: JSON response containing a page of serialized transactions or an error message
     :rtype: rest_framework.response.Response
     """
     permission_classes = [IsAuthenticated]
@@ -35,12 +50,74 @@ class TransactionHistoryAPIView(APIView):
         type=openapi.TYPE_INTEGER,
         required=True
     )
+    limit_param = openapi.Parameter(
+        'limit',
+        openapi.IN_QUERY,
+        description="Page size (default 50, max 200)",
+        type=openapi.TYPE_INTEGER
+    )
+    before_param = openapi.Parameter(
+        'before',
+        openapi.IN_QUERY,
+        description="Cursor from a previous page's `before` field, returns older transactions",
+        type=openapi.TYPE_STRING
+    )
+    after_param = openapi.Parameter(
+        'after',
+        openapi.IN_QUERY,
+        description="Cursor from a previous page's `after` field, returns newer transactions",
+        type=openapi.TYPE_STRING
+    )
+    date_from_param = openapi.Parameter(
+        'date_from',
+        openapi.IN_QUERY,
+        description="Only transactions created at or after this time",
+        type=openapi.TYPE_STRING,
+        format=openapi.FORMAT_DATETIME
+    )
+    date_to_param = openapi.Parameter(
+        'date_to',
+        openapi.IN_QUERY,
+        description="Only transactions created before this time",
+        type=openapi.TYPE_STRING,
+        format=openapi.FORMAT_DATETIME
+    )
+    transaction_type_param = openapi.Parameter(
+        'transaction_type',
+        openapi.IN_QUERY,
+        description="Only transactions of this type",
+        type=openapi.TYPE_STRING
+    )
+    status_param = openapi.Parameter(
+        'status',
+        openapi.IN_QUERY,
+        description="Only transactions with this status",
+        type=openapi.TYPE_STRING
+    )
 
     @swagger_auto_schema(
-        operation_description="Retrieve the last 50 transactions for a specific wallet",
-        manual_parameters=[wallet_id_param],
+        operation_description="Retrieve a page of transactions for a specific wallet, newest first",
+        manual_parameters=[
+            wallet_id_param,
+            limit_param,
+            before_param,
+            after_param,
+            date_from_param,
+            date_to_param,
+            transaction_type_param,
+            status_param
+        ],
         responses={
-            200: TransactionSerializer(many=True),
+            200: openapi.Response(
+                'Page of transactions',
+                examples={
+                    'application/json': {
+                        'results': [],
+                        'before': 'WyIyMDI1LTAxLTAxVDAwOjAwOjAwKzAwOjAwIiwxMjNd',
+                        'after': None
+                    }
+                }
+            ),
             400: openapi.Response(
                 'Bad Request',
                 examples={'application/json': {'error': 'wallet_id parameter is required'}}
@@ -49,11 +126,11 @@ class TransactionHistoryAPIView(APIView):
     )
     def get(self, request):
         """
-        GET method to fetch the last 50 transactions for a specified wallet.
+        GET method to fetch a page of transactions for a specified wallet.
 
         :param request: DRF request object
         :type request: rest_framework.request.Request
-        :return: JSON response containing a list of serialized transactions or error message
+        :return: JSON response containing serialized transactions and page cursors or error message
         :rtype: rest_framework.response.Response
         """
         wallet_id = request.query_params.get('wallet_id')
@@ -64,13 +141,191 @@ class TransactionHistoryAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        transactions = Transaction.objects.filter(
-            sender_id=wallet_id
-        ) | Transaction.objects.filter(
-            recipient_id=wallet_id
+        if not wallet_id.isdigit():
+            return Response(
+                {'error': 'wallet_id must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        query = TransactionHistoryQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(
+                {'error': query.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        params = query.validated_data
+        try:
+            page = TransactionHistoryService.get_page(
+                wallet_id=int(wallet_id),
+                limit=params['limit'],
+                before=params.get('before'),
+                after=params.get('after'),
+                filters=params
+            )
+        except ValueError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        page['results'] = TransactionSerializer(page['results'], many=True).data
+        return Response(page)
+
+
+class TransactionExportAPIView(ReplicaReadMixin, APIView):
+    """
+    API endpoint streaming complete transaction histories for audits, oldest first.
+
+    Query parameters:
+        - wallet_id (int): Only transactions sent or received by this wallet.
+        - date_from / date_to (datetime): Creation date range, required without wallet_id.
+        - file_format (str): ``csv`` (default) or ``ndjson``.
+        - compress (bool): Gzip the file.
+    """
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_description="""
+        Stream every transaction of a wallet, or every transaction of a date range,
+        as a CSV or NDJSON attachment.
+
+        Rows are read through a server-side cursor and written to the response as
+        they arrive, so exports of any size use constant memory.
+        """,
+        manual_parameters=[
+            openapi.Parameter(
+                'wallet_id',
+                openapi.IN_QUERY,
+                description="Only transactions sent or received by this wallet",
+                type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                'date_from',
+                openapi.IN_QUERY,
+                description="Only transactions created at or after this time",
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_DATETIME
+            ),
+            openapi.Parameter(
+                'date_to',
+                openapi.IN_QUERY,
+                description="Only transactions created before this time",
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_DATETIME
+            ),
+            openapi.Parameter(
+                'file_format',
+                openapi.IN_QUERY,
+                description="csv (default) or ndjson",
+                type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'compress',
+                openapi.IN_QUERY,
+                description="Gzip the file",
+                type=openapi.TYPE_BOOLEAN
+            ),
+        ],
+        responses={
+            200: "Streamed CSV or NDJSON file",
+            400: openapi.Response(
+                'Bad Request',
+                examples={
+                    'application/json': {
+                        'error': {
+                            'non_field_errors': [
+                                "Either 'wallet_id' or both 'date_from' and 'date_to' are required" # noqa
+                            ]
+                        }
+                    }
+                }
+            ),
+            404: "Wallet not found"
+        }
+    )
+    def get(self, request):
+        """
+        Stream the transactions selected by the query parameters.
+
+        :param request: DRF request object
+        :type request: rest_framework.request.Request
+        :return: Streaming file response, or error message (400/404)
+        :rtype: django.http.StreamingHttpResponse
+        """
+        query = TransactionExportQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response({'error': query.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        params = query.validated_data
+        wallet_id = params.get('wallet_id')
+        if wallet_id is not None and not Wallet.objects.filter(id=wallet_id).exists():
+            return Response({'error': 'Wallet not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        rows = TransactionExportService.queryset(
+            wallet_id=wallet_id,
+            date_from=params.get('date_from'),
+            date_to=params.get('date_to')
         )
+        fmt = params['file_format']
+        # The stream is read after the view returns, so bind it to the database chosen now.
+        chunks = TransactionExportService.stream(rows.using(rows.db), fmt)
+        if params['compress']:
+            chunks = TransactionExportService.compress(chunks)
 
-        transactions = transactions.order_by('-created_at')[:50]
-        serializer = TransactionSerializer(transactions, many=True)
+        response = StreamingHttpResponse(
+            chunks,
+            content_type='application/gzip' if params['compress'] else TransactionExportService.CONTENT_TYPES[fmt] # noqa
+        )
+        filename = TransactionExportService.filename(fmt, params['compress'], wallet_id)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class AsyncTransactionHistoryAPIView(AsyncAPIView):
+    """
+    Async variant of `TransactionHistoryAPIView` for the ASGI deployment,
+    reading the page through the async ORM.
+    """
+
+    async def get(self, request):
+        """
+        GET method to fetch a page of transactions for a specified wallet.
+
+        :param request: DRF request object
+        :type request: rest_framework.request.Request
+        :return: JSON response containing serialized transactions and page cursors or error message
+        :rtype: django.http.JsonResponse
+        """
+        wallet_id = request.query_params.get('wallet_id')
+
+        if not wallet_id:
+            return json_response(
+                {'error': 'wallet_id parameter is required'},
+                status.HTTP_400_BAD_REQUEST
+            )
+
+        if not wallet_id.isdigit():
+            return json_response(
+                {'error': 'wallet_id must be an integer'},
+                status.HTTP_400_BAD_REQUEST
+            )
+
+        query = TransactionHistoryQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return json_response({'error': query.errors}, status.HTTP_400_BAD_REQUEST)
+
+        params = query.validated_data
+        try:
+            page = await TransactionHistoryService.aget_page(
+                wallet_id=int(wallet_id),
+                limit=params['limit'],
+                before=params.get('before'),
+                after=params.get('after'),
+                filters=params
+            )
+        except ValueError as e:
+            return json_response({'error': str(e)}, status.HTTP_400_BAD_REQUEST)
 
-        return Response(serializer.data)
+        page['results'] = TransactionSerializer(page['results'], many=True).data
+        return json_response(page)
@@ -2,6 +2,10 @@
 Transfer API view
 """
 
+from asgiref.sync import sync_to_async
+
+from django.db import IntegrityError
+
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 
@@ -11,19 +15,116 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
 from apps.wallets.services.transfer import TransferService
+from apps.wallets.services.idempotency import IdempotencyService
 from apps.wallets.serializers.transfer import TransferSerializer
+from apps.wallets.serializers.transfer import BatchTransferSerializer
+from apps.wallets.exceptions.transfer import HotWalletBusyError
+from apps.wallets.exceptions.transfer import HotWalletQueueError
+from apps.wallets.exceptions.transfer import TransferValidationError
+from apps.wallets.exceptions.idempotency import IdempotencyKeyReusedError
+from apps.wallets.views.base import AsyncAPIView
+from apps.wallets.views.base import ReplicaReadMixin
+from apps.wallets.views.base import json_response
 
+from src.settings.config.config import config
 from src.settings.utils.logging import logger
 
 
-class TransferAPIView(APIView):
+def get_owner_id(request):
+    """
+    Return the user ID sender wallets must belong to, if ownership is enforced.
+
+    Staff users may transfer from any wallet.
+
+    :param request: DRF request object
+    :return: User ID, or None if ownership is not enforced for this request
+    """
+    if not config.wallet.TRANSFER_ENFORCE_OWNERSHIP or request.user.is_staff:
+        return None
+    return request.user.id
+
+
+idempotency_key_header = openapi.Parameter(
+    IdempotencyService.HEADER,
+    openapi.IN_HEADER,
+    description="Optional key making retries of the same request return the stored response",
+    type=openapi.TYPE_STRING
+)
+
+
+def replay_idempotent(request):
+    """
+    Return the stored response for the request's `Idempotency-Key`, if any.
+
+    :param request: DRF request object
+    :return: Replayed or error response, or None if the request must be executed
+    :rtype: rest_framework.response.Response | None
+    """
+    key = request.headers.get(IdempotencyService.HEADER)
+    if key is None:
+        return None
+
+    if not key or len(key) > IdempotencyService.MAX_KEY_LENGTH:
+        return Response(
+            {'error': f'{IdempotencyService.HEADER} must be 1-{IdempotencyService.MAX_KEY_LENGTH} characters'}, # noqa
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        stored = IdempotencyService.lookup(
+            request.user.id,
+            key,
+            IdempotencyService.fingerprint(request.data)
+        )
+    except IdempotencyKeyReusedError as e:
+        return Response({'error': str(e)}, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    if stored is None:
+        return None
+
+    response, status_code = stored
+    return Response(response, status=status_code, headers={'Idempotent-Replayed': 'true'})
+
+
+def execute_idempotent(request, operation, status_code):
+    """
+    Run an operation, storing its response under the request's `Idempotency-Key` if sent.
+
+    :param request: DRF request object
+    :param operation: Callable returning the response body
+    :param status_code: HTTP status code of a successful response
+    :return: Response with the operation result, or the replayed response of a concurrent retry
+    :rtype: rest_framework.response.Response
+    """
+    key = request.headers.get(IdempotencyService.HEADER)
+    if key is None:
+        return Response(operation(), status=status_code)
+
+    try:
+        result = IdempotencyService.execute(
+            request.user.id,
+            key,
+            IdempotencyService.fingerprint(request.data),
+            operation,
+            status_code
+        )
+    except IntegrityError:
+        replayed = replay_idempotent(request)
+        if replayed is None:
+            raise
+        return replayed
+
+    return Response(result, status=status_code)
+
+
+class TransferAPIView(ReplicaReadMixin, APIView):
     """
     Wallet-to-wallet transfer API with race condition protection.
 
     Features:
         - Atomic transactions with `select_for_update` and F-expressions
-        - 10% commission for transfers >1000 units, credited to admin wallet (ID=1)
-        - Asynchronous Celery notification with 3 automatic retries
+        - 10% commission for transfers >1000 units, accrued for the admin wallet (ID=1)
+        - Asynchronous Celery notification retried with capped, jittered exponential backoff
     """
 
     permission_classes = [IsAuthenticated]
@@ -39,13 +140,33 @@ class TransferAPIView(APIView):
 
         Commission:
             - 10% commission for transfers > 1000 units
-            - Commission credited to admin wallet (ID=1)
+            - Commission accrued without locking the admin wallet (ID=1)
+            - Accruals settled into the admin wallet by a periodic task
 
         Asynchronous Notification:
             - Notification sent via Celery after successful transfer
-            - Automatic retry on failure (3 attempts, 3 seconds apart)
+            - Notifications to one recipient within a short window are sent as one digest
+            - Failed deliveries retried up to `CELERY_NOTIFY_MAX_RETRIES` times after a
+              capped, jittered exponential backoff (`CELERY_NOTIFY_RETRY_*`)
+            - A shared circuit breaker pauses deliveries while the endpoint keeps failing
+            - Notifications that exhausted their retries are kept in a dead-letter table
+              and replayed by `python manage.py redrive_dead_letters`
+
+        Idempotency:
+            - Send an `Idempotency-Key` header to make retries safe
+            - A retry with the same key and payload returns the stored 201 response
+              with an `Idempotent-Replayed: true` header, without executing again
+            - Reusing a key with a different payload returns 422
+
+        Hot Wallets:
+            - Without an `Idempotency-Key`, transfers touching a hot wallet are applied
+              in batches by the single writer of that wallet
+            - 503 means the transfer expired in the queue unapplied and can be retried
+            - 504 means the queue did not answer in time and the transfer may still
+              have been applied; check the wallet history before retrying
         """,
         request_body=TransferSerializer,
+        manual_parameters=[idempotency_key_header],
         responses={
             201: openapi.Response(
                 description="Transfer completed successfully",
@@ -69,7 +190,9 @@ class TransferAPIView(APIView):
                 }
             ),
             401: "Unauthorized",
-            500: "Internal server error"
+            500: "Internal server error",
+            503: "Hot wallet busy, the transfer was not applied and can be retried",
+            504: "Hot wallet queue did not answer in time, the transfer outcome is unknown"
         },
         tags=['Transfers'],
         security=[{'Token': []}]
@@ -83,7 +206,11 @@ class TransferAPIView(APIView):
         :return: JSON response with transfer result or error message
         :rtype: rest_framework.response.Response
         """
-        serializer = TransferSerializer(data=request.data)
+        replayed = replay_idempotent(request)
+        if replayed is not None:
+            return replayed
+
+        serializer = TransferSerializer(data=request.data, check_wallets=False)
 
         if not serializer.is_valid():
             return Response(
@@ -92,23 +219,252 @@ class TransferAPIView(APIView):
             )
 
         try:
-            result = TransferService.execute_transfer(
-                sender_id=serializer.validated_data['sender_id'],
-                recipient_id=serializer.validated_data['recipient_id'],
-                amount=serializer.validated_data['amount'],
-                description=serializer.validated_data.get('description', '')
+            return execute_idempotent(
+                request,
+                lambda: TransferService.execute_transfer(
+                    sender_id=serializer.validated_data['sender_id'],
+                    recipient_id=serializer.validated_data['recipient_id'],
+                    amount=serializer.validated_data['amount'],
+                    description=serializer.validated_data.get('description', ''),
+                    owner_id=get_owner_id(request)
+                ),
+                status.HTTP_201_CREATED
+            )
+
+        except TransferValidationError as e:
+            return Response(
+                {'error': e.detail},
+                status=status.HTTP_400_BAD_REQUEST
             )
+        except HotWalletBusyError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        except HotWalletQueueError as e:
+            logger.error("Transfer outcome unknown: %s", e)
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_504_GATEWAY_TIMEOUT
+            )
+        except ValueError as e:
+            logger.warning("Transfer validation error: %s", e)
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            logger.error("Transfer error: %s", e, exc_info=True)
+            return Response(
+                {'error': 'Internal server error'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class AsyncTransferAPIView(AsyncAPIView):
+    """
+    Async variant of `TransferAPIView` for the ASGI deployment.
+
+    The request is parsed and validated on the event loop. The transfer runs
+    through `TransferService.aexecute_transfer`; with an `Idempotency-Key`, the
+    replay lookup and the transfer run together in one hop to the database thread.
+    """
+
+    @staticmethod
+    def execute_with_key(request, data, owner_id):
+        replayed = replay_idempotent(request)
+        if replayed is not None:
+            return replayed
+
+        return execute_idempotent(
+            request,
+            lambda: TransferService.execute_transfer(
+                sender_id=data['sender_id'],
+                recipient_id=data['recipient_id'],
+                amount=data['amount'],
+                description=data.get('description', ''),
+                owner_id=owner_id
+            ),
+            status.HTTP_201_CREATED
+        )
+
+    async def post(self, request):
+        """
+        Create a wallet-to-wallet transfer.
+
+        :param request: DRF request object containing transfer data
+        :type request: rest_framework.request.Request
+        :return: JSON response with transfer result or error message
+        :rtype: django.http.JsonResponse
+        """
+        serializer = TransferSerializer(data=request.data, check_wallets=False)
+
+        if not serializer.is_valid():
+            return json_response({'error': serializer.errors}, status.HTTP_400_BAD_REQUEST)
+
+        data = serializer.validated_data
+        owner_id = get_owner_id(request)
+
+        try:
+            if request.headers.get(IdempotencyService.HEADER) is None:
+                result = await TransferService.aexecute_transfer(
+                    sender_id=data['sender_id'],
+                    recipient_id=data['recipient_id'],
+                    amount=data['amount'],
+                    description=data.get('description', ''),
+                    owner_id=owner_id
+                )
+                return json_response(result, status.HTTP_201_CREATED)
+
+            response = await sync_to_async(self.execute_with_key)(request, data, owner_id)
+            headers = {}
+            if response.has_header('Idempotent-Replayed'):
+                headers['Idempotent-Replayed'] = response['Idempotent-Replayed']
+            return json_response(response.data, response.status_code, headers=headers)
+
+        except TransferValidationError as e:
+            return json_response({'error': e.detail}, status.HTTP_400_BAD_REQUEST)
+        except HotWalletBusyError as e:
+            return json_response({'error': str(e)}, status.HTTP_503_SERVICE_UNAVAILABLE)
+        except HotWalletQueueError as e:
+            logger.error("Transfer outcome unknown: %s", e)
+            return json_response({'error': str(e)}, status.HTTP_504_GATEWAY_TIMEOUT)
+        except ValueError as e:
+            logger.warning("Transfer validation error: %s", e)
+            return json_response({'error': str(e)}, status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.error("Transfer error: %s", e, exc_info=True)
+            return json_response(
+                {'error': 'Internal server error'},
+                status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class BatchRejected(Exception):
+    """
+    Every transfer of a per-item batch failed; nothing is committed or stored.
+    """
+
+    def __init__(self, result):
+        super().__init__("All transfers in the batch failed")
+        self.result = result
+
+
+class BatchTransferAPIView(ReplicaReadMixin, APIView):
+    """
+    Batch transfer API executing many wallet-to-wallet transfers in one database transaction.
+
+    Features:
+        - All involved wallets locked once, in sorted order
+        - One set-based balance update and one bulk insert per batch
+        - All-or-nothing or per-item semantics
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="""
+        Execute up to 1000 wallet-to-wallet transfers in a single database transaction.
+
+        Transfers are validated and applied in request order against running balances,
+        with the same commission rules as the single transfer endpoint.
+
+        Semantics:
+            - `atomic=true` (default): any failing transfer rolls back the whole batch
+            - `atomic=false`: failing transfers are reported per item, the rest are committed
+
+        Idempotency:
+            - Supports the `Idempotency-Key` header like the single transfer endpoint
+        """,
+        request_body=BatchTransferSerializer,
+        manual_parameters=[idempotency_key_header],
+        responses={
+            201: openapi.Response(
+                description="Batch executed",
+                examples={
+                    "application/json": {
+                        "success": False,
+                        "succeeded": 1,
+                        "failed": 1,
+                        "results": [
+                            {
+                                "success": True,
+                                "index": 0,
+                                "transaction_id": 123,
+                                "transaction_group": "550e8400-e29b-41d4-a716-446655440000",
+                                "amount": "500.00",
+                                "commission": "0.00",
+                                "total_debited": "500.00"
+                            },
+                            {
+                                "success": False,
+                                "index": 1,
+                                "error": "Destination wallet does not exist",
+                                "reason": "wallet_not_found"
+                            }
+                        ]
+                    }
+                }
+            ),
+            400: openapi.Response(
+                description="Validation error, or a failing transfer in an atomic batch",
+                examples={
+                    "application/json": {
+                        "error": "Transfer #3: Insufficient funds. Available: 10.00, Required: 20.00"
+                    }
+                }
+            ),
+            401: "Unauthorized",
+            500: "Internal server error"
+        },
+        tags=['Transfers'],
+        security=[{'Token': []}]
+    )
+    def post(self, request):
+        """
+        Create a batch of wallet-to-wallet transfers.
+
+        :param request: DRF request object containing batch data
+        :type request: rest_framework.request.Request
+        :return: JSON response with per-item results or error message
+        :rtype: rest_framework.response.Response
+        """
+        replayed = replay_idempotent(request)
+        if replayed is not None:
+            return replayed
+
+        serializer = BatchTransferSerializer(data=request.data)
+
+        if not serializer.is_valid():
+            return Response(
+                {'error': serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        def operation():
+            result = TransferService.execute_batch(
+                transfers=serializer.validated_data['transfers'],
+                atomic=serializer.validated_data['atomic'],
+                owner_id=get_owner_id(request)
+            )
+            if not result['succeeded']:
+                raise BatchRejected(result)
+            return result
+
+        try:
+            return execute_idempotent(request, operation, status.HTTP_201_CREATED)
 
-            return Response(result, status=status.HTTP_201_CREATED)
+        except BatchRejected as e:
+            return Response(e.result, status=status.HTTP_400_BAD_REQUEST)
 
         except ValueError as e:
-            logger.warning(f"Transfer validation error: {str(e)}")
+            logger.warning("Batch transfer validation error: %s", e)
             return Response(
                 {'error': str(e)},
                 status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
-            logger.error(f"Transfer error: {str(e)}", exc_info=True)
+            logger.error("Batch transfer error: %s", e, exc_info=True)
             return Response(
                 {'error': 'Internal server error'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
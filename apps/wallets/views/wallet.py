@@ -2,37 +2,155 @@
 Wallet API view
 """
 
+from asgiref.sync import sync_to_async
+
+from django.db import router
+from django.db import transaction
+from django.http import HttpResponse
+from django.http import StreamingHttpResponse
+
+from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 
 from rest_framework import status
 from rest_framework.views import APIView
+from rest_framework.utils import encoders
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
 from apps.wallets.models.wallet import Wallet
 from apps.wallets.serializers.wallet import WalletSerializer
+from apps.wallets.serializers.wallet import WalletListQuerySerializer
+from apps.wallets.serializers.wallet import WalletStatsQuerySerializer
+from apps.wallets.serializers.wallet import WalletDailyRollupSerializer
+from apps.wallets.serializers.wallet import WalletStatsTotalsSerializer
+from apps.wallets.services.cache import WalletCacheService
+from apps.wallets.services.rollup import RollupService
+from apps.wallets.views.base import AsyncAPIView
+from apps.wallets.views.base import ReplicaReadMixin
+from apps.wallets.views.base import json_response
+
+from src.settings.utils.pagination import encode_cursor
+from src.settings.utils.pagination import decode_cursor
+
+
+def stream_wallets(queryset, chunk_size):
+    """
+    Yield wallets as NDJSON lines, reading them through a server-side cursor.
+
+    :param queryset: Wallet queryset with the user joined
+    :param chunk_size: Number of rows fetched from the cursor at a time
+    :return: Generator of encoded NDJSON lines
+    """
+    serializer = WalletSerializer()
+    encoder = encoders.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    for wallet in queryset.iterator(chunk_size=chunk_size):
+        yield (encoder.encode(serializer.to_representation(wallet)) + '\n').encode()
 
 
-class WalletListCreateAPIView(APIView):
+async def astream_wallets(queryset, chunk_size):
+    """
+    Async variant of `stream_wallets`, reading through the async ORM.
+
+    :param queryset: Wallet queryset with the user joined
+    :param chunk_size: Number of rows fetched from the cursor at a time
+    :return: Async generator of encoded NDJSON lines
+    """
+    serializer = WalletSerializer()
+    encoder = encoders.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    async for wallet in queryset.aiterator(chunk_size=chunk_size):
+        yield (encoder.encode(serializer.to_representation(wallet)) + '\n').encode()
+
+
+class WalletListCreateAPIView(ReplicaReadMixin, APIView):
     """
     API view to list all wallets or create a new wallet.
     """
     permission_classes = [IsAuthenticated]
 
+    STREAM_CHUNK_SIZE = 2000
+
     @swagger_auto_schema(
-        operation_description="Retrieve the list of all wallets",
-        responses={200: WalletSerializer(many=True)}
+        operation_description="""
+        Retrieve wallets ordered by ID.
+
+        Pagination:
+            - Pages of `limit` wallets (default 100, max 1000)
+            - Pass the `next` cursor of a page as `after` to fetch the following page
+
+        Streaming:
+            - `stream=true` returns every wallet as NDJSON (`application/x-ndjson`),
+              read through a server-side cursor with constant memory
+        """,
+        manual_parameters=[
+            openapi.Parameter(
+                'limit',
+                openapi.IN_QUERY,
+                description="Page size (default 100, max 1000)",
+                type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                'after',
+                openapi.IN_QUERY,
+                description="Cursor from a previous page's `next` field",
+                type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'stream',
+                openapi.IN_QUERY,
+                description="Stream all wallets as NDJSON instead of paginating",
+                type=openapi.TYPE_BOOLEAN
+            ),
+        ],
+        responses={
+            200: openapi.Response(
+                'Page of wallets',
+                examples={
+                    'application/json': {
+                        'results': [],
+                        'next': 'WzEwMF0'
+                    }
+                }
+            ),
+            400: "Bad Request"
+        }
     )
     def get(self, request):
         """
-        Retrieve all wallets.
+        Retrieve a page of wallets, or stream all wallets as NDJSON.
 
         :param request: HTTP request
-        :return: Response with a list of wallet objects (200 OK)
+        :return: Response with a page of wallet objects (200 OK) or a streaming NDJSON response
         """
-        wallets = Wallet.objects.all()
-        serializer = WalletSerializer(wallets, many=True)
-        return Response(serializer.data)
+        query = WalletListQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response({'error': query.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        params = query.validated_data
+        wallets = Wallet.objects.select_related('user').order_by('id')
+
+        if params['stream']:
+            # The stream is read after the view returns, so bind it to the database chosen now.
+            return StreamingHttpResponse(
+                stream_wallets(wallets.using(wallets.db), self.STREAM_CHUNK_SIZE),
+                content_type='application/x-ndjson'
+            )
+
+        if params.get('after'):
+            try:
+                last_id, = decode_cursor(params['after'], 1)
+                wallets = wallets.filter(id__gt=int(last_id))
+            except (TypeError, ValueError):
+                return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+
+        page = list(wallets[:params['limit'] + 1])
+        has_more = len(page) > params['limit']
+        page = page[:params['limit']]
+
+        return Response({
+            'results': WalletSerializer(page, many=True).data,
+            'next': encode_cursor(page[-1].id) if has_more else None
+        })
 
     @swagger_auto_schema(
         operation_description="Create a new wallet for a user",
@@ -53,21 +171,24 @@ class WalletListCreateAPIView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class WalletDetailAPIView(APIView):
+class WalletDetailAPIView(ReplicaReadMixin, APIView):
     """
     API view to retrieve, update, or delete a wallet by ID.
+
+    Reads are served from `WalletCacheService` when possible, and updates
+    and deletes invalidate the cached wallet.
     """
     permission_classes = [IsAuthenticated]
 
     def get_object(self, wallet_id):
         """
-        Retrieve a wallet object by ID.
+        Retrieve a wallet object by ID, with its user joined.
 
         :param wallet_id: ID of the wallet to retrieve
         :return: Wallet instance if found, None otherwise
         """
         try:
-            return Wallet.objects.get(id=wallet_id)
+            return Wallet.objects.select_related('user').get(id=wallet_id)
         except Wallet.DoesNotExist:
             return None
 
@@ -83,11 +204,14 @@ class WalletDetailAPIView(APIView):
         :param wallet_id: Wallet ID
         :return: Response with wallet data (200) or error (404)
         """
-        wallet = self.get_object(wallet_id)
-        if not wallet:
-            return Response({"error": "Wallet not found"}, status=status.HTTP_404_NOT_FOUND)
-        serializer = WalletSerializer(wallet)
-        return Response(serializer.data)
+        data = WalletCacheService.get(wallet_id)
+        if data is None:
+            wallet = self.get_object(wallet_id)
+            if not wallet:
+                return Response({"error": "Wallet not found"}, status=status.HTTP_404_NOT_FOUND)
+            data = WalletSerializer(wallet).data
+            WalletCacheService.fill(wallet, data)
+        return Response(data)
 
     @swagger_auto_schema(
         operation_description="Update a wallet completely",
@@ -108,6 +232,7 @@ class WalletDetailAPIView(APIView):
         serializer = WalletSerializer(wallet, data=request.data)
         if serializer.is_valid():
             serializer.save()
+            transaction.on_commit(lambda: WalletCacheService.invalidate(wallet_id))
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -130,6 +255,7 @@ class WalletDetailAPIView(APIView):
         serializer = WalletSerializer(wallet, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
+            transaction.on_commit(lambda: WalletCacheService.invalidate(wallet_id))
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -149,4 +275,222 @@ class WalletDetailAPIView(APIView):
         if not wallet:
             return Response({"error": "Wallet not found"}, status=status.HTTP_404_NOT_FOUND)
         wallet.delete()
+        transaction.on_commit(lambda: WalletCacheService.invalidate(wallet_id))
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class WalletStatsAPIView(ReplicaReadMixin, APIView):
+    """
+    API view returning the daily statistics of a wallet, read from its rollups.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="""
+        Retrieve inflow, outflow, commission paid and transfer counts of a wallet
+        per day and in total, from rollups maintained by every transfer.
+
+        Range:
+            - `date_from` and `date_to` are inclusive calendar days
+            - The last 30 days by default, at most 366 days
+        """,
+        manual_parameters=[
+            openapi.Parameter(
+                'date_from',
+                openapi.IN_QUERY,
+                description="First day (default 29 days before date_to)",
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_DATE
+            ),
+            openapi.Parameter(
+                'date_to',
+                openapi.IN_QUERY,
+                description="Last day (default today)",
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_DATE
+            ),
+        ],
+        responses={
+            200: openapi.Response(
+                'Wallet statistics',
+                examples={
+                    'application/json': {
+                        'wallet_id': 2,
+                        'date_from': '2026-01-01',
+                        'date_to': '2026-01-30',
+                        'totals': {
+                            'inflow': '1500.00',
+                            'outflow': '200.00',
+                            'commission_paid': '0.00',
+                            'transfers_in': 3,
+                            'transfers_out': 1
+                        },
+                        'days': []
+                    }
+                }
+            ),
+            400: "Bad Request",
+            404: "Wallet not found"
+        }
+    )
+    def get(self, request, wallet_id):
+        """
+        Get the statistics of a wallet over a range of days.
+
+        :param request: HTTP request
+        :param wallet_id: Wallet ID
+        :return: Response with totals and daily entries (200) or error (400/404)
+        """
+        query = WalletStatsQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response({'error': query.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not Wallet.objects.filter(id=wallet_id).exists():
+            return Response({"error": "Wallet not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        params = query.validated_data
+        stats = RollupService.wallet_stats(wallet_id, params['date_from'], params['date_to'])
+        return Response({
+            'wallet_id': wallet_id,
+            'date_from': params['date_from'],
+            'date_to': params['date_to'],
+            'totals': WalletStatsTotalsSerializer(stats['totals']).data,
+            'days': WalletDailyRollupSerializer(stats['days'], many=True).data
+        })
+
+
+class AsyncWalletListCreateAPIView(AsyncAPIView):
+    """
+    Async variant of `WalletListCreateAPIView` for the ASGI deployment.
+    """
+
+    STREAM_CHUNK_SIZE = WalletListCreateAPIView.STREAM_CHUNK_SIZE
+
+    async def get(self, request):
+        """
+        Retrieve a page of wallets, or stream all wallets as NDJSON.
+
+        :param request: HTTP request
+        :return: Response with a page of wallet objects (200 OK) or a streaming NDJSON response
+        """
+        query = WalletListQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return json_response({'error': query.errors}, status.HTTP_400_BAD_REQUEST)
+
+        params = query.validated_data
+        wallets = Wallet.objects.select_related('user').order_by('id')
+
+        if params['stream']:
+            # Choosing the replica may check its lag, which needs a thread off the event loop.
+            db = await sync_to_async(router.db_for_read)(Wallet)
+            return StreamingHttpResponse(
+                astream_wallets(wallets.using(db), self.STREAM_CHUNK_SIZE),
+                content_type='application/x-ndjson'
+            )
+
+        if params.get('after'):
+            try:
+                last_id, = decode_cursor(params['after'], 1)
+                wallets = wallets.filter(id__gt=int(last_id))
+            except (TypeError, ValueError):
+                return json_response({'error': 'Invalid cursor'}, status.HTTP_400_BAD_REQUEST)
+
+        page = [wallet async for wallet in wallets[:params['limit'] + 1]]
+        has_more = len(page) > params['limit']
+        page = page[:params['limit']]
+
+        return json_response({
+            'results': WalletSerializer(page, many=True).data,
+            'next': encode_cursor(page[-1].id) if has_more else None
+        })
+
+    async def post(self, request):
+        """
+        Create a new wallet.
+
+        :param request: HTTP request with wallet data
+        :return: Response with created wallet data (201) or errors (400)
+        """
+        serializer = WalletSerializer(data=request.data)
+        if serializer.is_valid():
+            await sync_to_async(serializer.save)()
+            return json_response(serializer.data, status.HTTP_201_CREATED)
+        return json_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+
+
+class AsyncWalletDetailAPIView(AsyncAPIView):
+    """
+    Async variant of `WalletDetailAPIView` for the ASGI deployment.
+    """
+
+    async def get_object(self, wallet_id):
+        """
+        Retrieve a wallet object by ID, with its user joined.
+
+        :param wallet_id: ID of the wallet to retrieve
+        :return: Wallet instance if found, None otherwise
+        """
+        return await Wallet.objects.select_related('user').filter(id=wallet_id).afirst()
+
+    async def get(self, request, wallet_id):
+        """
+        Get wallet details by ID.
+
+        :param request: HTTP request
+        :param wallet_id: Wallet ID
+        :return: Response with wallet data (200) or error (404)
+        """
+        data = await sync_to_async(WalletCacheService.get)(wallet_id)
+        if data is None:
+            wallet = await self.get_object(wallet_id)
+            if not wallet:
+                return json_response({"error": "Wallet not found"}, status.HTTP_404_NOT_FOUND)
+            data = WalletSerializer(wallet).data
+            await sync_to_async(WalletCacheService.fill)(wallet, data)
+        return json_response(data)
+
+    async def update(self, request, wallet_id, partial):
+        wallet = await self.get_object(wallet_id)
+        if not wallet:
+            return json_response({"error": "Wallet not found"}, status.HTTP_404_NOT_FOUND)
+        serializer = WalletSerializer(wallet, data=request.data, partial=partial)
+        if serializer.is_valid():
+            await sync_to_async(serializer.save)()
+            await sync_to_async(WalletCacheService.invalidate)(wallet_id)
+            return json_response(serializer.data)
+        return json_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+
+    async def put(self, request, wallet_id):
+        """
+        Fully update a wallet by ID.
+
+        :param request: HTTP request with wallet data
+        :param wallet_id: Wallet ID
+        :return: Response with updated wallet (200) or error (404/400)
+        """
+        return await self.update(request, wallet_id, partial=False)
+
+    async def patch(self, request, wallet_id):
+        """
+        Partially update wallet fields.
+
+        :param request: HTTP request with wallet data
+        :param wallet_id: Wallet ID
+        :return: Response with updated wallet (200) or error (404/400)
+        """
+        return await self.update(request, wallet_id, partial=True)
+
+    async def delete(self, request, wallet_id):
+        """
+        Delete a wallet by ID.
+
+        :param request: HTTP request
+        :param wallet_id: Wallet ID
+        :return: Response with 204 if deleted or 404 if wallet not found
+        """
+        wallet = await self.get_object(wallet_id)
+        if not wallet:
+            return json_response({"error": "Wallet not found"}, status.HTTP_404_NOT_FOUND)
+        await wallet.adelete()
+        await sync_to_async(WalletCacheService.invalidate)(wallet_id)
+        return HttpResponse(status=status.HTTP_204_NO_CONTENT)
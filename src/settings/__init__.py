@@ -7,4 +7,5 @@ from .internal.wallets import * # noqa
 from .external.drf import * # noqa
 from .external.cors import * # noqa
 from .external.swagger import * # noqa
+from .external.cache import * # noqa
 from .dashboard import * # noqa
\ No newline at end of file
@@ -27,6 +27,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "src.settings.utils.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -41,7 +42,7 @@ ROOT_URLCONF = "src.urls"
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
-        "DIRS": [],
+        "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
             "context_processors": [
@@ -59,14 +60,7 @@ WSGI_APPLICATION = "src.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
-
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
-}
-
+# Configured from DatabaseSettings in src/settings/db
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -114,6 +108,17 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # Logging configs
 
+if config.log.LOG_QUEUE_ENABLED:
+    LOG_HANDLER = {
+        "()": "src.settings.utils.logging.AsyncQueueHandler",
+        "queue_size": config.log.LOG_QUEUE_SIZE,
+    }
+else:
+    LOG_HANDLER = {
+        "class": "logging.StreamHandler",
+        "stream": sys.stdout,
+    }
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -121,19 +126,27 @@ LOGGING = {
         "standard": {
             "format": "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
         },
+        "json": {
+            "()": "src.settings.utils.logging.JsonFormatter",
+        },
+    },
+    "filters": {
+        "sampling": {
+            "()": "src.settings.utils.logging.SamplingFilter",
+            "rates": config.log.LOG_SAMPLE_RATES,
+        },
     },
     "handlers": {
         "console": {
-            "level": "DEBUG",
-            "class": "logging.StreamHandler",
-            "stream": sys.stdout,
-            "formatter": "standard",
+            **LOG_HANDLER,
+            "formatter": "json" if config.log.LOG_FORMAT == "json" else "standard",
+            "filters": ["sampling"],
         },
     },
     "loggers": {
         "": {
             "handlers": ["console"],
-            "level": "DEBUG",
+            "level": config.log.LOG_LEVEL,
             "propagate": True,
         },
     },
@@ -17,6 +17,19 @@ class DatabaseSettings:
     DB_HOST: str = env.str("DB_HOST")
     DB_PORT: int = env.int("DB_PORT")
     DB_URL: str = env.str("DB_URL", "")
+    DB_CONN_MAX_AGE: int = env.int("DB_CONN_MAX_AGE", 0)
+    DB_CONN_HEALTH_CHECKS: bool = env.bool("DB_CONN_HEALTH_CHECKS", True)
+    DB_DISABLE_SERVER_SIDE_CURSORS: bool = env.bool("DB_DISABLE_SERVER_SIDE_CURSORS", False)
+    DB_POOL_ENABLED: bool = env.bool("DB_POOL_ENABLED", True)
+    DB_POOL_MIN_SIZE: int = env.int("DB_POOL_MIN_SIZE", 2)
+    DB_POOL_MAX_SIZE: int = env.int("DB_POOL_MAX_SIZE", 10)
+    DB_POOL_TIMEOUT: float = env.float("DB_POOL_TIMEOUT", 10.0)
+    DB_POOL_MAX_LIFETIME: int = env.int("DB_POOL_MAX_LIFETIME", 1800)
+    DB_POOL_MAX_IDLE: int = env.int("DB_POOL_MAX_IDLE", 300)
+    DB_REPLICA_URLS: list[str] = field(default_factory=lambda: env.list("DB_REPLICA_URLS", []))
+    DB_REPLICA_STICKY_SECONDS: int = env.int("DB_REPLICA_STICKY_SECONDS", 10)
+    DB_REPLICA_MAX_LAG: float = env.float("DB_REPLICA_MAX_LAG", 5.0)
+    DB_REPLICA_LAG_CHECK_INTERVAL: float = env.float("DB_REPLICA_LAG_CHECK_INTERVAL", 5.0)
 
     def __post_init__(self):
         if not self.DB_URL:
@@ -36,6 +49,64 @@ class CelerySettings:
     CELERY_BEAT_SCHEDULER: str = env.str("CELERY_BEAT_SCHEDULER")
     CELERY_TIMEZONE: str = env.str("CELERY_TIMEZONE")
     CELERY_NOTIFY_INTERVAL: int = env.int("CELERY_NOTIFY_INTERVAL")
+    CELERY_COMMISSION_SETTLE_INTERVAL: int = env.int("CELERY_COMMISSION_SETTLE_INTERVAL", 60)
+    CELERY_NOTIFY_DIGEST_WINDOW: int = env.int("CELERY_NOTIFY_DIGEST_WINDOW", 5)
+    CELERY_NOTIFY_BUFFER_URL: str = env.str("CELERY_NOTIFY_BUFFER_URL", "")
+    CELERY_NOTIFY_BACKEND: str = env.str("CELERY_NOTIFY_BACKEND", "simulated")
+    CELERY_NOTIFY_URL: str = env.str("CELERY_NOTIFY_URL", "")
+    CELERY_NOTIFY_CONCURRENCY: int = env.int("CELERY_NOTIFY_CONCURRENCY", 100)
+    CELERY_NOTIFY_MAX_CONNECTIONS: int = env.int("CELERY_NOTIFY_MAX_CONNECTIONS", 100)
+    CELERY_NOTIFY_TIMEOUT: float = env.float("CELERY_NOTIFY_TIMEOUT", 10.0)
+    CELERY_NOTIFY_BATCH_SIZE: int = env.int("CELERY_NOTIFY_BATCH_SIZE", 500)
+    CELERY_NOTIFY_MAX_RETRIES: int = env.int("CELERY_NOTIFY_MAX_RETRIES", 3)
+    CELERY_NOTIFY_RETRY_BASE: float = env.float("CELERY_NOTIFY_RETRY_BASE", 3.0)
+    CELERY_NOTIFY_RETRY_CAP: float = env.float("CELERY_NOTIFY_RETRY_CAP", 300.0)
+    CELERY_NOTIFY_BREAKER_THRESHOLD: int = env.int("CELERY_NOTIFY_BREAKER_THRESHOLD", 20)
+    CELERY_NOTIFY_BREAKER_COOLDOWN: int = env.int("CELERY_NOTIFY_BREAKER_COOLDOWN", 30)
+    CELERY_OUTBOX_RELAY_INTERVAL: int = env.int("CELERY_OUTBOX_RELAY_INTERVAL", 1)
+    CELERY_OUTBOX_BATCH_SIZE: int = env.int("CELERY_OUTBOX_BATCH_SIZE", 500)
+    CELERY_RETENTION_DAYS: int = env.int("CELERY_RETENTION_DAYS", 90)
+    CELERY_RETENTION_BATCH_SIZE: int = env.int("CELERY_RETENTION_BATCH_SIZE", 5000)
+    CELERY_RETENTION_THROTTLE: float = env.float("CELERY_RETENTION_THROTTLE", 0.1)
+    CELERY_PARTITION_MONTHS_AHEAD: int = env.int("CELERY_PARTITION_MONTHS_AHEAD", 3)
+    CELERY_RECONCILE_INTERVAL: int = env.int("CELERY_RECONCILE_INTERVAL", 60)
+
+    def __post_init__(self):
+        if not self.CELERY_NOTIFY_BUFFER_URL and self.CELERY_BROKER_URL.startswith('redis'):
+            self.CELERY_NOTIFY_BUFFER_URL = self.CELERY_BROKER_URL
+
+
+@dataclass
+class CacheSettings:
+    CACHE_URL: str = env.str("CACHE_URL", "")
+    CACHE_LOCAL_MAX_ENTRIES: int = env.int("CACHE_LOCAL_MAX_ENTRIES", 10000)
+    CACHE_WALLET_ENABLED: bool = env.bool("CACHE_WALLET_ENABLED", True)
+    CACHE_WALLET_TTL: int = env.int("CACHE_WALLET_TTL", 300)
+    CACHE_WALLET_LOCAL_TTL: int = env.int("CACHE_WALLET_LOCAL_TTL", 5)
+
+
+@dataclass
+class WalletSettings:
+    TRANSFER_ENGINE: str = env.str("TRANSFER_ENGINE", "locking")
+    TRANSFER_ENFORCE_OWNERSHIP: bool = env.bool("TRANSFER_ENFORCE_OWNERSHIP", False)
+    IDEMPOTENCY_KEY_TTL: int = env.int("IDEMPOTENCY_KEY_TTL", 86400)
+    HOT_WALLET_QUEUE_URL: str = env.str("HOT_WALLET_QUEUE_URL", "")
+    HOT_WALLET_IDS: list[int] = field(default_factory=lambda: env.list("HOT_WALLET_IDS", [], subcast=int)) # noqa
+    HOT_WALLET_AUTO_THRESHOLD: int = env.int("HOT_WALLET_AUTO_THRESHOLD", 0)
+    HOT_WALLET_WINDOW: int = env.int("HOT_WALLET_WINDOW", 10)
+    HOT_WALLET_BATCH_SIZE: int = env.int("HOT_WALLET_BATCH_SIZE", 200)
+    HOT_WALLET_TIMEOUT: float = env.float("HOT_WALLET_TIMEOUT", 5.0)
+
+
+@dataclass
+class LoggingSettings:
+    LOG_LEVEL: str = env.str("LOG_LEVEL", "INFO")
+    LOG_FORMAT: str = env.str("LOG_FORMAT", "text")
+    LOG_QUEUE_ENABLED: bool = env.bool("LOG_QUEUE_ENABLED", True)
+    LOG_QUEUE_SIZE: int = env.int("LOG_QUEUE_SIZE", 10000)
+    LOG_SAMPLE_RATES: dict[str, float] = field(
+        default_factory=lambda: env.dict("LOG_SAMPLE_RATES", {}, subcast_values=float)
+    )
 
 
 @dataclass
@@ -51,6 +122,9 @@ class SystemSettings:
     app: DjangoSettings = field(default_factory=DjangoSettings)
     db: DatabaseSettings = field(default_factory=DatabaseSettings)
     task: CelerySettings = field(default_factory=CelerySettings)
+    cache: CacheSettings = field(default_factory=CacheSettings)
+    wallet: WalletSettings = field(default_factory=WalletSettings)
+    log: LoggingSettings = field(default_factory=LoggingSettings)
 
 
 config = SystemSettings()
@@ -19,6 +19,16 @@ MAIN = {
             "icon": "contactless",
             "link": reverse_lazy("admin:wallets_transaction_changelist"),
         },
+        {
+            "title": "Daily statistics",
+            "icon": "monitoring",
+            "link": reverse_lazy("admin:wallets_walletdailyrollup_changelist"),
+        },
+        {
+            "title": "Dead letters",
+            "icon": "mark_email_unread",
+            "link": reverse_lazy("admin:wallets_notificationdeadletter_changelist"),
+        },
     ],
 }
 
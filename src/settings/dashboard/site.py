@@ -7,6 +7,7 @@ SITE = {
     "SITE_HEADER": "Transactions 💰",
     "SHOW_HISTORY": True,
     "SITE_SYMBOL": "dashboard",
+    "DASHBOARD_CALLBACK": "apps.wallets.admin.dashboard.dashboard_callback",
     "COLORS": {
         "primary": {
             "50": "237 250 245",
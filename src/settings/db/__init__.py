@@ -0,0 +1 @@
+from .postgres.database import * # noqa
@@ -1,8 +1,69 @@
+"""
+database configuration, postgres behind a psycopg connection pool
+with optional read replicas, or sqlite when DB_ENGINE is the sqlite backend
+"""
 import dj_database_url
 
+from src.settings.base import BASE_DIR
 from src.settings.config.config import config
 
 
-DATABASES = {
-    'default': dj_database_url.config(default=config.DB_URL)
-}
+def pool_options(db) -> dict:
+    """
+    Build the psycopg pool options of the Postgres backend.
+
+    Every connection is checked out of a per-process pool and returned to it when
+    Django closes the connection at the end of the request, so persistent
+    connections are disabled while the pool is enabled. With `CONN_HEALTH_CHECKS`
+    the pool checks each connection before handing it out.
+
+    :param db: Database settings
+    :return: Options passed to `psycopg_pool.ConnectionPool`
+    :rtype: dict
+    """
+    return {
+        "min_size": db.DB_POOL_MIN_SIZE,
+        "max_size": db.DB_POOL_MAX_SIZE,
+        "timeout": db.DB_POOL_TIMEOUT,
+        "max_lifetime": db.DB_POOL_MAX_LIFETIME,
+        "max_idle": db.DB_POOL_MAX_IDLE,
+    }
+
+
+def postgres_database(url: str, db) -> dict:
+    """
+    Build the settings of one Postgres database.
+
+    :param url: Database URL
+    :param db: Database settings
+    :return: Entry of `DATABASES`
+    :rtype: dict
+    """
+    database = dj_database_url.parse(
+        url,
+        conn_max_age=0 if db.DB_POOL_ENABLED else db.DB_CONN_MAX_AGE,
+        conn_health_checks=db.DB_CONN_HEALTH_CHECKS,
+        disable_server_side_cursors=db.DB_DISABLE_SERVER_SIDE_CURSORS,
+    )
+    if db.DB_POOL_ENABLED:
+        database.setdefault("OPTIONS", {})["pool"] = pool_options(db)
+    return database
+
+
+if "sqlite" in config.db.DB_ENGINE:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / "db.sqlite3",
+        }
+    }
+else:
+    DATABASES = {"default": postgres_database(config.db.DB_URL, config.db)}
+    for index, url in enumerate(config.db.DB_REPLICA_URLS, start=1):
+        DATABASES[f"replica_{index}"] = {
+            **postgres_database(url, config.db),
+            "TEST": {"MIRROR": "default"},
+        }
+
+    if len(DATABASES) > 1:
+        DATABASE_ROUTERS = ["src.settings.db.router.ReplicaRouter"]
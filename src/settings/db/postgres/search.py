@@ -0,0 +1,47 @@
+"""
+Trigram indexes backing admin search.
+
+Django's ``icontains`` lookups compile to ``UPPER(column::text) LIKE UPPER(%s)`` on
+PostgreSQL, which only an expression index over the same ``UPPER`` can serve.
+The indexes live on tables the project has no migrations for, such as `auth_user`,
+so they are created after every `migrate` instead.
+"""
+
+from django.db import router
+from django.db import connections
+from django.db import DatabaseError
+
+from src.settings.utils.logging import logger
+
+
+# (index name, table, indexed expression)
+TRIGRAM_INDEXES = (
+    ('auth_user_username_upper_trgm', 'auth_user', 'UPPER(username::text) gin_trgm_ops'),
+)
+
+
+def create_trigram_indexes(using: str = 'default', **kwargs):
+    """
+    Create `pg_trgm` and the `TRIGRAM_INDEXES` missing from a PostgreSQL database.
+
+    Connected to ``post_migrate``. Indexes are built concurrently so tables stay
+    writable; failures, e.g. for lack of the privilege to create the extension,
+    are logged and search falls back to sequential scans.
+
+    :param using: Database alias that was migrated
+    :type using: str
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql' or not router.allow_migrate(using, 'auth'):
+        return
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            for name, table, expression in TRIGRAM_INDEXES:
+                cursor.execute(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                    f"ON {connection.ops.quote_name(table)} USING gin ({expression})"
+                )
+    except DatabaseError as e:
+        logger.warning("Could not create trigram search indexes: %s", e)
@@ -0,0 +1,176 @@
+"""
+Read replica routing.
+
+Reads go to a replica only inside a request that opted in through
+`replica_reads` and whose user has not written recently, and only to replicas
+whose replication lag is within `DB_REPLICA_MAX_LAG`. Everything else, writes
+and `select_for_update` included, uses the primary.
+"""
+
+import math
+import random
+import time
+
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.db import DatabaseError
+from django.core.cache import cache
+
+from prometheus_client import Gauge
+
+from src.settings.config.config import config
+from src.settings.utils.logging import logger
+
+
+PRIMARY = 'default'
+REPLICA_PREFIX = 'replica_'
+
+REPLICA_LAG_SECONDS = Gauge(
+    'db_replica_lag_seconds',
+    'Replication lag of each read replica, +Inf when unreachable',
+    ['alias'],
+    multiprocess_mode='livemax'
+)
+
+replica_reads = ContextVar('replica_reads', default=False)
+
+
+def replica_aliases() -> list[str]:
+    return [alias for alias in settings.DATABASES if alias.startswith(REPLICA_PREFIX)]
+
+
+def primary_key(user_id: int) -> str:
+    return f"db:primary:{user_id}"
+
+
+def pin_to_primary(user_id: int):
+    """
+    Send the reads of a user to the primary for `DB_REPLICA_STICKY_SECONDS`,
+    so the user sees their own writes even while replicas catch up.
+
+    :param user_id: ID of the user who just wrote
+    """
+    if replica_aliases():
+        cache.set(primary_key(user_id), 1, timeout=config.db.DB_REPLICA_STICKY_SECONDS)
+
+
+def is_pinned(user_id: int) -> bool:
+    """
+    Check whether the reads of a user must stay on the primary.
+
+    :param user_id: User ID
+    :return: True within the stickiness window after a write of the user
+    :rtype: bool
+    """
+    return cache.get(primary_key(user_id)) is not None
+
+
+def use_replica(request) -> bool:
+    """
+    Decide whether the reads of a request may be served by a replica.
+
+    :param request: Authenticated DRF request
+    :return: True for reads of users without a recent write, when replicas are configured
+    :rtype: bool
+    """
+    if not replica_aliases() or request.method not in ('GET', 'HEAD', 'OPTIONS'):
+        return False
+    return not (request.user.is_authenticated and is_pinned(request.user.pk))
+
+
+class ReplicaLagMonitor:
+    """
+    Measures the replication lag of every replica, at most once per
+    `DB_REPLICA_LAG_CHECK_INTERVAL` seconds per process.
+    """
+
+    POSTGRES_LAG_SQL = (
+        "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+    )
+
+    def __init__(self):
+        self.lags = {}
+        self.checked_at = {}
+
+    def measure(self, alias: str) -> float:
+        """
+        Query the replication lag of a replica.
+
+        :param alias: Replica database alias
+        :return: Lag in seconds, infinite if the replica cannot be queried
+        :rtype: float
+        """
+        connection = connections[alias]
+        if connection.vendor != 'postgresql':
+            return 0.0
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(self.POSTGRES_LAG_SQL)
+                return float(cursor.fetchone()[0])
+        except DatabaseError as exc:
+            logger.warning("Replica %s is unavailable: %s", alias, exc)
+            return math.inf
+
+    def lag(self, alias: str, force: bool = False) -> float:
+        """
+        Return the last measured lag of a replica, measuring it again when stale.
+
+        :param alias: Replica database alias
+        :param force: Measure even if the last measurement is recent
+        :return: Lag in seconds
+        :rtype: float
+        """
+        now = time.monotonic()
+        checked_at = self.checked_at.get(alias)
+        if force or checked_at is None or now - checked_at >= config.db.DB_REPLICA_LAG_CHECK_INTERVAL: # noqa
+            self.checked_at[alias] = now
+            self.lags[alias] = self.measure(alias)
+            REPLICA_LAG_SECONDS.labels(alias).set(self.lags[alias])
+        return self.lags[alias]
+
+    def healthy(self) -> list[str]:
+        """
+        Return the replicas lagging no more than `DB_REPLICA_MAX_LAG` seconds.
+
+        :return: Replica aliases
+        :rtype: list[str]
+        """
+        return [
+            alias for alias in replica_aliases()
+            if self.lag(alias) <= config.db.DB_REPLICA_MAX_LAG
+        ]
+
+    def refresh(self):
+        for alias in replica_aliases():
+            self.lag(alias, force=True)
+
+
+replica_lag = ReplicaLagMonitor()
+
+
+class ReplicaRouter:
+    """
+    Database router sending opted-in reads to a random healthy replica.
+
+    Falls back to the primary when no replica is within the allowed lag.
+    Migrations only run on the primary; replicas receive them through replication.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not replica_reads.get():
+            return PRIMARY
+
+        replicas = replica_lag.healthy()
+        return random.choice(replicas) if replicas else PRIMARY
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
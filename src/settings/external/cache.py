@@ -0,0 +1,23 @@
+"""
+cache configuration, redis when CACHE_URL is set,
+otherwise an in-process memory cache
+"""
+from src.settings.config.config import config
+
+
+if config.cache.CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": config.cache.CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "OPTIONS": {
+                "MAX_ENTRIES": config.cache.CACHE_LOCAL_MAX_ENTRIES,
+            },
+        }
+    }
@@ -5,6 +5,7 @@ from celery import Celery
 from datetime import timedelta
 
 from src.settings.config.config import config
+from src.settings.utils.metrics import connect_celery_metrics
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "src.settings")
 
@@ -12,11 +13,49 @@ app = Celery("TransactionApp")
 app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
 
+connect_celery_metrics()
+
 app.conf.beat_schedule = {
     "notify": {
         "task": "apps.wallets.tasks.notify.send_notification",
         "schedule": timedelta(minutes=config.task.CELERY_NOTIFY_INTERVAL),
     },
+    "settle-commissions": {
+        "task": "apps.wallets.tasks.commission.settle_commissions",
+        "schedule": timedelta(seconds=config.task.CELERY_COMMISSION_SETTLE_INTERVAL),
+    },
+    "relay-outbox": {
+        "task": "apps.wallets.tasks.outbox.relay_outbox",
+        "schedule": timedelta(seconds=config.task.CELERY_OUTBOX_RELAY_INTERVAL),
+    },
+    "purge-outbox-events": {
+        "task": "apps.wallets.tasks.outbox.purge_outbox_events",
+        "schedule": timedelta(hours=1),
+    },
+    "purge-idempotency-keys": {
+        "task": "apps.wallets.tasks.idempotency.purge_idempotency_keys",
+        "schedule": timedelta(hours=1),
+    },
+    "cleanup-old-transactions": {
+        "task": "apps.wallets.tasks.notify.cleanup_old_transactions",
+        "schedule": timedelta(days=1),
+    },
+    "create-transaction-partitions": {
+        "task": "apps.wallets.tasks.notify.create_transaction_partitions",
+        "schedule": timedelta(days=1),
+    },
+    "reconcile-ledger": {
+        "task": "apps.wallets.tasks.reconciliation.reconcile_ledger",
+        "schedule": timedelta(minutes=config.task.CELERY_RECONCILE_INTERVAL),
+    },
+    "detect-hot-wallets": {
+        "task": "apps.wallets.tasks.hot_wallet.detect_hot_wallets",
+        "schedule": timedelta(seconds=config.wallet.HOT_WALLET_WINDOW),
+    },
+}
+
+app.conf.task_routes = {
+    "apps.wallets.tasks.hot_wallet.drain_hot_wallet": {"queue": "hot_wallets"},
 }
 
 
@@ -1,4 +1,124 @@
+import os
+import sys
+import json
+import queue
+import random
 import logging
 
+from datetime import datetime
+from datetime import timezone
+from logging.handlers import QueueHandler
+from logging.handlers import QueueListener
+
 
 logger = logging.getLogger(__name__)
+
+
+RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {
+    'message',
+    'asctime',
+}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line.
+
+    Fields passed through `extra` (``event``, wallet IDs, ``transaction_group``,
+    ...) are emitted as top-level keys next to the time, level, logger and
+    message; values that are not JSON types (Decimal, UUID) are rendered as strings.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in RECORD_ATTRIBUTES and key not in entry:
+                entry[key] = value
+
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry['stack_info'] = self.formatStack(record.stack_info)
+
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps only a fraction of the records of high-volume events.
+
+    Records are matched by their ``event`` extra against `rates`, a mapping of
+    event name to the fraction kept (``1`` keeps all, ``0`` drops all). Records
+    without an event, unknown events and warnings or worse always pass.
+    """
+
+    def __init__(self, rates: dict = None, name: str = ''):
+        super().__init__(name)
+        self.rates = dict(rates or {})
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(getattr(record, 'event', None))
+        return rate is None or random.random() < rate
+
+
+class AsyncQueueHandler(QueueHandler):
+    """
+    Hands records to a background thread writing them to stdout.
+
+    `emit` only appends the record to a bounded in-memory queue: the message is
+    neither formatted nor written on the calling thread, so a slow or blocked
+    stdout never stalls a request. When the queue is full the record is dropped
+    and counted in `dropped` rather than waiting.
+
+    The listener thread is restarted in forked children (Celery prefork, gunicorn
+    workers) and drained when the handler is closed, which `logging.shutdown`
+    does at interpreter exit.
+    """
+
+    def __init__(self, queue_size: int = 10000):
+        super().__init__(queue.Queue(queue_size))
+        self.queue_size = queue_size
+        self.dropped = 0
+        self.target = logging.StreamHandler(sys.stdout)
+        self.listener = None
+        self.start()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self.restart)
+
+    def setFormatter(self, fmt: logging.Formatter):
+        super().setFormatter(fmt)
+        self.target.setFormatter(fmt)
+
+    def start(self):
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+
+    def stop(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def restart(self):
+        if self.listener is not None:
+            self.queue = queue.Queue(self.queue_size)
+            self.start()
+
+    def close(self):
+        self.stop()
+        super().close()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
@@ -0,0 +1,301 @@
+"""
+Prometheus metrics shared by the web and Celery processes.
+
+When `PROMETHEUS_MULTIPROC_DIR` is set, every process writes its samples to that
+directory and `/metrics` aggregates them, so the numbers cover all web workers
+and, with a shared directory, the Celery workers too.
+"""
+
+import os
+import time
+import threading
+
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from asgiref.sync import markcoroutinefunction
+
+from django.db import connections
+from django.http import HttpResponse
+from django.db.backends.signals import connection_created
+
+from prometheus_client import REGISTRY
+from prometheus_client import Gauge
+from prometheus_client import Counter
+from prometheus_client import Histogram
+from prometheus_client import CollectorRegistry
+from prometheus_client import CONTENT_TYPE_LATEST
+from prometheus_client import generate_latest
+from prometheus_client import multiprocess
+
+from src.settings.db.router import replica_lag
+
+
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+QUERY_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+
+if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+    os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+REQUEST_SECONDS = Histogram(
+    'http_request_duration_seconds',
+    'Time spent handling HTTP requests',
+    ['view', 'method'],
+    buckets=LATENCY_BUCKETS
+)
+REQUEST_QUERIES = Histogram(
+    'http_request_db_queries',
+    'Database queries executed per HTTP request',
+    ['view'],
+    buckets=QUERY_BUCKETS
+)
+
+CELERY_TASK_SECONDS = Histogram(
+    'celery_task_duration_seconds',
+    'Time spent running Celery tasks',
+    ['task', 'state'],
+    buckets=LATENCY_BUCKETS
+)
+CELERY_TASK_RETRIES = Counter(
+    'celery_task_retries',
+    'Celery task retries',
+    ['task']
+)
+
+DB_POOL_CONNECTIONS = Gauge(
+    'db_pool_connections',
+    'Connections open in the database pool, by state',
+    ['alias', 'state'],
+    multiprocess_mode='livesum'
+)
+DB_POOL_MAX_CONNECTIONS = Gauge(
+    'db_pool_max_connections',
+    'Maximum size of the database pool',
+    ['alias'],
+    multiprocess_mode='livesum'
+)
+DB_POOL_WAITING = Gauge(
+    'db_pool_waiting_requests',
+    'Requests currently waiting for a pool connection',
+    ['alias'],
+    multiprocess_mode='livesum'
+)
+DB_POOL_REQUESTS = Counter(
+    'db_pool_requests',
+    'Connections requested from the database pool',
+    ['alias']
+)
+DB_POOL_QUEUED = Counter(
+    'db_pool_queued_requests',
+    'Pool requests that had to wait for a free connection',
+    ['alias']
+)
+DB_POOL_WAIT_SECONDS = Counter(
+    'db_pool_wait_seconds',
+    'Time spent waiting for a pool connection',
+    ['alias']
+)
+DB_POOL_ERRORS = Counter(
+    'db_pool_errors',
+    'Pool requests that timed out or failed',
+    ['alias']
+)
+DB_POOL_LOST = Counter(
+    'db_pool_connections_lost',
+    'Pool connections found broken by a health check',
+    ['alias']
+)
+
+POOL_REFRESH_INTERVAL = 1.0
+pool_refresh_lock = threading.Lock()
+pool_refreshed_at = 0.0
+
+
+def is_multiprocess() -> bool:
+    return 'PROMETHEUS_MULTIPROC_DIR' in os.environ
+
+
+def metrics_view(request):
+    """
+    Expose all metrics in the Prometheus text exposition format.
+
+    :param request: Django request object
+    :return: Metrics of this process, or of all processes in multiprocess mode
+    :rtype: django.http.HttpResponse
+    """
+    refresh_pool_metrics(force=True)
+    replica_lag.refresh()
+    registry = REGISTRY
+    if is_multiprocess():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
+
+
+def refresh_pool_metrics(force: bool = False):
+    """
+    Copy the statistics of every open database pool of this process into the metrics.
+
+    Saturation is ``db_pool_connections{state="in_use"}`` over ``db_pool_max_connections``
+    and the mean wait of a queued request is ``db_pool_wait_seconds`` over
+    ``db_pool_queued_requests``. Called after requests and tasks, at most once per
+    `POOL_REFRESH_INTERVAL` unless forced.
+
+    :param force: Refresh even if the last refresh is recent
+    :type force: bool
+    """
+    global pool_refreshed_at
+
+    now = time.monotonic()
+    if not force and now - pool_refreshed_at < POOL_REFRESH_INTERVAL:
+        return
+    if not pool_refresh_lock.acquire(blocking=False):
+        return
+
+    try:
+        pool_refreshed_at = now
+        for alias in connections:
+            # Read the pools already opened, `DatabaseWrapper.pool` would open one.
+            pool = getattr(type(connections[alias]), '_connection_pools', {}).get(alias)
+            if pool is None or pool.closed:
+                continue
+
+            stats = pool.pop_stats()
+            size = stats.get('pool_size', 0)
+            available = stats.get('pool_available', 0)
+            DB_POOL_CONNECTIONS.labels(alias, 'idle').set(available)
+            DB_POOL_CONNECTIONS.labels(alias, 'in_use').set(size - available)
+            DB_POOL_MAX_CONNECTIONS.labels(alias).set(stats.get('pool_max', 0))
+            DB_POOL_WAITING.labels(alias).set(stats.get('requests_waiting', 0))
+            DB_POOL_REQUESTS.labels(alias).inc(stats.get('requests_num', 0))
+            DB_POOL_QUEUED.labels(alias).inc(stats.get('requests_queued', 0))
+            DB_POOL_WAIT_SECONDS.labels(alias).inc(stats.get('requests_wait_ms', 0) / 1000)
+            DB_POOL_ERRORS.labels(alias).inc(stats.get('requests_errors', 0))
+            DB_POOL_LOST.labels(alias).inc(stats.get('connections_lost', 0))
+    finally:
+        pool_refresh_lock.release()
+
+
+class QueryCounter:
+    """
+    Number of database queries of one request.
+    """
+
+    __slots__ = ('count',)
+
+    def __init__(self):
+        self.count = 0
+
+
+current_query_counter = ContextVar('current_query_counter', default=None)
+
+
+def count_query(execute, sql, params, many, context):
+    """
+    Execute wrapper installed on every connection, counting queries for the current request.
+
+    The counter lives in a context variable rather than on the connection, so queries
+    the async ORM runs on worker threads are counted for the request that issued them.
+    """
+    counter = current_query_counter.get()
+    if counter is not None:
+        counter.count += 1
+    return execute(sql, params, many, context)
+
+
+def install_query_counter(sender, connection, **kwargs):
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_query)
+
+
+def connect_query_metrics():
+    """
+    Install `count_query` on every database connection opened from now on.
+    """
+    connection_created.connect(install_query_counter, dispatch_uid='metrics_query_counter')
+
+
+class MetricsMiddleware:
+    """
+    Record the duration and the number of database queries of every request,
+    labelled by the name of the matched URL.
+
+    Works in both sync and async middleware chains, so async views are not
+    forced back into a worker thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        counter = QueryCounter()
+        token = current_query_counter.set(counter)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_query_counter.reset(token)
+        self.record(request, time.perf_counter() - started, counter.count)
+        return response
+
+    async def __acall__(self, request):
+        counter = QueryCounter()
+        token = current_query_counter.set(counter)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_query_counter.reset(token)
+        self.record(request, time.perf_counter() - started, counter.count)
+        return response
+
+    @staticmethod
+    def record(request, elapsed: float, queries: int):
+        match = request.resolver_match
+        view = match.view_name if match else 'unmatched'
+        if view != 'metrics':
+            REQUEST_SECONDS.labels(view, request.method).observe(elapsed)
+            REQUEST_QUERIES.labels(view).observe(queries)
+        refresh_pool_metrics()
+
+
+def connect_celery_metrics():
+    """
+    Record duration, final state and retries of every Celery task through signals.
+    """
+    from celery import signals
+
+    started_at = {}
+
+    @signals.task_prerun.connect(weak=False)
+    def task_started(task_id=None, **kwargs):
+        started_at[task_id] = time.perf_counter()
+
+    @signals.task_postrun.connect(weak=False)
+    def task_finished(task_id=None, task=None, state=None, **kwargs):
+        started = started_at.pop(task_id, None)
+        if started is not None:
+            CELERY_TASK_SECONDS.labels(task.name, state or 'UNKNOWN').observe(
+                time.perf_counter() - started
+            )
+        refresh_pool_metrics()
+
+    @signals.task_retry.connect(weak=False)
+    def task_retried(sender=None, **kwargs):
+        CELERY_TASK_RETRIES.labels(sender.name).inc()
+
+    @signals.worker_process_shutdown.connect(weak=False)
+    def worker_process_stopped(pid=None, **kwargs):
+        if is_multiprocess():
+            multiprocess.mark_process_dead(pid or os.getpid())
@@ -0,0 +1,15 @@
+import redis
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def get_redis(url: str) -> redis.Redis:
+    """
+    Return a process-wide Redis client for a URL, sharing its connection pool.
+
+    :param url: Redis URL
+    :return: Redis client
+    :rtype: redis.Redis
+    """
+    return redis.Redis.from_url(url)
@@ -14,6 +14,7 @@ from drf_yasg.views import get_schema_view
 
 from src.settings.base import STATIC_URL
 from src.settings.base import STATIC_ROOT
+from src.settings.utils.metrics import metrics_view
 
 
 schema_view = get_schema_view(
@@ -32,6 +33,8 @@ schema_view = get_schema_view(
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/v1/", include("apps.wallets.routers.urls")),
+    path("api/v1/async/", include("apps.wallets.routers.async_urls")),
+    path("metrics", metrics_view, name='metrics'),
 
     # Swagger
     path("swagger(<format>\.json|\.yaml)", schema_view.without_ui(cache_timeout=0), name='schema-json'),